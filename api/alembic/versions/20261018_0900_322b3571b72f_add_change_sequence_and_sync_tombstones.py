@@ -0,0 +1,149 @@
+"""add_change_sequence_and_sync_tombstones
+
+Revision ID: 322b3571b72f
+Revises: ee8b325e65dd
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "322b3571b72f"
+down_revision: Union[str, None] = "ee8b325e65dd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNCED_TABLES = ("UserAsceticism", "AsceticismLog", "daily_reading_notes")
+
+# Tombstone triggers: (table, entity name, SELECT producing the owning userId)
+TOMBSTONE_SOURCES = (
+    ("UserAsceticism", "userAsceticism", 'SELECT OLD."userId"'),
+    (
+        "AsceticismLog",
+        "asceticismLog",
+        'SELECT ua."userId" FROM "UserAsceticism" ua '
+        'WHERE ua.id = OLD."userAsceticismId"',
+    ),
+    ("daily_reading_notes", "dailyReadingNote", 'SELECT OLD."userId"'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS change_seq")
+
+    for table in SYNCED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "changeSeq",
+                sa.BigInteger(),
+                server_default=sa.text("nextval('change_seq')"),
+                nullable=False,
+            ),
+        )
+
+    op.create_index(
+        "ix_UserAsceticism_userId_changeSeq",
+        "UserAsceticism",
+        ["userId", "changeSeq"],
+    )
+    op.create_index(
+        "ix_AsceticismLog_userAsceticismId_changeSeq",
+        "AsceticismLog",
+        ["userAsceticismId", "changeSeq"],
+    )
+    op.create_index(
+        "ix_daily_reading_notes_userId_changeSeq",
+        "daily_reading_notes",
+        ["userId", "changeSeq"],
+    )
+
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("userId", sa.Integer(), nullable=False),
+        sa.Column("entity", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("entityId", sa.Integer(), nullable=False),
+        sa.Column(
+            "changeSeq",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('change_seq')"),
+            nullable=False,
+        ),
+        sa.Column(
+            "createdAt", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sync_tombstones_userId_changeSeq",
+        "sync_tombstones",
+        ["userId", "changeSeq"],
+    )
+
+    # Every insert and update takes a fresh sequence number
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW."changeSeq" := nextval('change_seq');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in SYNCED_TABLES:
+        op.execute(
+            f'CREATE TRIGGER "{table}_change_seq" '
+            f'BEFORE INSERT OR UPDATE ON "{table}" '
+            "FOR EACH ROW EXECUTE FUNCTION bump_change_seq()"
+        )
+
+    # Every delete leaves a tombstone for the owning user
+    for table, entity, owner_select in TOMBSTONE_SOURCES:
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION "{table}_tombstone"() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO sync_tombstones ("userId", entity, "entityId")
+                SELECT owner."userId", '{entity}', OLD.id
+                FROM ({owner_select}) AS owner("userId");
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f'CREATE TRIGGER "{table}_tombstone" '
+            f'AFTER DELETE ON "{table}" '
+            f'FOR EACH ROW EXECUTE FUNCTION "{table}_tombstone"()'
+        )
+
+
+def downgrade() -> None:
+    for table, _entity, _owner_select in TOMBSTONE_SOURCES:
+        op.execute(f'DROP TRIGGER IF EXISTS "{table}_tombstone" ON "{table}"')
+        op.execute(f'DROP FUNCTION IF EXISTS "{table}_tombstone"()')
+    for table in SYNCED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS "{table}_change_seq" ON "{table}"')
+    op.execute("DROP FUNCTION IF EXISTS bump_change_seq()")
+
+    op.drop_index("ix_sync_tombstones_userId_changeSeq", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
+    op.drop_index(
+        "ix_daily_reading_notes_userId_changeSeq", table_name="daily_reading_notes"
+    )
+    op.drop_index(
+        "ix_AsceticismLog_userAsceticismId_changeSeq", table_name="AsceticismLog"
+    )
+    op.drop_index("ix_UserAsceticism_userId_changeSeq", table_name="UserAsceticism")
+    for table in SYNCED_TABLES:
+        op.drop_column(table, "changeSeq")
+    op.execute("DROP SEQUENCE IF EXISTS change_seq")
@@ -0,0 +1,40 @@
+"""add_group_leaderboard_indexes
+
+Revision ID: 044b915045c0
+Revises: 322b3571b72f
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "044b915045c0"
+down_revision: Union[str, None] = "322b3571b72f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint(
+        "uq_GroupMember_groupId_userId", "GroupMember", ["groupId", "userId"]
+    )
+    op.create_index("ix_GroupMember_userId", "GroupMember", ["userId"])
+    op.create_index(
+        "ix_AsceticismLog_userAsceticismId_date",
+        "AsceticismLog",
+        ["userAsceticismId", "date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_AsceticismLog_userAsceticismId_date", table_name="AsceticismLog")
+    op.drop_index("ix_GroupMember_userId", table_name="GroupMember")
+    op.drop_constraint(
+        "uq_GroupMember_groupId_userId", "GroupMember", type_="unique"
+    )
@@ -0,0 +1,36 @@
+"""add_program_schedule_indexes
+
+Revision ID: 454379460c5a
+Revises: 044b915045c0
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "454379460c5a"
+down_revision: Union[str, None] = "044b915045c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_UserProgram_programId_startDate",
+        "UserProgram",
+        ["programId", "startDate"],
+    )
+    op.create_index("ix_UserProgram_userId", "UserProgram", ["userId"])
+    op.create_index("ix_ProgramItem_programId", "ProgramItem", ["programId"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ProgramItem_programId", table_name="ProgramItem")
+    op.drop_index("ix_UserProgram_userId", table_name="UserProgram")
+    op.drop_index("ix_UserProgram_programId_startDate", table_name="UserProgram")
@@ -0,0 +1,37 @@
+"""add_active_reminder_index
+
+Revision ID: 77ba7ee4f87f
+Revises: 454379460c5a
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "77ba7ee4f87f"
+down_revision: Union[str, None] = "454379460c5a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_UserAsceticism_reminderTime_active",
+        "UserAsceticism",
+        ["reminderTime"],
+        postgresql_where=sa.text(
+            "status = 'ACTIVE' AND \"reminderTime\" IS NOT NULL"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_UserAsceticism_reminderTime_active", table_name="UserAsceticism"
+    )
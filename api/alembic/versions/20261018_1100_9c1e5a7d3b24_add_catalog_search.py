@@ -0,0 +1,95 @@
+"""add_catalog_search
+
+Revision ID: 9c1e5a7d3b24
+Revises: 77ba7ee4f87f
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1e5a7d3b24"
+down_revision: Union[str, None] = "77ba7ee4f87f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ASCETICISM_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+PACKAGE_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "Asceticism",
+        sa.Column(
+            "searchVector",
+            postgresql.TSVECTOR(),
+            sa.Computed(ASCETICISM_SEARCH_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_Asceticism_searchVector",
+        "Asceticism",
+        ["searchVector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_Asceticism_title_trgm",
+        "Asceticism",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+    op.add_column(
+        "asceticism_packages",
+        sa.Column(
+            "searchVector",
+            postgresql.TSVECTOR(),
+            sa.Computed(PACKAGE_SEARCH_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_asceticism_packages_searchVector",
+        "asceticism_packages",
+        ["searchVector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_asceticism_packages_title_trgm",
+        "asceticism_packages",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_asceticism_packages_title_trgm", table_name="asceticism_packages"
+    )
+    op.drop_index(
+        "ix_asceticism_packages_searchVector", table_name="asceticism_packages"
+    )
+    op.drop_column("asceticism_packages", "searchVector")
+    op.drop_index("ix_Asceticism_title_trgm", table_name="Asceticism")
+    op.drop_index("ix_Asceticism_searchVector", table_name="Asceticism")
+    op.drop_column("Asceticism", "searchVector")
@@ -0,0 +1,50 @@
+"""add_note_search
+
+Revision ID: 5f0b8e2c6a91
+Revises: 9c1e5a7d3b24
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f0b8e2c6a91"
+down_revision: Union[str, None] = "9c1e5a7d3b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets the userId column share one GIN index with the search vector
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.add_column(
+        "daily_reading_notes",
+        sa.Column(
+            "searchVector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(notes, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_daily_reading_notes_userId_searchVector",
+        "daily_reading_notes",
+        ["userId", "searchVector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_daily_reading_notes_userId_searchVector",
+        table_name="daily_reading_notes",
+    )
+    op.drop_column("daily_reading_notes", "searchVector")
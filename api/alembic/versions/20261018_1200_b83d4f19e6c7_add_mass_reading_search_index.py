@@ -0,0 +1,72 @@
+"""add_mass_reading_search_index
+
+Revision ID: b83d4f19e6c7
+Revises: 5f0b8e2c6a91
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b83d4f19e6c7"
+down_revision: Union[str, None] = "5f0b8e2c6a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+READING_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(sources, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(\"readingText\", '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Existing rows are indexed by `python -m app.jobs.backfill_readings`
+    op.add_column(
+        "mass_readings",
+        sa.Column("sources", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "mass_readings",
+        sa.Column("referenceKeys", postgresql.ARRAY(sa.String()), nullable=True),
+    )
+    op.add_column(
+        "mass_readings",
+        sa.Column("readingText", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "mass_readings",
+        sa.Column(
+            "searchVector",
+            postgresql.TSVECTOR(),
+            sa.Computed(READING_SEARCH_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_mass_readings_referenceKeys",
+        "mass_readings",
+        ["referenceKeys"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_mass_readings_searchVector",
+        "mass_readings",
+        ["searchVector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_mass_readings_searchVector", table_name="mass_readings")
+    op.drop_index("ix_mass_readings_referenceKeys", table_name="mass_readings")
+    op.drop_column("mass_readings", "searchVector")
+    op.drop_column("mass_readings", "readingText")
+    op.drop_column("mass_readings", "referenceKeys")
+    op.drop_column("mass_readings", "sources")
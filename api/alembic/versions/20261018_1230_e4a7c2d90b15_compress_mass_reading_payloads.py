@@ -0,0 +1,97 @@
+"""compress_mass_reading_payloads
+
+Revision ID: e4a7c2d90b15
+Revises: b83d4f19e6c7
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2d90b15"
+down_revision: Union[str, None] = "b83d4f19e6c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+mass_readings = sa.table(
+    "mass_readings",
+    sa.column("id", sa.Integer),
+    sa.column("data", sa.JSON),
+    sa.column("payload", sa.LargeBinary),
+    sa.column("contentHash", sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column("mass_readings", sa.Column("payload", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "mass_readings",
+        sa.Column("contentHash", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+    # Same encoding as app.core.readings.encode_payload
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(mass_readings.c.id, mass_readings.c.data)
+            .where(mass_readings.c.id > last_id)
+            .order_by(mass_readings.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for reading_id, data in rows:
+            raw = json.dumps(
+                data or {}, separators=(",", ":"), ensure_ascii=False
+            ).encode()
+            conn.execute(
+                mass_readings.update()
+                .where(mass_readings.c.id == reading_id)
+                .values(
+                    payload=gzip.compress(raw, mtime=0),
+                    contentHash=hashlib.sha256(raw).hexdigest(),
+                )
+            )
+        last_id = rows[-1][0]
+
+    op.alter_column("mass_readings", "payload", nullable=False)
+    op.alter_column("mass_readings", "contentHash", nullable=False)
+    op.drop_column("mass_readings", "data")
+
+
+def downgrade() -> None:
+    op.add_column("mass_readings", sa.Column("data", sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(mass_readings.c.id, mass_readings.c.payload)
+            .where(mass_readings.c.id > last_id)
+            .order_by(mass_readings.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for reading_id, payload in rows:
+            conn.execute(
+                mass_readings.update()
+                .where(mass_readings.c.id == reading_id)
+                .values(data=json.loads(gzip.decompress(payload)))
+            )
+        last_id = rows[-1][0]
+
+    op.drop_column("mass_readings", "contentHash")
+    op.drop_column("mass_readings", "payload")
@@ -0,0 +1,50 @@
+"""unique_asceticism_log_per_day
+
+Revision ID: a61c3e8b5d27
+Revises: 7d2f9a4e1c83
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a61c3e8b5d27"
+down_revision: Union[str, None] = "7d2f9a4e1c83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the most recently updated log of any duplicated day; the delete
+    # trigger leaves sync tombstones for the others
+    op.execute(
+        """
+        DELETE FROM "AsceticismLog" a
+        USING "AsceticismLog" b
+        WHERE a."userAsceticismId" = b."userAsceticismId"
+          AND a.date = b.date
+          AND (a."updatedAt", a.id) < (b."updatedAt", b.id)
+        """
+    )
+    op.drop_index("ix_AsceticismLog_userAsceticismId_date", table_name="AsceticismLog")
+    op.create_index(
+        "ix_AsceticismLog_userAsceticismId_date",
+        "AsceticismLog",
+        ["userAsceticismId", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_AsceticismLog_userAsceticismId_date", table_name="AsceticismLog")
+    op.create_index(
+        "ix_AsceticismLog_userAsceticismId_date",
+        "AsceticismLog",
+        ["userAsceticismId", "date"],
+    )
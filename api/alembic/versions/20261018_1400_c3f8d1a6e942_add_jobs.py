@@ -0,0 +1,71 @@
+"""add_jobs
+
+Revision ID: c3f8d1a6e942
+Revises: a61c3e8b5d27
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8d1a6e942"
+down_revision: Union[str, None] = "a61c3e8b5d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("type", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="jobstatus"),
+            nullable=False,
+        ),
+        sa.Column("dedupeKey", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("userId", sa.Integer(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("maxAttempts", sa.Integer(), nullable=False),
+        sa.Column("runAt", sa.DateTime(), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("lockedBy", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("lockedAt", sa.DateTime(), nullable=True),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.Column("finishedAt", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["userId"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_jobs_runAt_queued",
+        "jobs",
+        ["runAt"],
+        postgresql_where=sa.text("status = 'QUEUED'"),
+    )
+    op.create_index(
+        "ix_jobs_dedupeKey_active",
+        "jobs",
+        ["dedupeKey"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+    op.create_index("ix_jobs_userId", "jobs", ["userId"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_userId", table_name="jobs")
+    op.drop_index("ix_jobs_dedupeKey_active", table_name="jobs")
+    op.drop_index("ix_jobs_runAt_queued", table_name="jobs")
+    op.drop_table("jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,103 @@
+"""add_analytics_rollups
+
+Revision ID: 5b9e2d7c4a18
+Revises: c3f8d1a6e942
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9e2d7c4a18"
+down_revision: Union[str, None] = "c3f8d1a6e942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("UserAsceticism", sa.Column("packageId", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "UserAsceticism_packageId_fkey",
+        "UserAsceticism",
+        "asceticism_packages",
+        ["packageId"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_UserAsceticism_createdAt", "UserAsceticism", ["createdAt"])
+    op.create_index("ix_AsceticismLog_changeSeq", "AsceticismLog", ["changeSeq"])
+    op.create_index("ix_AsceticismLog_date", "AsceticismLog", ["date"])
+
+    op.create_table(
+        "analytics_watermarks",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("changeSeq", sa.BigInteger(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "analytics_user_days",
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("userId", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "userId"),
+    )
+    op.create_table(
+        "analytics_daily",
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("activeUsers", sa.Integer(), nullable=False),
+        sa.Column("weeklyActiveUsers", sa.Integer(), nullable=False),
+        sa.Column("monthlyActiveUsers", sa.Integer(), nullable=False),
+        sa.Column("logs", sa.Integer(), nullable=False),
+        sa.Column("completedLogs", sa.Integer(), nullable=False),
+        sa.Column("joins", sa.Integer(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("date"),
+    )
+    op.create_table(
+        "analytics_template_daily",
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("asceticismId", sa.Integer(), nullable=False),
+        sa.Column("activeUsers", sa.Integer(), nullable=False),
+        sa.Column("logs", sa.Integer(), nullable=False),
+        sa.Column("completedLogs", sa.Integer(), nullable=False),
+        sa.Column("joins", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "asceticismId"),
+    )
+    op.create_table(
+        "analytics_package_daily",
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("packageId", sa.Integer(), nullable=False),
+        sa.Column("joins", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "packageId"),
+    )
+    op.create_table(
+        "analytics_retention",
+        sa.Column("cohortType", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("cohortKey", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("cohortStart", sa.DateTime(), nullable=False),
+        sa.Column("weekOffset", sa.Integer(), nullable=False),
+        sa.Column("users", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("cohortType", "cohortKey", "weekOffset"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_retention")
+    op.drop_table("analytics_package_daily")
+    op.drop_table("analytics_template_daily")
+    op.drop_table("analytics_daily")
+    op.drop_table("analytics_user_days")
+    op.drop_table("analytics_watermarks")
+    op.drop_index("ix_AsceticismLog_date", table_name="AsceticismLog")
+    op.drop_index("ix_AsceticismLog_changeSeq", table_name="AsceticismLog")
+    op.drop_index("ix_UserAsceticism_createdAt", table_name="UserAsceticism")
+    op.drop_constraint(
+        "UserAsceticism_packageId_fkey", "UserAsceticism", type_="foreignkey"
+    )
+    op.drop_column("UserAsceticism", "packageId")
@@ -0,0 +1,44 @@
+"""add_retention_cohort_sizes
+
+Revision ID: e7a4c1f95d30
+Revises: 5b9e2d7c4a18
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a4c1f95d30"
+down_revision: Union[str, None] = "5b9e2d7c4a18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("eligibleUsers", "cohortSize"):
+        op.add_column(
+            "analytics_retention",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.alter_column("analytics_retention", column, server_default=None)
+    # Existing rows are first-active-week cohorts, whose offset 0 is the size
+    op.execute(
+        """
+        UPDATE analytics_retention r
+        SET "cohortSize" = c.users, "eligibleUsers" = c.users
+        FROM analytics_retention c
+        WHERE c."cohortType" = r."cohortType"
+          AND c."cohortKey" = r."cohortKey"
+          AND c."weekOffset" = 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("analytics_retention", "cohortSize")
+    op.drop_column("analytics_retention", "eligibleUsers")
@@ -0,0 +1,109 @@
+"""add_popularity_counters
+
+Revision ID: 9d2f6b3e8a41
+Revises: e7a4c1f95d30
+Create Date: 2026-10-18 15:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2f6b3e8a41"
+down_revision: Union[str, None] = "e7a4c1f95d30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asceticism_stats",
+        sa.Column("asceticismId", sa.Integer(), nullable=False),
+        sa.Column("activeUsers", sa.Integer(), nullable=False),
+        sa.Column("totalJoins", sa.Integer(), nullable=False),
+        sa.Column("recentLogs", sa.Integer(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["asceticismId"], ["Asceticism.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("asceticismId"),
+    )
+    op.create_table(
+        "package_stats",
+        sa.Column("packageId", sa.Integer(), nullable=False),
+        sa.Column("activeUsers", sa.Integer(), nullable=False),
+        sa.Column("totalJoins", sa.Integer(), nullable=False),
+        sa.Column("recentLogs", sa.Integer(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["packageId"], ["asceticism_packages.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("packageId"),
+    )
+
+    # Seed the counters, as app.core.popularity.reconcile does; the delete
+    # check on asceticisms relies on them from now on
+    op.execute(
+        """
+        INSERT INTO asceticism_stats
+            ("asceticismId", "activeUsers", "totalJoins", "recentLogs", "updatedAt")
+        SELECT a.id,
+               coalesce(c.active, 0),
+               coalesce(c.joins, 0),
+               coalesce(l.logs, 0),
+               now() AT TIME ZONE 'utc'
+        FROM "Asceticism" a
+        LEFT JOIN (
+            SELECT "asceticismId",
+                   count(*) FILTER (WHERE status = 'ACTIVE') AS active,
+                   count(*) AS joins
+            FROM "UserAsceticism"
+            GROUP BY "asceticismId"
+        ) c ON c."asceticismId" = a.id
+        LEFT JOIN (
+            SELECT ua."asceticismId", count(*) AS logs
+            FROM "AsceticismLog" l
+            JOIN "UserAsceticism" ua ON ua.id = l."userAsceticismId"
+            WHERE l.date >= now() AT TIME ZONE 'utc' - interval '30 days'
+            GROUP BY ua."asceticismId"
+        ) l ON l."asceticismId" = a.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO package_stats
+            ("packageId", "activeUsers", "totalJoins", "recentLogs", "updatedAt")
+        SELECT p.id,
+               coalesce(m.active, 0),
+               coalesce(m.joins, 0),
+               coalesce(l.logs, 0),
+               now() AT TIME ZONE 'utc'
+        FROM asceticism_packages p
+        LEFT JOIN (
+            SELECT "packageId",
+                   count(DISTINCT "userId") FILTER (WHERE status = 'ACTIVE')
+                       AS active,
+                   count(DISTINCT "userId") AS joins
+            FROM "UserAsceticism"
+            WHERE "packageId" IS NOT NULL
+            GROUP BY "packageId"
+        ) m ON m."packageId" = p.id
+        LEFT JOIN (
+            SELECT ua."packageId", count(*) AS logs
+            FROM "AsceticismLog" l
+            JOIN "UserAsceticism" ua ON ua.id = l."userAsceticismId"
+            WHERE ua."packageId" IS NOT NULL
+              AND l.date >= now() AT TIME ZONE 'utc' - interval '30 days'
+            GROUP BY ua."packageId"
+        ) l ON l."packageId" = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("package_stats")
+    op.drop_table("asceticism_stats")
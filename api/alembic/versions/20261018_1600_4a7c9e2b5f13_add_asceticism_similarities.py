@@ -0,0 +1,42 @@
+"""add_asceticism_similarities
+
+Revision ID: 4a7c9e2b5f13
+Revises: 9d2f6b3e8a41
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4a7c9e2b5f13"
+down_revision: Union[str, None] = "9d2f6b3e8a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asceticism_similarities",
+        sa.Column("asceticismId", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("similarAsceticismId", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("coUsers", sa.Integer(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["asceticismId"], ["Asceticism.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["similarAsceticismId"], ["Asceticism.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("asceticismId", "rank"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("asceticism_similarities")
@@ -0,0 +1,69 @@
+"""number_changes_by_transaction
+
+Revision ID: 6e1b8d4f2a97
+Revises: 4a7c9e2b5f13
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e1b8d4f2a97"
+down_revision: Union[str, None] = "4a7c9e2b5f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNCED_TABLES = ("UserAsceticism", "AsceticismLog", "daily_reading_notes")
+
+
+def upgrade() -> None:
+    # Changes are numbered by transaction id, then by a counter local to the
+    # transaction, so every transaction older than a snapshot's xmin has
+    # ended and numbered all its changes below xmin << 24. Values of the old
+    # sequence are all lower than the new ones.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_change_seq() RETURNS trigger AS $$
+        DECLARE
+            n bigint := coalesce(
+                nullif(current_setting('change_seq.count', true), ''), '0'
+            )::bigint;
+        BEGIN
+            PERFORM set_config('change_seq.count', (n + 1)::text, true);
+            NEW."changeSeq" := (pg_current_xact_id()::text::bigint << 24) + n;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER "sync_tombstones_change_seq" '
+        "BEFORE INSERT ON sync_tombstones "
+        "FOR EACH ROW EXECUTE FUNCTION bump_change_seq()"
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS "sync_tombstones_change_seq" ON sync_tombstones')
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW."changeSeq" := nextval('change_seq');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Continue the sequence above the transaction-numbered values
+    for table in SYNCED_TABLES + ("sync_tombstones",):
+        op.execute(
+            "SELECT setval('change_seq', greatest("
+            f"(SELECT coalesce(max(\"changeSeq\"), 1) FROM \"{table}\"), "
+            "(SELECT last_value FROM change_seq)))"
+        )
@@ -0,0 +1,36 @@
+"""add_bundle_readings_hash
+
+Revision ID: b83e5d1c7a26
+Revises: 6e1b8d4f2a97
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b83e5d1c7a26"
+down_revision: Union[str, None] = "6e1b8d4f2a97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing bundles have no readings hash and are rebuilt on next request
+    op.add_column(
+        "readings_bundles",
+        sa.Column("readingsHash", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.create_index(
+        "ix_readings_bundles_contentHash", "readings_bundles", ["contentHash"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_readings_bundles_contentHash", table_name="readings_bundles")
+    op.drop_column("readings_bundles", "readingsHash")
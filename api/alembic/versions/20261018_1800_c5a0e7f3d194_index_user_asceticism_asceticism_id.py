@@ -0,0 +1,29 @@
+"""index_user_asceticism_asceticism_id
+
+Revision ID: c5a0e7f3d194
+Revises: b83e5d1c7a26
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a0e7f3d194"
+down_revision: Union[str, None] = "b83e5d1c7a26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Template deletion checks for commitments, and cascades to them
+    op.create_index(
+        "ix_UserAsceticism_asceticismId", "UserAsceticism", ["asceticismId"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_UserAsceticism_asceticismId", table_name="UserAsceticism")
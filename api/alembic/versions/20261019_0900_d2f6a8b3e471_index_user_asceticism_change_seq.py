@@ -0,0 +1,27 @@
+"""index_user_asceticism_change_seq
+
+Revision ID: d2f6a8b3e471
+Revises: c5a0e7f3d194
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f6a8b3e471"
+down_revision: Union[str, None] = "c5a0e7f3d194"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rollups find the join days of commitments changed since the watermark
+    op.create_index("ix_UserAsceticism_changeSeq", "UserAsceticism", ["changeSeq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_UserAsceticism_changeSeq", table_name="UserAsceticism")
@@ -4,13 +4,20 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from sqlmodel import Session, select, func
 from app.core.database import get_session
-from app.core.auth import require_admin
+from app.core.admission import limits as admission_limits
+from app.core.auth import require_admin, user_cache
+from app.core.invalidation import USER_ACCOUNT, publish_invalidation
+from app.core.micro_cache import micro_cache
+from app.core.universalis import breaker as universalis_breaker
 from app.models import User, UserRole, UserAsceticism, GroupMember
 from app.schemas.admin import (
     UserResponse,
     UpdateRoleRequest,
     ToggleBanRequest,
     CurrentUserResponse,
+    UpstreamStatusResponse,
+    AdmissionStatusResponse,
+    MicroCacheStatusResponse,
 )
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -93,7 +100,9 @@ async def update_user_role(
 
     user.role = new_role
     session.add(user)
+    publish_invalidation(session, USER_ACCOUNT, user.id)
     session.commit()
+    user_cache.delete(user.email)
 
     return {"success": True}
 
@@ -120,7 +129,9 @@ async def toggle_user_ban(
 
     user.isBanned = request.isBanned
     session.add(user)
+    publish_invalidation(session, USER_ACCOUNT, user.id)
     session.commit()
+    user_cache.delete(user.email)
 
     return {"success": True}
 
@@ -139,3 +150,36 @@ async def get_current_user_info(
         role=current_user.role.value,
         isBanned=current_user.isBanned,
     )
+
+
+@router.get("/upstreams", response_model=list[UpstreamStatusResponse])
+async def get_upstream_status(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Get circuit breaker state and call counters for upstream services,
+    as seen by the worker serving this request.
+    """
+    return [universalis_breaker.snapshot()]
+
+
+@router.get("/admission", response_model=list[AdmissionStatusResponse])
+async def get_admission_status(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Get concurrency, queue depth and shed counts per route class,
+    as seen by the worker serving this request.
+    """
+    return [limit.snapshot() for limit in admission_limits.values()]
+
+
+@router.get("/micro-cache", response_model=MicroCacheStatusResponse)
+async def get_micro_cache_status(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Get hit, coalesce and miss counts of the anonymous GET micro-cache,
+    as seen by the worker serving this request.
+    """
+    return micro_cache.snapshot()
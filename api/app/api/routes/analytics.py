@@ -0,0 +1,250 @@
+"""Admin analytics router, served from the rollup aggregates only."""
+
+from datetime import date, datetime, timedelta
+import math
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, select, func
+from app.core.analytics import COHORT_TYPES, FIRST_ACTIVE_WEEK
+from app.core.auth import require_admin
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.jobs import enqueue
+from app.jobs.handlers import ROLLUP_ANALYTICS
+from app.models import (
+    AnalyticsDaily,
+    AnalyticsPackageDaily,
+    AnalyticsRetention,
+    AnalyticsTemplateDaily,
+    Asceticism,
+    AsceticismPackage,
+    User,
+)
+from app.schemas.analytics import (
+    DailyActivityResponse,
+    PackageStatsResponse,
+    RetentionCohortResponse,
+    RetentionWeek,
+    TemplateStatsResponse,
+)
+from app.schemas.jobs import JobResponse
+
+router = APIRouter(prefix="/admin/analytics", tags=["analytics"])
+
+
+def date_range(
+    start_date: Optional[date] = Query(None, alias="startDate"),
+    end_date: Optional[date] = Query(None, alias="endDate"),
+) -> tuple[datetime, datetime]:
+    """Days to report on as UTC midnights; defaults to the last 30 days."""
+    end = end_date or datetime.utcnow().date()
+    start = start_date or end - timedelta(days=29)
+    return (
+        datetime(start.year, start.month, start.day),
+        datetime(end.year, end.month, end.day),
+    )
+
+
+def completion_rate(completed: int, logs: int) -> Optional[float]:
+    return round(completed / logs, 4) if logs else None
+
+
+@router.get("/activity", response_model=list[DailyActivityResponse])
+async def get_daily_activity(
+    days: tuple[datetime, datetime] = Depends(date_range),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """Daily, weekly and monthly active users, logs and joins per day."""
+    rows = session.exec(
+        select(AnalyticsDaily)
+        .where(AnalyticsDaily.date >= days[0], AnalyticsDaily.date <= days[1])
+        .order_by(AnalyticsDaily.date)
+    ).all()
+    return [
+        DailyActivityResponse(
+            date=row.date,
+            activeUsers=row.activeUsers,
+            weeklyActiveUsers=row.weeklyActiveUsers,
+            monthlyActiveUsers=row.monthlyActiveUsers,
+            logs=row.logs,
+            completedLogs=row.completedLogs,
+            completionRate=completion_rate(row.completedLogs, row.logs),
+            joins=row.joins,
+        )
+        for row in rows
+    ]
+
+
+@router.get("/templates", response_model=list[TemplateStatsResponse])
+async def get_template_stats(
+    days: tuple[datetime, datetime] = Depends(date_range),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """Templates by number of logs, with completion rates and joins."""
+    logs = func.sum(AnalyticsTemplateDaily.logs)
+    rows = session.exec(
+        select(
+            Asceticism.id,
+            Asceticism.title,
+            Asceticism.category,
+            func.sum(AnalyticsTemplateDaily.activeUsers),
+            logs,
+            func.sum(AnalyticsTemplateDaily.completedLogs),
+            func.sum(AnalyticsTemplateDaily.joins),
+        )
+        .join(Asceticism, Asceticism.id == AnalyticsTemplateDaily.asceticismId)
+        .where(
+            Asceticism.isTemplate == True,
+            AnalyticsTemplateDaily.date >= days[0],
+            AnalyticsTemplateDaily.date <= days[1],
+        )
+        .group_by(Asceticism.id)
+        .order_by(logs.desc(), Asceticism.id)
+        .limit(limit)
+    ).all()
+    return [
+        TemplateStatsResponse(
+            asceticismId=asceticism_id,
+            title=title,
+            category=category,
+            activeUserDays=active_user_days,
+            logs=log_count,
+            completedLogs=completed,
+            completionRate=completion_rate(completed, log_count),
+            joins=joins,
+        )
+        for (
+            asceticism_id,
+            title,
+            category,
+            active_user_days,
+            log_count,
+            completed,
+            joins,
+        ) in rows
+    ]
+
+
+@router.get("/packages", response_model=list[PackageStatsResponse])
+async def get_package_stats(
+    days: tuple[datetime, datetime] = Depends(date_range),
+    limit: int = Query(20, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """Most joined packages: users who activated each package."""
+    joins = func.sum(AnalyticsPackageDaily.joins)
+    rows = session.exec(
+        select(AsceticismPackage.id, AsceticismPackage.title, joins)
+        .join(
+            AsceticismPackage,
+            AsceticismPackage.id == AnalyticsPackageDaily.packageId,
+        )
+        .where(
+            AnalyticsPackageDaily.date >= days[0],
+            AnalyticsPackageDaily.date <= days[1],
+        )
+        .group_by(AsceticismPackage.id)
+        .order_by(joins.desc(), AsceticismPackage.id)
+        .limit(limit)
+    ).all()
+    return [
+        PackageStatsResponse(packageId=package_id, title=title, joins=package_joins)
+        for package_id, title, package_joins in rows
+    ]
+
+
+@router.get("/retention", response_model=list[RetentionCohortResponse])
+async def get_retention(
+    cohort_type: str = Query(FIRST_ACTIVE_WEEK, alias="cohortType"),
+    cohorts: int = Query(12, ge=1, le=500, description="most recent cohorts"),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """
+    Weekly retention curves. Users are grouped by their first active week
+    (kept current by the rollup), or by signup week or package joined
+    (computed by python -m app.jobs.compute_cohorts).
+    """
+    if cohort_type not in COHORT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"cohortType must be one of: {', '.join(COHORT_TYPES)}",
+        )
+    recent = (
+        select(AnalyticsRetention.cohortKey)
+        .where(
+            AnalyticsRetention.cohortType == cohort_type,
+            AnalyticsRetention.weekOffset == 0,
+        )
+        .order_by(AnalyticsRetention.cohortStart.desc())
+        .limit(cohorts)
+    )
+    rows = session.exec(
+        select(AnalyticsRetention)
+        .where(
+            AnalyticsRetention.cohortType == cohort_type,
+            AnalyticsRetention.cohortKey.in_(recent),
+        )
+        .order_by(AnalyticsRetention.cohortStart, AnalyticsRetention.weekOffset)
+    ).all()
+
+    curves: dict[str, RetentionCohortResponse] = {}
+    for row in rows:
+        curve = curves.get(row.cohortKey)
+        if curve is None:
+            curve = curves[row.cohortKey] = RetentionCohortResponse(
+                cohortType=row.cohortType,
+                cohortKey=row.cohortKey,
+                cohortStart=row.cohortStart,
+                size=row.cohortSize,
+                weeks=[],
+            )
+        curve.weeks.append(
+            RetentionWeek(
+                weekOffset=row.weekOffset,
+                users=row.users,
+                eligibleUsers=row.eligibleUsers,
+                rate=round(row.users / row.eligibleUsers, 4),
+            )
+        )
+    return list(curves.values())
+
+
+@router.post("/rollup", status_code=202, response_model=JobResponse)
+async def queue_rollup(
+    start_date: Optional[date] = Query(None, alias="startDate"),
+    end_date: Optional[date] = Query(None, alias="endDate"),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """
+    Queue an update of the aggregates now rather than at the next scheduled
+    run. With a date range, those days are recomputed from scratch.
+    """
+    payload = {}
+    if start_date:
+        payload["from"] = start_date.isoformat()
+    if end_date:
+        payload["to"] = end_date.isoformat()
+    job = enqueue(
+        session,
+        ROLLUP_ANALYTICS,
+        payload,
+        user_id=current_user.id,
+        # Ranged rebuilds are not interchangeable, so only plain runs dedupe
+        dedupe_key=None if payload else "analytics:rollup",
+    )
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(JobResponse.model_validate(job)),
+        headers={
+            "Location": f"/jobs/{job.id}",
+            "Retry-After": str(math.ceil(settings.JOB_POLL_SECONDS)),
+        },
+    )
@@ -1,13 +1,36 @@
 """Asceticisms router for managing user ascetical practices."""
 
+import base64
+import math
+import struct
+import numpy as np
 from typing import Optional
-from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, HTTPException, Query, Depends
+from datetime import date, datetime, timezone, timedelta
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import Date, Integer, cast
+from sqlalchemy.dialects.postgresql import BIT, aggregate_order_by
 from sqlmodel import Session, select, and_, or_, func
+from app.core.cache import catalog_cache, invalidate_catalog
 from app.core.database import get_session
 from app.core.auth import get_current_user, require_admin
+from app.core.events import publish_event
+from app.core.invalidation import CATALOG, USER_DATA, publish_invalidation
+from app.core.leaderboard import leaderboard_cache
+from app.core.log_writer import log_committer, upsert_logs
+from app.core.popularity import (
+    SORT_POPULAR,
+    package_memberships,
+    record_commitment,
+    record_logs,
+    record_package_memberships,
+)
+from app.core.response_cache import user_response_cache
+from app.core.trends import compute_trends, finite, load_daily_values
 from app.models import (
     Asceticism,
+    AsceticismSimilarity,
+    AsceticismStats,
     UserAsceticism,
     AsceticismLog,
     TrackingType,
@@ -26,10 +49,23 @@ from app.schemas.asceticisms import (
     LogUpdate,
     LogResponse,
     AsceticismProgressResponse,
+    CalendarResponse,
+    NumericTrendsResponse,
+    SimilarAsceticismResponse,
 )
 
 router = APIRouter()
 
+# Upper bound on the number of days a single calendar request may cover
+MAX_CALENDAR_DAYS = 731
+
+# Serializers for responses held in the catalog and per-user response caches
+TEMPLATES_ADAPTER = TypeAdapter(list[AsceticismResponse])
+USER_ASCETICISMS_ADAPTER = TypeAdapter(list[UserAsceticismWithDetails])
+PROGRESS_ADAPTER = TypeAdapter(list[AsceticismProgressResponse])
+TRENDS_ADAPTER = TypeAdapter(list[NumericTrendsResponse])
+SIMILAR_ADAPTER = TypeAdapter(list[SimilarAsceticismResponse])
+
 
 def parse_date(date_str: str) -> datetime:
     """Parse YYYY-MM-DD or ISO datetime string to datetime."""
@@ -39,20 +75,97 @@ def parse_date(date_str: str) -> datetime:
         return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
 
 
+def publish_commitment_event(
+    session: Session, user_asceticism: UserAsceticism, event_type: str
+) -> None:
+    """Push a commitment change to the owner's other devices."""
+    publish_event(
+        session,
+        user_asceticism.userId,
+        event_type,
+        {
+            "id": user_asceticism.id,
+            "asceticismId": user_asceticism.asceticismId,
+            "status": user_asceticism.status,
+            "startDate": user_asceticism.startDate,
+            "endDate": user_asceticism.endDate,
+        },
+    )
+
+
+def publish_log_event(session: Session, user_id: int, log: AsceticismLog) -> None:
+    """Push a saved log to the owner's other devices."""
+    publish_event(
+        session,
+        user_id,
+        "log.saved",
+        {
+            "id": log.id,
+            "userAsceticismId": log.userAsceticismId,
+            "date": log.date,
+            "completed": log.completed,
+            "value": log.value,
+        },
+    )
+
+
+def pack_day_bits(bits: Optional[str], days: int) -> str:
+    """Pack a Postgres bit string ("0101...") into a base64 bitset."""
+    size = (days + 7) // 8
+    if not bits:
+        return base64.b64encode(bytes(size)).decode("ascii")
+    padded = bits.ljust(size * 8, "0")
+    return base64.b64encode(int(padded, 2).to_bytes(size, "big")).decode("ascii")
+
+
+def pack_day_values(
+    offsets: Optional[list[int]], values: Optional[list[float]], days: int
+) -> str:
+    """Pack per-day values into base64 little-endian float32, NaN where missing."""
+    packed = [math.nan] * days
+    for offset, value in zip(offsets or [], values or []):
+        if 0 <= offset < days:
+            packed[offset] = value
+    return base64.b64encode(struct.pack(f"<{days}f", *packed)).decode("ascii")
+
+
 @router.get(
     "/asceticisms/", tags=["asceticisms"], response_model=list[AsceticismResponse]
 )
 async def list_asceticisms(
     category: Optional[str] = None,
+    sort: Optional[str] = Query(None, description='"popular": most active first'),
     session: Session = Depends(get_session),
 ):
-    """List all available asceticism templates."""
-    statement = select(Asceticism).where(Asceticism.isTemplate == True)
-    if category:
-        statement = statement.where(Asceticism.category == category)
+    """
+    List all available asceticism templates. Popularity rankings are as
+    fresh as the catalog cache.
+    """
+    if sort not in (None, SORT_POPULAR):
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+
+    async def load() -> bytes:
+        statement = select(Asceticism).where(Asceticism.isTemplate == True)
+        if category:
+            statement = statement.where(Asceticism.category == category)
+        if sort == SORT_POPULAR:
+            statement = statement.outerjoin(
+                AsceticismStats, AsceticismStats.asceticismId == Asceticism.id
+            ).order_by(
+                func.coalesce(AsceticismStats.activeUsers, 0).desc(),
+                func.coalesce(AsceticismStats.recentLogs, 0).desc(),
+                func.coalesce(AsceticismStats.totalJoins, 0).desc(),
+                Asceticism.id,
+            )
+
+        asceticisms = session.exec(statement).all()
+        return TEMPLATES_ADAPTER.dump_json(
+            TEMPLATES_ADAPTER.validate_python(asceticisms, from_attributes=True)
+        )
 
-    asceticisms = session.exec(statement).all()
-    return asceticisms
+    prefix = "popular-asceticisms" if sort == SORT_POPULAR else "asceticisms"
+    body = await catalog_cache.get_or_compute(f"{prefix}:{category or ''}", load)
+    return Response(body, media_type="application/json")
 
 
 @router.post("/asceticisms/", tags=["asceticisms"], response_model=AsceticismResponse)
@@ -88,7 +201,12 @@ async def create_asceticism(
     )
 
     session.add(asceticism)
+    if is_template:
+        session.flush()
+        publish_invalidation(session, CATALOG, f"asceticism:{asceticism.id}")
     session.commit()
+    if is_template:
+        invalidate_catalog(f"asceticism:{asceticism.id}")
     session.refresh(asceticism)
 
     return asceticism
@@ -123,7 +241,11 @@ async def update_asceticism(
     asceticism.updatedAt = datetime.utcnow()
 
     session.add(asceticism)
+    publish_invalidation(session, CATALOG, f"asceticism:{asceticism_id}")
     session.commit()
+    invalidate_catalog(f"asceticism:{asceticism_id}")
+    # Template details are embedded in every user's dashboard responses
+    user_response_cache.bump_all()
     session.refresh(asceticism)
 
     return asceticism
@@ -140,28 +262,74 @@ async def delete_asceticism(
     if not asceticism:
         raise HTTPException(status_code=404, detail="Asceticism not found")
 
-    # Check if any users are committed to this asceticism
-    user_count_stmt = select(func.count(UserAsceticism.id)).where(
-        UserAsceticism.asceticismId == asceticism_id
-    )
-    user_count = session.exec(user_count_stmt).one()
-    if user_count > 0:
+    # Check if any users are committed to this asceticism. Their commitments
+    # would cascade, so check exactly rather than by the popularity counters
+    committed = UserAsceticism.asceticismId == asceticism_id
+    if session.exec(select(UserAsceticism.id).where(committed).limit(1)).first():
+        user_count = session.exec(
+            select(func.count(UserAsceticism.id)).where(committed)
+        ).one()
         raise HTTPException(
             status_code=400,
             detail=f"Cannot delete asceticism: {user_count} user(s) are currently committed to it",
         )
 
     session.delete(asceticism)
+    publish_invalidation(session, CATALOG, f"asceticism:{asceticism_id}")
     session.commit()
+    invalidate_catalog(f"asceticism:{asceticism_id}")
     return {"message": "Asceticism deleted successfully"}
 
 
+@router.get(
+    "/asceticisms/{asceticism_id}/similar",
+    tags=["asceticisms"],
+    response_model=list[SimilarAsceticismResponse],
+)
+async def list_similar_asceticisms(
+    asceticism_id: int,
+    session: Session = Depends(get_session),
+):
+    """
+    Templates most often taken on by users of a template, most similar
+    first, as precomputed by app.jobs.build_similarities.
+    """
+
+    async def load() -> bytes:
+        rows = session.exec(
+            select(AsceticismSimilarity, Asceticism)
+            .join(Asceticism, Asceticism.id == AsceticismSimilarity.similarAsceticismId)
+            .where(AsceticismSimilarity.asceticismId == asceticism_id)
+            .order_by(AsceticismSimilarity.rank)
+        ).all()
+        if not rows:
+            # Only templates have neighbours; tell a missing one from a new one
+            asceticism = session.get(Asceticism, asceticism_id)
+            if not asceticism or not asceticism.isTemplate:
+                raise HTTPException(status_code=404, detail="Asceticism not found")
+
+        return SIMILAR_ADAPTER.dump_json(
+            [
+                SimilarAsceticismResponse(
+                    asceticism=AsceticismResponse.model_validate(asceticism),
+                    score=similarity.score,
+                    coUsers=similarity.coUsers,
+                )
+                for similarity, asceticism in rows
+            ]
+        )
+
+    body = await catalog_cache.get_or_compute(f"similar:{asceticism_id}", load)
+    return Response(body, media_type="application/json")
+
+
 @router.get(
     "/asceticisms/my",
     tags=["asceticisms"],
     response_model=list[UserAsceticismWithDetails],
 )
 async def list_user_asceticisms(
+    request: Request,
     user_id: int = Query(..., alias="userId"),
     start_date: Optional[str] = Query(None, alias="startDate"),
     end_date: Optional[str] = Query(None, alias="endDate"),
@@ -169,12 +337,21 @@ async def list_user_asceticisms(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    """Get all asceticisms for a specific user that overlap with the date range."""
+    """
+    Get all asceticisms for a specific user that overlap with the date range.
+    Served from the per-user response cache until the user changes data.
+    """
     # Users can only view their own asceticisms unless they're admin
     if current_user.id != user_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=403, detail="Cannot view another user's asceticisms"
         )
+    cache_key = user_response_cache.key(user_id, request)
+    cached = user_response_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    cache_version = user_response_cache.version(user_id)
+
     # Build base query
     statement = select(UserAsceticism).where(UserAsceticism.userId == user_id)
 
@@ -282,7 +459,11 @@ async def list_user_asceticisms(
             }
         )
 
-    return result
+    body = USER_ASCETICISMS_ADAPTER.dump_json(
+        USER_ASCETICISMS_ADAPTER.validate_python(result)
+    )
+    user_response_cache.set(cache_key, cache_version, body)
+    return Response(body, media_type="application/json")
 
 
 @router.post(
@@ -327,6 +508,9 @@ async def join_asceticism(
 
     # If archived version exists, reactivate it
     if existing_archived:
+        memberships = package_memberships(
+            session, current_user.id, [existing_archived.packageId]
+        )
         existing_archived.status = AsceticismStatus.ACTIVE
         existing_archived.endDate = None
         existing_archived.startDate = (
@@ -342,7 +526,18 @@ async def join_asceticism(
         existing_archived.updatedAt = datetime.utcnow()
 
         session.add(existing_archived)
+        record_commitment(
+            session,
+            existing_archived.asceticismId,
+            AsceticismStatus.ARCHIVED,
+            AsceticismStatus.ACTIVE,
+        )
+        record_package_memberships(session, current_user.id, memberships)
+        publish_commitment_event(session, existing_archived, "commitment.joined")
+        publish_invalidation(session, USER_DATA, current_user.id)
         session.commit()
+        leaderboard_cache.invalidate_user(current_user.id)
+        user_response_cache.bump(current_user.id)
         session.refresh(existing_archived)
 
         # Load asceticism
@@ -395,7 +590,15 @@ async def join_asceticism(
     )
 
     session.add(user_asceticism)
+    session.flush()
+    record_commitment(
+        session, user_asceticism.asceticismId, None, user_asceticism.status
+    )
+    publish_commitment_event(session, user_asceticism, "commitment.joined")
+    publish_invalidation(session, USER_DATA, current_user.id)
     session.commit()
+    leaderboard_cache.invalidate_user(current_user.id)
+    user_response_cache.bump(current_user.id)
     session.refresh(user_asceticism)
 
     # Load asceticism
@@ -433,7 +636,10 @@ async def log_daily_progress(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    """Log progress for a specific day."""
+    """
+    Log progress for a specific day. With LOG_GROUP_COMMIT_ENABLED the
+    upsert is committed together with concurrent ones.
+    """
     # Verify the UserAsceticism belongs to the current user
     user_asceticism = session.get(UserAsceticism, log.userAsceticismId)
     if not user_asceticism:
@@ -456,45 +662,35 @@ async def log_daily_progress(
             detail="Invalid date format. Use YYYY-MM-DD or ISO datetime.",
         ) from exc
 
-    # Check if log already exists
-    existing_log_stmt = select(AsceticismLog).where(
-        and_(
-            AsceticismLog.userAsceticismId == log.userAsceticismId,
-            AsceticismLog.date == parsed_date,
-        )
-    )
-    existing_log = session.exec(existing_log_stmt).first()
-
-    if existing_log:
-        # Update existing log
-        existing_log.completed = log.completed
-        if log.value is not None:
-            existing_log.value = log.value
-        if log.notes is not None:
-            existing_log.notes = log.notes
-        if log.custom_metadata is not None:
-            existing_log.custom_metadata = log.custom_metadata
-        existing_log.updatedAt = datetime.utcnow()
-
-        session.add(existing_log)
-        session.commit()
-        session.refresh(existing_log)
-        return existing_log
-
-    # Create new log
-    new_log = AsceticismLog(
-        userAsceticismId=log.userAsceticismId,
-        date=parsed_date,
-        completed=log.completed,
-        value=log.value,
-        notes=log.notes,
-        custom_metadata=log.custom_metadata,
-    )
-
-    session.add(new_log)
+    row = {
+        "userAsceticismId": log.userAsceticismId,
+        "date": parsed_date.astimezone(timezone.utc).replace(tzinfo=None),
+        "completed": log.completed,
+        "value": log.value,
+        "notes": log.notes,
+        "custom_metadata": log.custom_metadata,
+    }
+    if log_committer.running:
+        # Don't hold a pooled connection while waiting for the batch. Nothing
+        # above awaits, so the connection was only checked out briefly
+        session.close()
+        # Upsert in the next group commit; returns once it is committed
+        saved_log = await log_committer.submit(current_user.id, row)
+        leaderboard_cache.invalidate_user(current_user.id)
+        user_response_cache.bump(current_user.id)
+        return saved_log
+
+    # An upsert, so concurrent first logs of a day don't conflict
+    saved = dict(session.execute(upsert_logs([row])).mappings().one())
+    if saved.pop("inserted"):
+        record_logs(session, [(saved["userAsceticismId"], saved["date"])])
+    saved_log = AsceticismLog(**saved)
+    publish_log_event(session, current_user.id, saved_log)
+    publish_invalidation(session, USER_DATA, current_user.id)
     session.commit()
-    session.refresh(new_log)
-    return new_log
+    leaderboard_cache.invalidate_user(current_user.id)
+    user_response_cache.bump(current_user.id)
+    return saved_log
 
 
 @router.delete("/asceticisms/leave/{user_asceticism_id}", tags=["asceticisms"])
@@ -538,12 +734,24 @@ async def leave_asceticism(
         yesterday = datetime.now(timezone.utc) - timedelta(days=1)
         end_date = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
 
+    memberships = package_memberships(
+        session, current_user.id, [user_asceticism.packageId]
+    )
+    old_status = user_asceticism.status
     user_asceticism.status = AsceticismStatus.ARCHIVED
     user_asceticism.endDate = end_date
     user_asceticism.updatedAt = datetime.utcnow()
 
     session.add(user_asceticism)
+    record_commitment(
+        session, user_asceticism.asceticismId, old_status, user_asceticism.status
+    )
+    record_package_memberships(session, current_user.id, memberships)
+    publish_commitment_event(session, user_asceticism, "commitment.left")
+    publish_invalidation(session, USER_DATA, current_user.id)
     session.commit()
+    leaderboard_cache.invalidate_user(current_user.id)
+    user_response_cache.bump(current_user.id)
 
     return {"message": "Successfully left asceticism"}
 
@@ -589,13 +797,34 @@ async def update_user_asceticism(
     if update.targetValue is not None:
         user_asceticism.targetValue = update.targetValue
 
+    old_status = user_asceticism.status
+    memberships = {}
     if update.status is not None:
+        memberships = package_memberships(
+            session, current_user.id, [user_asceticism.packageId]
+        )
         user_asceticism.status = update.status
 
+    if update.reminderTime is not None:
+        try:
+            user_asceticism.reminderTime = parse_date(update.reminderTime)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail="Invalid reminderTime format"
+            ) from exc
+
     user_asceticism.updatedAt = datetime.utcnow()
 
     session.add(user_asceticism)
+    record_commitment(
+        session, user_asceticism.asceticismId, old_status, user_asceticism.status
+    )
+    record_package_memberships(session, current_user.id, memberships)
+    publish_commitment_event(session, user_asceticism, "commitment.updated")
+    publish_invalidation(session, USER_DATA, current_user.id)
     session.commit()
+    leaderboard_cache.invalidate_user(current_user.id)
+    user_response_cache.bump(current_user.id)
     session.refresh(user_asceticism)
 
     # Load asceticism
@@ -612,18 +841,28 @@ async def update_user_asceticism(
     response_model=list[AsceticismProgressResponse],
 )
 async def get_user_progress(
+    request: Request,
     user_id: int = Query(..., alias="userId"),
     start_date: str = Query(..., alias="startDate"),
     end_date: str = Query(..., alias="endDate"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    """Get progress statistics for all user asceticisms within a date range."""
+    """
+    Get progress statistics for all user asceticisms within a date range.
+    Served from the per-user response cache until the user changes data.
+    """
     # Users can only view their own progress unless they're admin
     if current_user.id != user_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=403, detail="Cannot view another user's progress"
         )
+    cache_key = user_response_cache.key(user_id, request)
+    cached = user_response_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    cache_version = user_response_cache.version(user_id)
+
     start = parse_date(start_date)
     end = parse_date(end_date).replace(hour=23, minute=59, second=59)
 
@@ -710,7 +949,287 @@ async def get_user_progress(
             }
         )
 
-    return progress_data
+    body = PROGRESS_ADAPTER.dump_json(PROGRESS_ADAPTER.validate_python(progress_data))
+    user_response_cache.set(cache_key, cache_version, body)
+    return Response(body, media_type="application/json")
+
+
+@router.get(
+    "/asceticisms/calendar",
+    tags=["asceticisms"],
+    response_model=CalendarResponse,
+)
+async def get_user_calendar(
+    user_id: int = Query(..., alias="userId"),
+    start_date: str = Query(..., alias="startDate"),
+    end_date: str = Query(..., alias="endDate"),
+    include_archived: bool = Query(True, alias="includeArchived"),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Get a compact completion calendar for all user asceticisms in a date range.
+    Each commitment is returned as a base64 bitset (one bit per day) built in
+    SQL with bit_or, plus packed float32 values for NUMERIC asceticisms.
+    """
+    # Users can only view their own calendar unless they're admin
+    if current_user.id != user_id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=403, detail="Cannot view another user's calendar"
+        )
+    try:
+        start: date = parse_date(start_date).date()
+        end: date = parse_date(end_date).date()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date format. Use YYYY-MM-DD or ISO datetime.",
+        ) from exc
+
+    days = (end - start).days + 1
+    if days < 1 or days > MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range must cover between 1 and {MAX_CALENDAR_DAYS} days",
+        )
+
+    range_start = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    range_end = range_start + timedelta(days=days)
+
+    # Day index of each log relative to the start of the range
+    day_offset = cast(cast(AsceticismLog.date, Date) - start, Integer)
+    empty_bits = cast(func.repeat("0", days), BIT(varying=True))
+    has_value = AsceticismLog.value != None
+
+    statement = (
+        select(
+            UserAsceticism.id,
+            UserAsceticism.asceticismId,
+            Asceticism.type,
+            func.bit_or(func.set_bit(empty_bits, day_offset, 1)).filter(
+                AsceticismLog.completed == True
+            ),
+            func.array_agg(aggregate_order_by(day_offset, AsceticismLog.date)).filter(
+                has_value
+            ),
+            func.array_agg(
+                aggregate_order_by(AsceticismLog.value, AsceticismLog.date)
+            ).filter(has_value),
+        )
+        .join(Asceticism, Asceticism.id == UserAsceticism.asceticismId)
+        .outerjoin(
+            AsceticismLog,
+            and_(
+                AsceticismLog.userAsceticismId == UserAsceticism.id,
+                AsceticismLog.date >= range_start,
+                AsceticismLog.date < range_end,
+            ),
+        )
+        .where(
+            UserAsceticism.userId == user_id,
+            UserAsceticism.startDate < range_end,
+            or_(
+                UserAsceticism.endDate == None,
+                UserAsceticism.endDate >= range_start,
+            ),
+        )
+        .group_by(UserAsceticism.id, UserAsceticism.asceticismId, Asceticism.type)
+        .order_by(UserAsceticism.id)
+    )
+
+    if include_archived:
+        statement = statement.where(
+            or_(
+                UserAsceticism.status == AsceticismStatus.ACTIVE,
+                UserAsceticism.status == AsceticismStatus.ARCHIVED,
+            )
+        )
+    else:
+        statement = statement.where(UserAsceticism.status == AsceticismStatus.ACTIVE)
+
+    rows = session.exec(statement).all()
+
+    return {
+        "startDate": start.isoformat(),
+        "days": days,
+        "commitments": [
+            {
+                "userAsceticismId": ua_id,
+                "asceticismId": asceticism_id,
+                "type": tracking_type.value,
+                "completed": pack_day_bits(bits, days),
+                "values": (
+                    pack_day_values(offsets, values, days)
+                    if tracking_type == TrackingType.NUMERIC
+                    else None
+                ),
+            }
+            for ua_id, asceticism_id, tracking_type, bits, offsets, values in rows
+        ],
+    }
 
 
 # Debug endpoint removed for security - use proper authentication flow
+
+
+def numeric_trends(
+    session: Session,
+    commitments: list[tuple[UserAsceticism, Asceticism]],
+    window: int,
+    days: int,
+    weeks: int,
+) -> list[dict]:
+    """Trends of NUMERIC commitments, computed together from one query."""
+    if not commitments:
+        return []
+    today = datetime.utcnow().date()
+    by_id = {ua.id: (ua, asceticism) for ua, asceticism in commitments}
+    start = min(min(ua.startDate.date() for ua, _ in commitments), today)
+    daily = load_daily_values(session, list(by_id), start, today)
+    ordered = [by_id[ua_id] for ua_id in daily.ids.tolist()]
+    start_offsets = np.array(
+        [max((ua.startDate.date() - start).days, 0) for ua, _ in ordered]
+    )
+    trends = compute_trends(
+        daily,
+        targets=np.array(
+            [ua.targetValue if ua.targetValue else np.nan for ua, _ in ordered]
+        ),
+        start_offsets=start_offsets,
+        window=window,
+    )
+
+    total_days = daily.values.shape[1]
+    total_weeks = trends.weekly.shape[1]
+    result = []
+    for i, (ua, asceticism) in enumerate(ordered):
+        # Series cover each commitment's own days, as if computed alone
+        own_start = start + timedelta(days=min(int(start_offsets[i]), total_days - 1))
+        series_days = min(days, (today - own_start).days + 1)
+        series_start = today - timedelta(days=series_days - 1)
+        own_weeks = total_weeks - (own_start - trends.week_start).days // 7
+        first_week = total_weeks - min(weeks, own_weeks)
+        reached_on = int(trends.reached_on[i])
+        days_to_target = trends.days_to_target[i]
+        result.append(
+            {
+                "userAsceticismId": ua.id,
+                "asceticism": {
+                    "id": asceticism.id,
+                    "title": asceticism.title,
+                    "category": asceticism.category,
+                    "icon": asceticism.icon,
+                    "type": asceticism.type.value,
+                },
+                "startDate": ua.startDate.isoformat(),
+                "targetValue": ua.targetValue,
+                "total": round(float(trends.total[i]), 2),
+                "percentOfTarget": finite(trends.percent_of_target[i], 1),
+                "dailyPace": round(float(trends.pace[i]), 2),
+                "goalReachedDate": (
+                    (start + timedelta(days=reached_on)).isoformat()
+                    if reached_on >= 0
+                    else None
+                ),
+                "projectedDate": (
+                    None
+                    if np.isnan(days_to_target)
+                    else (today + timedelta(days=int(days_to_target))).isoformat()
+                ),
+                "seriesStartDate": series_start.isoformat(),
+                "movingAverage": [
+                    finite(value) for value in trends.moving_average[i, -series_days:]
+                ],
+                "weeklyTotals": [
+                    {
+                        "weekStart": (
+                            trends.week_start + timedelta(weeks=first_week + week)
+                        ).isoformat(),
+                        "total": round(float(total), 2),
+                    }
+                    for week, total in enumerate(trends.weekly[i, first_week:])
+                ],
+            }
+        )
+    return result
+
+
+@router.get(
+    "/asceticisms/trends",
+    tags=["asceticisms"],
+    response_model=list[NumericTrendsResponse],
+)
+async def get_numeric_trends(
+    request: Request,
+    user_id: int = Query(..., alias="userId"),
+    window: int = Query(7, ge=1, le=90, description="moving average window (days)"),
+    days: int = Query(30, ge=1, le=366, description="days of moving average"),
+    weeks: int = Query(12, ge=1, le=104, description="weeks of totals"),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Get trends for all of a user's active NUMERIC commitments: moving
+    averages, weekly totals, progress towards the target and a projected
+    date to reach it. Served from the per-user response cache until the
+    user changes data.
+    """
+    if current_user.id != user_id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Cannot view another user's trends")
+    # The series end today, so a cached response is only good for the day
+    _, path, params = user_response_cache.key(user_id, request)
+    today = datetime.utcnow().date().isoformat()
+    cache_key = (user_id, path, params + (("date", today),))
+    cached = user_response_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    cache_version = user_response_cache.version(user_id)
+
+    commitments = session.exec(
+        select(UserAsceticism, Asceticism)
+        .join(Asceticism, Asceticism.id == UserAsceticism.asceticismId)
+        .where(
+            UserAsceticism.userId == user_id,
+            UserAsceticism.status == AsceticismStatus.ACTIVE,
+            Asceticism.type == TrackingType.NUMERIC,
+        )
+    ).all()
+    trends = numeric_trends(session, list(commitments), window, days, weeks)
+
+    body = TRENDS_ADAPTER.dump_json(TRENDS_ADAPTER.validate_python(trends))
+    user_response_cache.set(cache_key, cache_version, body)
+    return Response(body, media_type="application/json")
+
+
+@router.get(
+    "/asceticisms/my/{user_asceticism_id}/trends",
+    tags=["asceticisms"],
+    response_model=NumericTrendsResponse,
+)
+async def get_commitment_trends(
+    user_asceticism_id: int,
+    window: int = Query(7, ge=1, le=90, description="moving average window (days)"),
+    days: int = Query(30, ge=1, le=366, description="days of moving average"),
+    weeks: int = Query(12, ge=1, le=104, description="weeks of totals"),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get trends for one NUMERIC commitment (see /asceticisms/trends)."""
+    user_asceticism = session.get(UserAsceticism, user_asceticism_id)
+    if not user_asceticism:
+        raise HTTPException(status_code=404, detail="User asceticism not found")
+    if (
+        user_asceticism.userId != current_user.id
+        and current_user.role != UserRole.ADMIN
+    ):
+        raise HTTPException(
+            status_code=403, detail="Cannot view another user's trends"
+        )
+    asceticism = session.get(Asceticism, user_asceticism.asceticismId)
+    if asceticism.type != TrackingType.NUMERIC:
+        raise HTTPException(
+            status_code=400, detail="Trends are only available for NUMERIC asceticisms"
+        )
+    return numeric_trends(
+        session, [(user_asceticism, asceticism)], window, days, weeks
+    )[0]
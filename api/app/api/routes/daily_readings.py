@@ -1,30 +1,140 @@
 """Daily readings router for Catholic Mass readings and notes."""
 
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import gzip
+import html
 import httpx
-import re
 import json
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from app.core.database import get_session
+import math
+import os
+import re
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy import REAL, and_, cast, or_
+from sqlmodel import Session, select, func
+from app.core.bundles import (
+    BundleError,
+    bundle_path,
+    bundle_range,
+    is_current,
+    restore_bundle_file,
+)
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.database import engine, get_session
 from app.core.auth import get_current_user
-from app.models import MassReading, DailyReadingNote, User, UserRole
+from app.core.events import publish_event
+from app.core.jobs import enqueue
+from app.core.readings import (
+    cache_readings,
+    is_stale,
+    parse_reference_query,
+    readings_cache,
+    schedule_revalidation,
+)
+from app.core.universalis import fetch_readings
+from app.jobs.handlers import BUILD_READINGS_BUNDLE
+from app.models import MassReading, DailyReadingNote, ReadingsBundle, User, UserRole
 from app.schemas.daily_readings import (
     DailyReadingNoteCreate,
     DailyReadingNoteUpdate,
     DailyReadingNoteResponse,
     MassReadingResponse,
+    NoteSearchResult,
+    NoteSearchResponse,
+    ReadingSearchResult,
+    ReadingsBundleResponse,
 )
+from app.schemas.jobs import JobResponse
 
 router = APIRouter(prefix="/daily-readings", tags=["daily-readings"])
 
+SEARCH_CONFIG = "english"
+# Snippets mark matches with control characters, stripped from the text
+# beforehand, that only become <mark> tags once the snippet is escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", MaxWords=30, '
+    'MinWords=10, MaxFragments=2, FragmentDelimiter=" ... "'
+)
+
+
+def headline(document, query):
+    """ts_headline snippet of a text column, to pass to `render_snippet`."""
+    return func.ts_headline(
+        SEARCH_CONFIG,
+        func.translate(document, HIGHLIGHT_START + HIGHLIGHT_STOP, ""),
+        query,
+        HEADLINE_OPTIONS,
+    )
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a `headline` snippet and wrap its matches in <mark>."""
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+def encode_search_cursor(rank: float, note_id: int) -> str:
+    """Encode the position after a search result as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{rank!r}:{note_id}".encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """Decode a search cursor into (rank, note id)."""
+    try:
+        rank, note_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(rank), int(note_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def readings_response(request: Request, payload: bytes, content_hash: str) -> Response:
+    """
+    Serve stored readings bytes without parsing or re-serializing them:
+    gzip as stored when the client accepts it, otherwise decompressed.
+    """
+    etag = f'W/"{content_hash}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if content_hash in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        body = payload
+    else:
+        body = gzip.decompress(payload)
+    return Response(body, media_type="application/json", headers=headers)
+
 
 @router.get("/readings/{date}", response_model=MassReadingResponse)
-async def get_mass_readings(date: str, session: Session = Depends(get_session)):
+async def get_mass_readings(
+    date: str, request: Request, session: Session = Depends(get_session)
+):
     """
-    Get Mass readings for a specific date. Checks database cache first,
-    then fetches from Universalis API if not cached.
+    Get Mass readings for a specific date. Checks the shared cache and
+    then the database, then fetches from Universalis API if not stored.
+    Stale cached readings are served immediately and refreshed in the
+    background. Fails fast with 503 while Universalis is unavailable.
+    Responses are served from stored gzip bytes with an ETag.
     Date should be in YYYYMMDD format (e.g., 20260105).
     """
     try:
@@ -34,38 +144,36 @@ async def get_mass_readings(date: str, session: Session = Depends(get_session)):
         day = int(date[6:8])
         date_obj = datetime(year, month, day, tzinfo=timezone.utc)
 
-        # Check if readings exist in database
-        statement = select(MassReading).where(MassReading.date == date_obj)
-        cached_reading = session.exec(statement).first()
-
-        if cached_reading:
-            # Return cached readings from database
-            return cached_reading.data
+        async def load() -> tuple[bytes, str, datetime]:
+            # Check if readings exist in database
+            statement = select(
+                MassReading.payload, MassReading.contentHash, MassReading.updatedAt
+            ).where(MassReading.date == date_obj)
+            cached_reading = session.exec(statement).first()
+            if cached_reading:
+                return tuple(cached_reading)
 
-        # Not in cache, fetch from Universalis API
-        url = f"https://www.universalis.com/usa/{date}/jsonpmass.js"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=10.0)
-            response.raise_for_status()
-
-            # Get the JSONP response
-            body = response.text
-
-            # Strip JSONP wrapper: universalisCallback(...);
-            json_str = re.sub(r"^universalisCallback\(", "", body)
-            json_str = re.sub(r"\);\s*$", "", json_str)
-
-            # Parse the JSON
-            data = json.loads(json_str)
+            # Not in database, fetch from Universalis API
+            data = await fetch_readings(date)
 
             # Store in database for future requests
-            mass_reading = MassReading(date=date_obj, data=data)
-            session.add(mass_reading)
-            session.commit()
+            payload, content_hash = cache_readings(session, {date_obj: data})[date_obj]
+            return payload, content_hash, datetime.utcnow()
 
-            return data
+        # Concurrent misses for a date share one database read or fetch
+        payload, content_hash, updated_at = await readings_cache.get_or_compute(
+            date_obj.strftime("%Y%m%d"), load
+        )
+        if is_stale(updated_at):
+            schedule_revalidation(date_obj)
+        return readings_response(request, payload, content_hash)
 
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        ) from e
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=502, detail=f"Failed to fetch readings: {str(e)}"
@@ -82,6 +190,223 @@ async def get_mass_readings(date: str, session: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def parse_reading_date(value: str) -> datetime:
+    """Parse a YYYYMMDD date to midnight UTC."""
+    try:
+        return datetime.strptime(value, "%Y%m%d").replace(tzinfo=timezone.utc)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYYMMDD."
+        ) from e
+
+
+@router.get("/readings")
+async def get_mass_readings_range(
+    from_date: str = Query(..., alias="from"),
+    to_date: str = Query(..., alias="to"),
+    session: Session = Depends(get_session),
+):
+    """
+    Stream Mass readings for every date from `from` to `to` (inclusive,
+    YYYYMMDD) as NDJSON lines of {"date", "readings"}, in date order.
+    Cached dates are loaded in one query; missing dates are fetched from
+    Universalis concurrently and cached in one insert. A date that cannot
+    be fetched yields {"date", "error"} instead.
+    """
+    start = parse_reading_date(from_date)
+    end = parse_reading_date(to_date)
+    days = (end - start).days + 1
+    if days < 1 or days > settings.READINGS_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range must span 1 to {settings.READINGS_RANGE_MAX_DAYS} days",
+        )
+    dates = [start + timedelta(days=i) for i in range(days)]
+
+    cached = {
+        reading_date.replace(tzinfo=timezone.utc): payload
+        for reading_date, payload in session.exec(
+            select(MassReading.date, MassReading.payload).where(
+                MassReading.date >= start, MassReading.date <= end
+            )
+        )
+    }
+
+    semaphore = asyncio.Semaphore(settings.READINGS_FETCH_CONCURRENCY)
+
+    async def fetch(date_obj: datetime) -> dict:
+        async with semaphore:
+            return await fetch_readings(date_obj.strftime("%Y%m%d"))
+
+    async def reading_lines():
+        fetches = {
+            d: asyncio.create_task(fetch(d)) for d in dates if d not in cached
+        }
+        try:
+            for date_obj in dates:
+                date_str = date_obj.strftime("%Y%m%d")
+                if date_obj in cached:
+                    # Splice the stored JSON in as is rather than re-encoding it
+                    yield (
+                        f'{{"date": "{date_str}", "readings": '.encode()
+                        + gzip.decompress(cached[date_obj])
+                        + b"}\n"
+                    )
+                    continue
+                line = {"date": date_str}
+                try:
+                    line["readings"] = await fetches[date_obj]
+                except (
+                    CircuitOpenError,
+                    httpx.HTTPError,
+                    json.JSONDecodeError,
+                ) as e:
+                    line["error"] = f"Failed to fetch readings: {str(e)}"
+                yield (json.dumps(line) + "\n").encode()
+        finally:
+            for task in fetches.values():
+                task.cancel()
+            fetched = {
+                d: task.result()
+                for d, task in fetches.items()
+                if task.done() and not task.cancelled() and not task.exception()
+            }
+            # The request session may already be closed while streaming
+            with Session(engine) as cache_session:
+                cache_readings(cache_session, fetched)
+
+    return StreamingResponse(reading_lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/bundles/{key}",
+    response_model=ReadingsBundleResponse,
+    responses={202: {"model": JobResponse}},
+)
+async def get_readings_bundle(key: str, session: Session = Depends(get_session)):
+    """
+    Get the offline readings bundle for a month ("2026-05") or liturgical
+    season ("lent-2026", also advent, christmas, easter). If it does not
+    exist or a reading in it has changed, a background build is queued and
+    202 is returned with the job; poll its Location and retry when done.
+    """
+    try:
+        bundle_range(key)
+    except BundleError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    bundle = session.exec(
+        select(ReadingsBundle).where(ReadingsBundle.key == key)
+    ).first()
+    if bundle is None or not is_current(session, bundle):
+        job = enqueue(
+            session,
+            BUILD_READINGS_BUNDLE,
+            {"key": key},
+            dedupe_key=f"bundle:{key}",
+        )
+        return JSONResponse(
+            status_code=202,
+            content=jsonable_encoder(JobResponse.model_validate(job)),
+            headers={
+                "Location": f"/jobs/{job.id}",
+                "Retry-After": str(math.ceil(settings.JOB_POLL_SECONDS)),
+            },
+        )
+
+    return ReadingsBundleResponse(
+        key=bundle.key,
+        startDate=bundle.startDate.strftime("%Y%m%d"),
+        endDate=bundle.endDate.strftime("%Y%m%d"),
+        contentHash=bundle.contentHash,
+        size=bundle.size,
+        builtAt=bundle.builtAt,
+        url=f"{router.prefix}/bundles/files/{bundle.contentHash}.json.gz",
+    )
+
+
+@router.get("/bundles/files/{content_hash}.json.gz")
+async def download_readings_bundle(
+    content_hash: str, session: Session = Depends(get_session)
+):
+    """
+    Download a bundle file (gzip JSON). Files are content-addressed, so
+    they are cached forever; range requests resume interrupted downloads.
+    A file missing from this server's READINGS_BUNDLE_DIR is rewritten
+    from the stored readings.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", content_hash):
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    path = bundle_path(content_hash)
+    if not os.path.exists(path) and not restore_bundle_file(session, content_hash):
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    return FileResponse(
+        path,
+        media_type="application/gzip",
+        filename=f"readings-{content_hash[:12]}.json.gz",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": f'"{content_hash}"',
+        },
+    )
+
+
+@router.get("/search", response_model=list[ReadingSearchResult])
+async def search_mass_readings(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(50, ge=1, le=365),
+    session: Session = Depends(get_session),
+):
+    """
+    Find cached Mass readings dates. A chapter reference ("John 15") matches
+    every date reading from that chapter, newest first; anything else is a
+    ranked full-text search over the reading references and text.
+    """
+    reference = parse_reference_query(q)
+    if reference:
+        rows = session.exec(
+            select(MassReading.date, MassReading.sources)
+            .where(MassReading.referenceKeys.contains([reference]))
+            .order_by(MassReading.date.desc())
+            .limit(limit)
+        ).all()
+        return [
+            ReadingSearchResult(
+                date=reading_date.strftime("%Y%m%d"), sources=sources, rank=1.0
+            )
+            for reading_date, sources in rows
+        ]
+
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(MassReading.searchVector, query)
+    page = (
+        select(MassReading.id, rank.label("rank"))
+        .where(MassReading.searchVector.op("@@")(query))
+        .order_by(rank.desc(), MassReading.date.desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = session.exec(
+        select(
+            MassReading.date,
+            MassReading.sources,
+            page.c.rank,
+            headline(MassReading.readingText, query),
+        )
+        .join(page, page.c.id == MassReading.id)
+        .order_by(page.c.rank.desc(), MassReading.date.desc())
+    ).all()
+    return [
+        ReadingSearchResult(
+            date=reading_date.strftime("%Y%m%d"),
+            sources=sources,
+            rank=reading_rank,
+            snippet=render_snippet(snippet),
+        )
+        for reading_date, sources, reading_rank, snippet in rows
+    ]
+
+
 @router.post("/notes", response_model=DailyReadingNoteResponse)
 async def create_or_update_note(
     data: DailyReadingNoteCreate,
@@ -113,6 +438,12 @@ async def create_or_update_note(
             existing_note.notes = data.notes
             existing_note.updatedAt = datetime.utcnow()
             session.add(existing_note)
+            publish_event(
+                session,
+                existing_note.userId,
+                "note.saved",
+                {"id": existing_note.id, "date": existing_note.date},
+            )
             session.commit()
             session.refresh(existing_note)
 
@@ -132,6 +463,13 @@ async def create_or_update_note(
                 notes=data.notes,
             )
             session.add(new_note)
+            session.flush()
+            publish_event(
+                session,
+                new_note.userId,
+                "note.saved",
+                {"id": new_note.id, "date": new_note.date},
+            )
             session.commit()
             session.refresh(new_note)
 
@@ -150,6 +488,76 @@ async def create_or_update_note(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/notes/{user_id}/search", response_model=NoteSearchResponse)
+async def search_user_notes(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Full-text search over a user's daily reading notes, best match first.
+    Snippets wrap matched terms in <mark>; pass `nextCursor` back as
+    `cursor` for the next page.
+    """
+    # Users can only view their own notes unless they're admin
+    if current_user.id != user_id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Cannot view another user's notes")
+
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(DailyReadingNote.searchVector, query)
+    statement = select(DailyReadingNote.id, rank.label("rank")).where(
+        DailyReadingNote.userId == user_id,
+        DailyReadingNote.searchVector.op("@@")(query),
+    )
+    if cursor:
+        after_rank, after_id = decode_search_cursor(cursor)
+        after_rank = cast(after_rank, REAL)
+        statement = statement.where(
+            or_(
+                rank < after_rank,
+                and_(rank == after_rank, DailyReadingNote.id < after_id),
+            )
+        )
+    # Rank and page first, then build snippets for that page only
+    page = (
+        statement.order_by(rank.desc(), DailyReadingNote.id.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+    rows = session.exec(
+        select(
+            DailyReadingNote,
+            page.c.rank,
+            headline(DailyReadingNote.notes, query),
+        )
+        .join(page, page.c.id == DailyReadingNote.id)
+        .order_by(page.c.rank.desc(), DailyReadingNote.id.desc())
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_note, last_rank, _ = rows[-1]
+        next_cursor = encode_search_cursor(last_rank, last_note.id)
+
+    return NoteSearchResponse(
+        results=[
+            NoteSearchResult(
+                id=note.id,
+                date=note.date.isoformat(),
+                snippet=render_snippet(snippet),
+                rank=note_rank,
+                updatedAt=note.updatedAt.isoformat(),
+            )
+            for note, note_rank, snippet in rows
+        ],
+        nextCursor=next_cursor,
+    )
+
+
 @router.get("/notes/{user_id}/{date}", response_model=DailyReadingNoteResponse)
 async def get_note_by_date(
     user_id: int,
@@ -253,6 +661,9 @@ async def delete_note(
             )
 
         session.delete(note)
+        publish_event(
+            session, note.userId, "note.deleted", {"id": note.id, "date": note.date}
+        )
         session.commit()
 
         return {"message": "Note deleted successfully"}
@@ -0,0 +1,55 @@
+"""Events router for pushing a user's changes to their other open devices."""
+
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from app.core.auth import authenticate_authorization
+from app.core.config import settings
+from app.core.database import engine
+from app.core.events import broker, format_sse
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("/stream")
+async def stream_events(authorization: Optional[str] = Header(None)):
+    """
+    Stream the current user's log, commitment and note changes as
+    server-sent events. Sends a keepalive comment while idle.
+    """
+    # Authenticate with a short-lived session so idle streams hold no connection
+    with Session(engine) as session:
+        user = await authenticate_authorization(authorization, session)
+    user_id = user.id
+
+    if broker.connection_count >= settings.EVENTS_MAX_CONNECTIONS:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many open event streams",
+            headers={"Retry-After": "30"},
+        )
+
+    queue = broker.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
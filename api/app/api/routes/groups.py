@@ -0,0 +1,363 @@
+"""Groups router for shared progress and leaderboards."""
+
+import secrets
+from datetime import datetime, timezone, timedelta
+from fastapi import APIRouter, HTTPException, Query, Depends
+from sqlalchemy import Date, Integer, cast
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, func
+from app.core.database import get_session
+from app.core.auth import get_current_user
+from app.core.invalidation import GROUP, publish_invalidation
+from app.core.leaderboard import leaderboard_cache
+from app.models import (
+    Group,
+    GroupMember,
+    GroupRole,
+    User,
+    UserRole,
+    UserAsceticism,
+    AsceticismLog,
+    AsceticismStatus,
+)
+from app.schemas.groups import (
+    GroupCreate,
+    GroupJoinRequest,
+    GroupResponse,
+    GroupMemberResponse,
+    LeaderboardResponse,
+)
+
+router = APIRouter(prefix="/groups", tags=["groups"])
+
+# How far back streaks are followed when computing a leaderboard
+STREAK_LOOKBACK_DAYS = 366
+
+
+def generate_invite_code(session: Session) -> str:
+    """Generate an invite code not used by any existing group."""
+    while True:
+        code = secrets.token_urlsafe(6)
+        existing = session.exec(select(Group).where(Group.inviteCode == code)).first()
+        if not existing:
+            return code
+
+
+def format_group_response(
+    session: Session, group: Group, role: GroupRole
+) -> GroupResponse:
+    """Format group with member count for response."""
+    member_count = session.exec(
+        select(func.count(GroupMember.id)).where(GroupMember.groupId == group.id)
+    ).one()
+    return GroupResponse(
+        id=group.id,
+        name=group.name,
+        description=group.description,
+        inviteCode=group.inviteCode,
+        avatar=group.avatar,
+        memberCount=member_count,
+        role=role.value,
+    )
+
+
+def require_membership(session: Session, group_id: int, user: User) -> None:
+    """Ensure the group exists and the user is a member (or admin)."""
+    group = session.get(Group, group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    if user.role == UserRole.ADMIN:
+        return
+    membership = session.exec(
+        select(GroupMember).where(
+            GroupMember.groupId == group_id, GroupMember.userId == user.id
+        )
+    ).first()
+    if not membership:
+        raise HTTPException(status_code=403, detail="Not a member of this group")
+
+
+def compute_leaderboard(session: Session, group_id: int, today) -> list[dict]:
+    """
+    Compute every member's current streak and 7-day completion in one
+    aggregate query over the members' logs.
+
+    A streak is the run of consecutive days with at least one completed log
+    that ends today or yesterday. Weekly completion compares completed logs
+    against the active commitment-days in the last 7 days.
+    """
+    tomorrow = today + timedelta(days=1)
+    yesterday = today - timedelta(days=1)
+    week_start = today - timedelta(days=6)
+    streak_floor = today - timedelta(days=STREAK_LOOKBACK_DAYS)
+
+    members = (
+        select(GroupMember.userId).where(GroupMember.groupId == group_id).cte("members")
+    )
+    log_day = cast(AsceticismLog.date, Date)
+
+    # Distinct days on which each member completed anything
+    days = (
+        select(UserAsceticism.userId.label("userId"), log_day.label("day"))
+        .join(AsceticismLog, AsceticismLog.userAsceticismId == UserAsceticism.id)
+        .where(
+            UserAsceticism.userId.in_(select(members.c.userId)),
+            AsceticismLog.completed == True,
+            AsceticismLog.date >= streak_floor,
+            AsceticismLog.date < tomorrow,
+        )
+        .distinct()
+        .cte("days")
+    )
+    # Consecutive days share the same (day - row_number) value
+    islands = select(
+        days.c.userId,
+        days.c.day,
+        (
+            days.c.day
+            - cast(
+                func.row_number().over(partition_by=days.c.userId, order_by=days.c.day),
+                Integer,
+            )
+        ).label("grp"),
+    ).cte("islands")
+    streaks = (
+        select(
+            islands.c.userId,
+            func.count().label("length"),
+            func.max(islands.c.day).label("lastDay"),
+        )
+        .group_by(islands.c.userId, islands.c.grp)
+        .cte("streaks")
+    )
+    current = (
+        select(streaks.c.userId, func.max(streaks.c.length).label("streak"))
+        .where(streaks.c.lastDay >= yesterday)
+        .group_by(streaks.c.userId)
+        .cte("current")
+    )
+    weekly = (
+        select(
+            UserAsceticism.userId.label("userId"),
+            func.count(AsceticismLog.id).label("completed"),
+        )
+        .join(AsceticismLog, AsceticismLog.userAsceticismId == UserAsceticism.id)
+        .where(
+            UserAsceticism.userId.in_(select(members.c.userId)),
+            AsceticismLog.completed == True,
+            AsceticismLog.date >= week_start,
+            AsceticismLog.date < tomorrow,
+        )
+        .group_by(UserAsceticism.userId)
+        .cte("weekly")
+    )
+    # Days in the window each active commitment was running
+    active_days = func.greatest(
+        0,
+        func.least(today, func.coalesce(cast(UserAsceticism.endDate, Date), today))
+        - func.greatest(week_start, cast(UserAsceticism.startDate, Date))
+        + 1,
+    )
+    expected = (
+        select(
+            UserAsceticism.userId.label("userId"),
+            func.sum(active_days).label("days"),
+        )
+        .where(
+            UserAsceticism.userId.in_(select(members.c.userId)),
+            UserAsceticism.status == AsceticismStatus.ACTIVE,
+        )
+        .group_by(UserAsceticism.userId)
+        .cte("expected")
+    )
+
+    statement = (
+        select(
+            GroupMember.userId,
+            User.name,
+            User.image,
+            func.coalesce(current.c.streak, 0),
+            func.coalesce(weekly.c.completed, 0),
+            func.coalesce(expected.c.days, 0),
+        )
+        .join(User, User.id == GroupMember.userId)
+        .outerjoin(current, current.c.userId == GroupMember.userId)
+        .outerjoin(weekly, weekly.c.userId == GroupMember.userId)
+        .outerjoin(expected, expected.c.userId == GroupMember.userId)
+        .where(GroupMember.groupId == group_id)
+    )
+    rows = session.exec(statement).all()
+
+    entries = []
+    for user_id, name, image, streak, completed, expected_days in rows:
+        expected_days = int(expected_days)
+        rate = (completed / expected_days * 100) if expected_days > 0 else 0
+        entries.append(
+            {
+                "userId": user_id,
+                "name": name,
+                "image": image,
+                "currentStreak": streak,
+                "weeklyCompleted": completed,
+                "weeklyExpected": expected_days,
+                "weeklyCompletionRate": round(min(rate, 100.0), 1),
+            }
+        )
+
+    entries.sort(
+        key=lambda e: (e["currentStreak"], e["weeklyCompletionRate"]), reverse=True
+    )
+    return entries
+
+
+@router.post("/", response_model=GroupResponse)
+async def create_group(
+    group_data: GroupCreate,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Create a group; the creator becomes its admin."""
+    group = Group(
+        name=group_data.name,
+        description=group_data.description,
+        avatar=group_data.avatar,
+        inviteCode=generate_invite_code(session),
+    )
+    session.add(group)
+    session.flush()
+
+    session.add(
+        GroupMember(groupId=group.id, userId=current_user.id, role=GroupRole.ADMIN)
+    )
+    session.commit()
+    session.refresh(group)
+
+    return format_group_response(session, group, GroupRole.ADMIN)
+
+
+@router.post("/join", response_model=GroupResponse)
+async def join_group(
+    request: GroupJoinRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Join a group using its invite code."""
+    group = session.exec(
+        select(Group).where(Group.inviteCode == request.inviteCode)
+    ).first()
+    if not group:
+        raise HTTPException(status_code=404, detail="Invalid invite code")
+
+    # Insert-or-nothing, so concurrent joins by one user can't both insert
+    member_id = session.execute(
+        insert(GroupMember)
+        .values(groupId=group.id, userId=current_user.id, role=GroupRole.MEMBER)
+        .on_conflict_do_nothing(constraint="uq_GroupMember_groupId_userId")
+        .returning(GroupMember.id)
+    ).scalar()
+    if member_id is None:
+        session.rollback()
+        raise HTTPException(
+            status_code=400, detail="You are already a member of this group"
+        )
+
+    publish_invalidation(session, GROUP, group.id)
+    session.commit()
+    leaderboard_cache.invalidate_group(group.id)
+
+    return format_group_response(session, group, GroupRole.MEMBER)
+
+
+@router.get("/my", response_model=list[GroupResponse])
+async def list_my_groups(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """List the groups the current user belongs to."""
+    member_count = (
+        select(GroupMember.groupId, func.count(GroupMember.id).label("count"))
+        .group_by(GroupMember.groupId)
+        .subquery()
+    )
+    statement = (
+        select(Group, GroupMember.role, member_count.c.count)
+        .join(GroupMember, GroupMember.groupId == Group.id)
+        .join(member_count, member_count.c.groupId == Group.id)
+        .where(GroupMember.userId == current_user.id)
+        .order_by(Group.name)
+    )
+    rows = session.exec(statement).all()
+
+    return [
+        GroupResponse(
+            id=group.id,
+            name=group.name,
+            description=group.description,
+            inviteCode=group.inviteCode,
+            avatar=group.avatar,
+            memberCount=count,
+            role=role.value,
+        )
+        for group, role, count in rows
+    ]
+
+
+@router.get("/{group_id}/members", response_model=list[GroupMemberResponse])
+async def list_group_members(
+    group_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """List the members of a group. Members only."""
+    require_membership(session, group_id, current_user)
+
+    statement = (
+        select(GroupMember, User)
+        .join(User, User.id == GroupMember.userId)
+        .where(GroupMember.groupId == group_id)
+        .order_by(User.name)
+    )
+    rows = session.exec(statement).all()
+
+    return [
+        GroupMemberResponse(
+            userId=user.id,
+            name=user.name,
+            image=user.image,
+            role=member.role.value,
+        )
+        for member, user in rows
+    ]
+
+
+@router.get("/{group_id}/leaderboard", response_model=LeaderboardResponse)
+async def get_group_leaderboard(
+    group_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Get the group's members ranked by current streak, then weekly completion.
+    Cached per group until a member logs progress or membership changes.
+    """
+    require_membership(session, group_id, current_user)
+
+    today = datetime.now(timezone.utc).date()
+    cached = leaderboard_cache.get(group_id, today)
+    if cached:
+        computed_at, entries = cached
+    else:
+        computed_at = datetime.now(timezone.utc)
+        entries = compute_leaderboard(session, group_id, today)
+        leaderboard_cache.set(
+            group_id, today, computed_at, entries, [e["userId"] for e in entries]
+        )
+
+    return {
+        "groupId": group_id,
+        "computedAt": computed_at,
+        "total": len(entries),
+        "entries": entries[offset : offset + limit],
+    }
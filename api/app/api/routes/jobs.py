@@ -0,0 +1,84 @@
+"""Jobs router for background job status and admin retries."""
+
+from typing import Optional
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+from app.core.database import get_session
+from app.core.auth import get_current_user, require_admin
+from app.core.jobs import JOBS_CHANNEL
+from app.models import Job, JobStatus, User, UserRole
+from app.schemas.jobs import JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Get a job's status and progress. Jobs started by a user are visible
+    to that user and admins only.
+    """
+    job = session.get(Job, job_id)
+    if (
+        not job
+        or job.userId is not None
+        and job.userId != current_user.id
+        and current_user.role != UserRole.ADMIN
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse.model_validate(job)
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    status: Optional[JobStatus] = None,
+    type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """List the most recent jobs. Requires admin authentication."""
+    statement = select(Job).order_by(Job.id.desc()).limit(limit)
+    if status is not None:
+        statement = statement.where(Job.status == status)
+    if type is not None:
+        statement = statement.where(Job.type == type)
+    return [JobResponse.model_validate(job) for job in session.exec(statement)]
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+async def retry_job(
+    job_id: int,
+    current_user: User = Depends(require_admin),
+    session: Session = Depends(get_session),
+):
+    """Requeue a failed job with a fresh set of attempts. Requires admin."""
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.FAILED:
+        raise HTTPException(status_code=409, detail="Only failed jobs can be retried")
+
+    now = datetime.utcnow()
+    job.status = JobStatus.QUEUED
+    job.attempts = 0
+    job.runAt = job.updatedAt = now
+    job.finishedAt = None
+    session.add(job)
+    session.exec(select(func.pg_notify(JOBS_CHANNEL, job.type)))
+    # A queued or running job may already hold the dedupe key
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise HTTPException(
+            status_code=409, detail="An equivalent job is already queued"
+        ) from e
+    session.refresh(job)
+    return JobResponse.model_validate(job)
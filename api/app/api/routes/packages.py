@@ -2,13 +2,28 @@
 
 from typing import Optional
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Header, Depends
-from sqlmodel import Session, select
+from fastapi import APIRouter, HTTPException, Header, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlmodel import Session, select, func
+from app.core.cache import catalog_cache, invalidate_catalog
 from app.core.database import get_session
 from app.core.auth import require_admin, get_current_user
+from app.core.invalidation import (
+    CATALOG,
+    USER_DATA,
+    publish_invalidation,
+)
+from app.core.popularity import (
+    SORT_POPULAR,
+    package_memberships,
+    record_commitment,
+    record_package_memberships,
+)
+from app.core.response_cache import user_response_cache
 from app.models import (
     AsceticismPackage,
     PackageItem,
+    PackageStats,
     User,
     Asceticism,
     UserAsceticism,
@@ -27,6 +42,9 @@ from app.schemas.packages import (
 
 router = APIRouter(prefix="/packages", tags=["packages"])
 
+# Serializer for published listings held in the catalog cache
+PACKAGES_ADAPTER = TypeAdapter(list[PackageResponse])
+
 
 def format_package_response(
     package: AsceticismPackage, items: list[tuple[PackageItem, Asceticism]]
@@ -108,6 +126,7 @@ async def create_package(
         session.add(item)
         items.append((item, asceticism))
 
+    publish_invalidation(session, CATALOG, f"package:{package.id}")
     session.commit()
 
     return format_package_response(package, items)
@@ -190,7 +209,9 @@ async def update_package(
             session.add(item)
 
     session.add(package)
+    publish_invalidation(session, CATALOG, f"package:{package_id}")
     session.commit()
+    invalidate_catalog(f"package:{package_id}")
     session.refresh(package)
 
     # Get updated items
@@ -222,7 +243,9 @@ async def publish_package(
     package.updatedAt = datetime.utcnow()
 
     session.add(package)
+    publish_invalidation(session, CATALOG, f"package:{package_id}")
     session.commit()
+    invalidate_catalog(f"package:{package_id}")
 
     return {"success": True, "isPublished": package.isPublished}
 
@@ -247,58 +270,88 @@ async def delete_package(
 
     # Delete package
     session.delete(package)
+    publish_invalidation(session, CATALOG, f"package:{package_id}")
     session.commit()
+    invalidate_catalog(f"package:{package_id}")
 
     return {"success": True, "message": "Package deleted"}
 
 
 @router.get("/browse", response_model=list[PackageResponse])
-async def browse_published_packages(session: Session = Depends(get_session)):
-    """Get all published packages (available to all users)."""
-    statement = (
-        select(AsceticismPackage)
-        .where(AsceticismPackage.isPublished == True)
-        .order_by(AsceticismPackage.createdAt.desc())
-    )
-    packages = session.exec(statement).all()
-
-    result = []
-    for package in packages:
-        # Get package items with asceticisms
-        items_stmt = (
-            select(PackageItem, Asceticism)
-            .join(Asceticism, PackageItem.asceticismId == Asceticism.id)
-            .where(PackageItem.packageId == package.id)
-            .order_by(PackageItem.order.asc())
+async def browse_published_packages(
+    sort: Optional[str] = Query(None, description='"popular": most active first'),
+    session: Session = Depends(get_session),
+):
+    """
+    Get all published packages (available to all users), newest first or
+    by popularity.
+    """
+    if sort not in (None, SORT_POPULAR):
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+
+    async def load() -> bytes:
+        statement = select(AsceticismPackage).where(
+            AsceticismPackage.isPublished == True
         )
-        items = session.exec(items_stmt).all()
+        if sort == SORT_POPULAR:
+            statement = statement.outerjoin(
+                PackageStats, PackageStats.packageId == AsceticismPackage.id
+            ).order_by(
+                func.coalesce(PackageStats.activeUsers, 0).desc(),
+                func.coalesce(PackageStats.recentLogs, 0).desc(),
+                func.coalesce(PackageStats.totalJoins, 0).desc(),
+                AsceticismPackage.createdAt.desc(),
+            )
+        else:
+            statement = statement.order_by(AsceticismPackage.createdAt.desc())
+        packages = session.exec(statement).all()
+
+        result = []
+        for package in packages:
+            # Get package items with asceticisms
+            items_stmt = (
+                select(PackageItem, Asceticism)
+                .join(Asceticism, PackageItem.asceticismId == Asceticism.id)
+                .where(PackageItem.packageId == package.id)
+                .order_by(PackageItem.order.asc())
+            )
+            items = session.exec(items_stmt).all()
 
-        result.append(format_package_response(package, items))
+            result.append(format_package_response(package, items))
 
-    return result
+        return PACKAGES_ADAPTER.dump_json(result)
+
+    key = "packages:popular" if sort == SORT_POPULAR else "packages:browse"
+    body = await catalog_cache.get_or_compute(key, load)
+    return Response(body, media_type="application/json")
 
 
 @router.get("/{package_id}", response_model=PackageResponse)
 async def get_package_details(package_id: int, session: Session = Depends(get_session)):
     """Get details of a specific published package."""
-    package = session.get(AsceticismPackage, package_id)
 
-    if not package:
-        raise HTTPException(status_code=404, detail="Package not found")
+    async def load() -> bytes:
+        package = session.get(AsceticismPackage, package_id)
 
-    if not package.isPublished:
-        raise HTTPException(status_code=403, detail="Package is not published")
+        if not package:
+            raise HTTPException(status_code=404, detail="Package not found")
 
-    # Get package items with asceticisms
-    items_stmt = (
-        select(PackageItem, Asceticism)
-        .join(Asceticism, PackageItem.asceticismId == Asceticism.id)
-        .where(PackageItem.packageId == package_id)
-        .order_by(PackageItem.order.asc())
-    )
-    items = session.exec(items_stmt).all()
+        if not package.isPublished:
+            raise HTTPException(status_code=403, detail="Package is not published")
 
-    return format_package_response(package, items)
+        # Get package items with asceticisms
+        items_stmt = (
+            select(PackageItem, Asceticism)
+            .join(Asceticism, PackageItem.asceticismId == Asceticism.id)
+            .where(PackageItem.packageId == package_id)
+            .order_by(PackageItem.order.asc())
+        )
+        items = session.exec(items_stmt).all()
+
+        return format_package_response(package, items).model_dump_json().encode()
+
+    body = await catalog_cache.get_or_compute(f"package:{package_id}", load)
+    return Response(body, media_type="application/json")
 
 
 @router.post("/{package_id}/add-to-account")
@@ -323,6 +376,18 @@ async def add_package_to_account(
     items_stmt = select(PackageItem).where(PackageItem.packageId == package_id)
     items = session.exec(items_stmt).all()
 
+    # Packages the user's commitments to these asceticisms came from, which
+    # lose them to this one
+    previous_packages = session.exec(
+        select(UserAsceticism.packageId).where(
+            UserAsceticism.userId == current_user.id,
+            UserAsceticism.asceticismId.in_([item.asceticismId for item in items]),
+        )
+    ).all()
+    memberships = package_memberships(
+        session, current_user.id, [package_id, *previous_packages]
+    )
+
     # Add each asceticism to the user's account or reactivate if archived
     added_count = 0
     reactivated_count = 0
@@ -341,9 +406,13 @@ async def add_package_to_account(
 
         if existing:
             # If it exists, mark it as ACTIVE with the new dates
+            record_commitment(
+                session, existing.asceticismId, existing.status, AsceticismStatus.ACTIVE
+            )
             existing.status = AsceticismStatus.ACTIVE
             existing.startDate = start_date
             existing.endDate = end_date
+            existing.packageId = package_id
             existing.updatedAt = datetime.now(timezone.utc)
             reactivated_count += 1
         else:
@@ -351,14 +420,21 @@ async def add_package_to_account(
             user_asceticism = UserAsceticism(
                 userId=current_user.id,
                 asceticismId=item.asceticismId,
+                packageId=package_id,
                 status=AsceticismStatus.ACTIVE,
                 startDate=start_date,
                 endDate=end_date,
             )
             session.add(user_asceticism)
+            record_commitment(
+                session, item.asceticismId, None, AsceticismStatus.ACTIVE
+            )
             added_count += 1
 
+    record_package_memberships(session, current_user.id, memberships)
+    publish_invalidation(session, USER_DATA, current_user.id)
     session.commit()
+    user_response_cache.bump(current_user.id)
 
     total_activated = added_count + reactivated_count
     message = f"Activated {total_activated} asceticism(s)"
@@ -0,0 +1,285 @@
+"""Programs router for scheduled multi-day asceticism programs."""
+
+from typing import Optional
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Depends
+from sqlmodel import Session, select
+from app.core.database import get_session
+from app.core.auth import require_admin, get_current_user
+from app.core.schedule import resolve_due_items, program_day
+from app.models import (
+    Program,
+    ProgramItem,
+    UserProgram,
+    Asceticism,
+    User,
+    UserRole,
+)
+from app.schemas.packages import AsceticismInfo
+from app.schemas.programs import (
+    ProgramCreate,
+    ProgramItemResponse,
+    ProgramResponse,
+    EnrollProgramRequest,
+    UserProgramResponse,
+    DueItemResponse,
+    UserDueItemsResponse,
+)
+
+router = APIRouter(prefix="/programs", tags=["programs"])
+
+
+def parse_day(date_str: Optional[str]):
+    """Parse an optional YYYY-MM-DD string, defaulting to today (UTC)."""
+    if not date_str:
+        return datetime.now(timezone.utc).date()
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
+        ) from exc
+
+
+def format_asceticism_info(asceticism: Asceticism) -> AsceticismInfo:
+    """Format asceticism summary for program responses."""
+    return AsceticismInfo(
+        id=asceticism.id,
+        title=asceticism.title,
+        description=asceticism.description,
+        category=asceticism.category,
+        icon=asceticism.icon,
+        type=asceticism.type.value,
+    )
+
+
+def format_program_response(
+    program: Program, items: list[tuple[ProgramItem, Asceticism]]
+) -> ProgramResponse:
+    """Format program with items for response."""
+    formatted_items = [
+        ProgramItemResponse(
+            id=item.id,
+            asceticismId=item.asceticismId,
+            dayStart=item.dayStart,
+            dayEnd=item.dayEnd,
+            asceticism=format_asceticism_info(asceticism),
+        )
+        for item, asceticism in items
+    ]
+    return ProgramResponse(
+        id=program.id,
+        name=program.name,
+        description=program.description,
+        isPublic=program.isPublic,
+        creatorId=program.creatorId,
+        custom_metadata=program.custom_metadata,
+        items=formatted_items,
+        itemCount=len(formatted_items),
+    )
+
+
+def format_due_item(
+    enrollment: UserProgram,
+    item: ProgramItem,
+    program: Program,
+    asceticism: Asceticism,
+    day,
+) -> DueItemResponse:
+    """Format a due program item for response."""
+    return DueItemResponse(
+        userProgramId=enrollment.id,
+        programId=program.id,
+        programName=program.name,
+        programItemId=item.id,
+        day=program_day(enrollment, day),
+        dayStart=item.dayStart,
+        dayEnd=item.dayEnd,
+        asceticism=format_asceticism_info(asceticism),
+    )
+
+
+def get_program_items(
+    session: Session, program_id: int
+) -> list[tuple[ProgramItem, Asceticism]]:
+    """Get a program's items with their asceticisms, in schedule order."""
+    items_stmt = (
+        select(ProgramItem, Asceticism)
+        .join(Asceticism, ProgramItem.asceticismId == Asceticism.id)
+        .where(ProgramItem.programId == program_id)
+        .order_by(ProgramItem.dayStart.asc(), ProgramItem.id.asc())
+    )
+    return session.exec(items_stmt).all()
+
+
+@router.get("/", response_model=list[ProgramResponse])
+async def list_public_programs(session: Session = Depends(get_session)):
+    """Get all public programs (available to all users)."""
+    programs = session.exec(
+        select(Program).where(Program.isPublic == True).order_by(Program.name)
+    ).all()
+    return [
+        format_program_response(program, get_program_items(session, program.id))
+        for program in programs
+    ]
+
+
+@router.post("/", response_model=ProgramResponse)
+async def create_program(
+    program_data: ProgramCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_admin),
+):
+    """Create a new program (admin only)."""
+    program = Program(
+        name=program_data.name,
+        description=program_data.description,
+        isPublic=program_data.isPublic,
+        creatorId=current_user.id,
+        custom_metadata=program_data.custom_metadata,
+    )
+    session.add(program)
+    session.flush()
+
+    items = []
+    for item_data in program_data.items:
+        if item_data.dayStart < 1 or (
+            item_data.dayEnd is not None and item_data.dayEnd < item_data.dayStart
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="dayStart must be at least 1 and not after dayEnd",
+            )
+        asceticism = session.get(Asceticism, item_data.asceticismId)
+        if not asceticism:
+            raise HTTPException(
+                status_code=404, detail=f"Asceticism {item_data.asceticismId} not found"
+            )
+
+        item = ProgramItem(
+            programId=program.id,
+            asceticismId=item_data.asceticismId,
+            dayStart=item_data.dayStart,
+            dayEnd=item_data.dayEnd,
+        )
+        session.add(item)
+        items.append((item, asceticism))
+
+    session.commit()
+    session.refresh(program)
+
+    return format_program_response(program, items)
+
+
+@router.get("/my", response_model=list[UserProgramResponse])
+async def list_my_programs(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """List the current user's program enrollments."""
+    rows = session.exec(
+        select(UserProgram, Program)
+        .join(Program, Program.id == UserProgram.programId)
+        .where(UserProgram.userId == current_user.id)
+        .order_by(UserProgram.startDate.desc())
+    ).all()
+    return [
+        UserProgramResponse(
+            id=enrollment.id,
+            programId=program.id,
+            programName=program.name,
+            startDate=enrollment.startDate,
+        )
+        for enrollment, program in rows
+    ]
+
+
+@router.get("/today", response_model=list[DueItemResponse])
+async def get_my_due_items(
+    date: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get the current user's program items due on a day (default today)."""
+    day = parse_day(date)
+    rows = resolve_due_items(session, day, user_id=current_user.id)
+    return [format_due_item(*row, day) for row in rows]
+
+
+@router.get("/schedule", response_model=list[UserDueItemsResponse])
+async def get_due_items_for_all_users(
+    date: Optional[str] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Resolve every enrolled user's due program items for a day in one query
+    (admin only). Used for reminders and digests.
+    """
+    day = parse_day(date)
+    result: list[UserDueItemsResponse] = []
+    for enrollment, item, program, asceticism in resolve_due_items(session, day):
+        if not result or result[-1].userId != enrollment.userId:
+            result.append(UserDueItemsResponse(userId=enrollment.userId, items=[]))
+        result[-1].items.append(
+            format_due_item(enrollment, item, program, asceticism, day)
+        )
+    return result
+
+
+@router.get("/{program_id}", response_model=ProgramResponse)
+async def get_program_details(
+    program_id: int,
+    session: Session = Depends(get_session),
+):
+    """Get details of a specific public program."""
+    program = session.get(Program, program_id)
+    if not program:
+        raise HTTPException(status_code=404, detail="Program not found")
+    if not program.isPublic:
+        raise HTTPException(status_code=403, detail="Program is not public")
+
+    return format_program_response(program, get_program_items(session, program_id))
+
+
+@router.post("/{program_id}/enroll", response_model=UserProgramResponse)
+async def enroll_in_program(
+    program_id: int,
+    request: EnrollProgramRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Enroll the current user in a program starting on a given day."""
+    program = session.get(Program, program_id)
+    if not program:
+        raise HTTPException(status_code=404, detail="Program not found")
+    if not program.isPublic and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Program is not public")
+
+    existing = session.exec(
+        select(UserProgram).where(
+            UserProgram.userId == current_user.id,
+            UserProgram.programId == program_id,
+        )
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=400, detail="You are already enrolled in this program"
+        )
+
+    start_date = request.startDate or datetime.now(timezone.utc)
+    enrollment = UserProgram(
+        userId=current_user.id,
+        programId=program_id,
+        startDate=start_date.replace(hour=0, minute=0, second=0, microsecond=0),
+    )
+    session.add(enrollment)
+    session.commit()
+    session.refresh(enrollment)
+
+    return UserProgramResponse(
+        id=enrollment.id,
+        programId=program.id,
+        programName=program.name,
+        startDate=enrollment.startDate,
+    )
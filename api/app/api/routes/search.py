@@ -0,0 +1,105 @@
+"""Search router for finding asceticism templates and packages."""
+
+from enum import Enum
+from fastapi import APIRouter, Query, Depends
+from sqlalchemy import Integer, cast, or_
+from sqlmodel import Session, select, func
+from app.core.database import get_session
+from app.models import Asceticism, AsceticismPackage
+from app.schemas.search import (
+    AsceticismSearchResult,
+    PackageSearchResult,
+    SearchResponse,
+)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_CONFIG = "english"
+
+
+class SearchMode(str, Enum):
+    FULL = "full"
+    PREFIX = "prefix"
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def full_text_filter(model, q: str):
+    """Ranked full-text match against a model's generated search vector."""
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(model.searchVector, query)
+    return model.searchVector.op("@@")(query), rank
+
+
+def typeahead_filter(model, q: str):
+    """
+    Title match for typeahead, served by the trigram index: substring
+    matches plus fuzzy matches, with title prefixes ranked first.
+    """
+    pattern = escape_like(q)
+    prefix_bonus = cast(model.title.ilike(f"{pattern}%"), Integer)
+    rank = prefix_bonus + func.similarity(model.title, q)
+    condition = or_(model.title.ilike(f"%{pattern}%"), model.title.op("%")(q))
+    return condition, rank
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: SearchMode = SearchMode.FULL,
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_session),
+):
+    """
+    Search asceticism templates and published packages.
+
+    `full` runs ranked full-text search over titles, descriptions and
+    categories; `prefix` is a fast title typeahead that tolerates typos.
+    """
+    q = q.strip()
+    build_filter = full_text_filter if mode == SearchMode.FULL else typeahead_filter
+
+    condition, rank = build_filter(Asceticism, q)
+    asceticism_rows = session.exec(
+        select(Asceticism, rank.label("rank"))
+        .where(Asceticism.isTemplate == True, condition)
+        .order_by(rank.desc(), Asceticism.id)
+        .limit(limit)
+    ).all()
+
+    condition, rank = build_filter(AsceticismPackage, q)
+    package_rows = session.exec(
+        select(AsceticismPackage, rank.label("rank"))
+        .where(AsceticismPackage.isPublished == True, condition)
+        .order_by(rank.desc(), AsceticismPackage.id)
+        .limit(limit)
+    ).all()
+
+    return SearchResponse(
+        query=q,
+        mode=mode.value,
+        asceticisms=[
+            AsceticismSearchResult(
+                id=asceticism.id,
+                title=asceticism.title,
+                description=asceticism.description,
+                category=asceticism.category,
+                icon=asceticism.icon,
+                type=asceticism.type.value,
+                rank=score,
+            )
+            for asceticism, score in asceticism_rows
+        ],
+        packages=[
+            PackageSearchResult(
+                id=package.id,
+                title=package.title,
+                description=package.description,
+                rank=score,
+            )
+            for package, score in package_rows
+        ],
+    )
@@ -0,0 +1,116 @@
+"""Sync router for incremental (delta) client updates."""
+
+from fastapi import APIRouter, Query, Depends
+from sqlmodel import Session, select
+from app.core.database import get_session, stable_change_seq
+from app.core.auth import get_current_user
+from app.models import (
+    UserAsceticism,
+    AsceticismLog,
+    DailyReadingNote,
+    SyncTombstone,
+    User,
+)
+from app.schemas.daily_readings import DailyReadingNoteResponse
+from app.schemas.sync import SyncResponse, SyncTombstoneResponse
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Get the current user's commitments, logs, notes and deletions changed
+    since a cursor. Pass the returned cursor as `since` on the next call;
+    keep calling while hasMore is true. since=0 returns everything.
+    """
+    # Changes above this may still be joined by earlier-numbered ones from
+    # transactions in flight, which a cursor past them would skip
+    until = stable_change_seq(session)
+
+    user_asceticisms = session.exec(
+        select(UserAsceticism)
+        .where(
+            UserAsceticism.userId == current_user.id,
+            UserAsceticism.changeSeq > since,
+            UserAsceticism.changeSeq <= until,
+        )
+        .order_by(UserAsceticism.changeSeq)
+        .limit(limit)
+    ).all()
+
+    logs = session.exec(
+        select(AsceticismLog)
+        .join(UserAsceticism, AsceticismLog.userAsceticismId == UserAsceticism.id)
+        .where(
+            UserAsceticism.userId == current_user.id,
+            AsceticismLog.changeSeq > since,
+            AsceticismLog.changeSeq <= until,
+        )
+        .order_by(AsceticismLog.changeSeq)
+        .limit(limit)
+    ).all()
+
+    notes = session.exec(
+        select(DailyReadingNote)
+        .where(
+            DailyReadingNote.userId == current_user.id,
+            DailyReadingNote.changeSeq > since,
+            DailyReadingNote.changeSeq <= until,
+        )
+        .order_by(DailyReadingNote.changeSeq)
+        .limit(limit)
+    ).all()
+
+    # Deletions only matter to clients that already hold older rows
+    tombstones = []
+    if since > 0:
+        tombstones = session.exec(
+            select(SyncTombstone)
+            .where(
+                SyncTombstone.userId == current_user.id,
+                SyncTombstone.changeSeq > since,
+                SyncTombstone.changeSeq <= until,
+            )
+            .order_by(SyncTombstone.changeSeq)
+            .limit(limit)
+        ).all()
+
+    streams = [user_asceticisms, logs, notes, tombstones]
+    truncated = [rows for rows in streams if len(rows) == limit]
+
+    if truncated:
+        # Only return a prefix of the sequence that is complete in every stream
+        cursor = min(rows[-1].changeSeq for rows in truncated)
+        user_asceticisms, logs, notes, tombstones = (
+            [row for row in rows if row.changeSeq <= cursor] for rows in streams
+        )
+    else:
+        cursor = max(since, until)
+
+    return {
+        "cursor": cursor,
+        "hasMore": bool(truncated),
+        "userAsceticisms": user_asceticisms,
+        "logs": logs,
+        "notes": [
+            DailyReadingNoteResponse(
+                id=note.id,
+                userId=note.userId,
+                date=note.date.isoformat(),
+                notes=note.notes,
+                createdAt=note.createdAt.isoformat(),
+                updatedAt=note.updatedAt.isoformat(),
+            )
+            for note in notes
+        ],
+        "deleted": [
+            SyncTombstoneResponse(entity=tombstone.entity, id=tombstone.entityId)
+            for tombstone in tombstones
+        ],
+    }
@@ -0,0 +1,183 @@
+"""Admission control: per-route-class concurrency limits with load shedding."""
+
+import asyncio
+import json
+import re
+from typing import Any, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .config import settings
+
+READ = "read"
+HEAVY = "heavy"
+WRITE = "write"
+LOG = "log"
+
+# Never limited: health check, long-lived event streams and API docs
+EXEMPT_PATHS = {"/", "/events/stream", "/docs", "/redoc", "/openapi.json"}
+
+# GETs that hold a connection for long or run expensive queries
+HEAVY_PATHS = re.compile(
+    r"^/(?:"
+    r"asceticisms/(?:progress|calendar)"
+    r"|admin/.*"
+    r"|search"
+    r"|sync.*"
+    r"|groups/\d+/leaderboard"
+    r"|daily-readings/(?:readings|search|bundles/[^/]+|notes/\d+/search)"
+    r")/?$"
+)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Writes that wait in the log group committer rather than on the pool
+LOG_PATH = "/asceticisms/log"
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """The route class a request is admitted under, or None if exempt."""
+    if method == "OPTIONS" or path in EXEMPT_PATHS:
+        return None
+    if method in WRITE_METHODS:
+        if method == "POST" and path == LOG_PATH and settings.LOG_GROUP_COMMIT_ENABLED:
+            return LOG
+        return WRITE
+    if HEAVY_PATHS.match(path):
+        return HEAVY
+    return READ
+
+
+class ConcurrencyLimit:
+    """
+    At most `concurrency` requests run at once; up to `queue_size` more wait
+    up to `queue_timeout` seconds for a slot. Anything beyond is rejected
+    immediately rather than adding to the pile.
+    """
+
+    def __init__(
+        self, name: str, concurrency: int, queue_size: int, queue_timeout: float
+    ) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting if allowed; False if the request is shed."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.waiting >= self.queue_size:
+            self.rejected += 1
+            return False
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                return False
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current load and counters, for metrics."""
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "queueSize": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+        }
+
+
+limits = {
+    READ: ConcurrencyLimit(
+        READ,
+        settings.ADMISSION_READ_CONCURRENCY,
+        settings.ADMISSION_READ_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    HEAVY: ConcurrencyLimit(
+        HEAVY,
+        settings.ADMISSION_HEAVY_CONCURRENCY,
+        settings.ADMISSION_HEAVY_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    WRITE: ConcurrencyLimit(
+        WRITE,
+        settings.ADMISSION_WRITE_CONCURRENCY,
+        settings.ADMISSION_WRITE_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    LOG: ConcurrencyLimit(
+        LOG,
+        settings.ADMISSION_LOG_CONCURRENCY,
+        settings.ADMISSION_LOG_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+}
+
+
+class AdmissionControlMiddleware:
+    """
+    Admits each HTTP request under its route class's limit and answers 503
+    with Retry-After when that class is saturated, so overload sheds excess
+    requests quickly instead of queueing every request on the database pool.
+    A slot is held until the response, including any streamed body, ends.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = limits[name]
+        if not await limit.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release()
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = json.dumps({"detail": "Server is busy, please retry"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (
+                        b"retry-after",
+                        str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode(),
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
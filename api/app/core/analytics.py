@@ -0,0 +1,305 @@
+"""Incremental rollups of activity into the analytics aggregate tables."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional
+from sqlalchemy import Integer, cast, delete, insert, literal, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, func
+from app.models import (
+    AnalyticsDaily,
+    AnalyticsPackageDaily,
+    AnalyticsRetention,
+    AnalyticsTemplateDaily,
+    AnalyticsUserDay,
+    AnalyticsWatermark,
+    AsceticismLog,
+    UserAsceticism,
+)
+from .config import settings
+from .database import advisory_lock, stable_change_seq
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_WATERMARK = "rollup"
+
+# Retention cohorts: users grouped by the week (Monday) of their first log,
+# here; by the week of their first commitment or by package joined, in
+# app.jobs.compute_cohorts
+FIRST_ACTIVE_WEEK = "first_active_week"
+SIGNUP_WEEK = "signup_week"
+PACKAGE = "package"
+COHORT_TYPES = (FIRST_ACTIVE_WEEK, SIGNUP_WEEK, PACKAGE)
+
+
+def day_start(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def changed_days(session: Session, since_seq: int, until_seq: int) -> set[datetime]:
+    """
+    Days of logs, and creation days of commitments, written or updated in
+    the change sequence range. A commitment counts as a join on the day it
+    was created, whether or not anything was logged that day.
+    """
+    log_days = select(func.date_trunc("day", AsceticismLog.date)).where(
+        AsceticismLog.changeSeq > since_seq,
+        AsceticismLog.changeSeq <= until_seq,
+    )
+    join_days = select(func.date_trunc("day", UserAsceticism.createdAt)).where(
+        UserAsceticism.changeSeq > since_seq,
+        UserAsceticism.changeSeq <= until_seq,
+    )
+    return set(session.execute(log_days.union(join_days)).scalars())
+
+
+def rollup_day(session: Session, day: datetime) -> None:
+    """Recompute every per-day aggregate of a day from the source tables."""
+    start, end = day, day + timedelta(days=1)
+    day_logs = (
+        select(
+            AsceticismLog.completed,
+            UserAsceticism.userId,
+            UserAsceticism.asceticismId,
+        )
+        .join(UserAsceticism, UserAsceticism.id == AsceticismLog.userAsceticismId)
+        .where(AsceticismLog.date >= start, AsceticismLog.date < end)
+        .subquery()
+    )
+    day_joins = (
+        select(
+            UserAsceticism.userId,
+            UserAsceticism.asceticismId,
+            UserAsceticism.packageId,
+        )
+        .where(UserAsceticism.createdAt >= start, UserAsceticism.createdAt < end)
+        .subquery()
+    )
+
+    for model in (AnalyticsUserDay, AnalyticsTemplateDaily, AnalyticsPackageDaily):
+        session.execute(delete(model).where(model.date == day))
+
+    session.execute(
+        insert(AnalyticsUserDay).from_select(
+            ["date", "userId"],
+            select(literal(day), day_logs.c.userId).distinct(),
+        )
+    )
+
+    per_template = union_all(
+        select(
+            day_logs.c.asceticismId.label("asceticismId"),
+            func.count(func.distinct(day_logs.c.userId)).label("activeUsers"),
+            func.count().label("logs"),
+            func.count().filter(day_logs.c.completed).label("completedLogs"),
+            literal(0).label("joins"),
+        ).group_by(day_logs.c.asceticismId),
+        select(
+            day_joins.c.asceticismId,
+            literal(0),
+            literal(0),
+            literal(0),
+            func.count(),
+        ).group_by(day_joins.c.asceticismId),
+    ).subquery()
+    session.execute(
+        insert(AnalyticsTemplateDaily).from_select(
+            ["date", "asceticismId", "activeUsers", "logs", "completedLogs", "joins"],
+            select(
+                literal(day),
+                per_template.c.asceticismId,
+                func.sum(per_template.c.activeUsers),
+                func.sum(per_template.c.logs),
+                func.sum(per_template.c.completedLogs),
+                func.sum(per_template.c.joins),
+            ).group_by(per_template.c.asceticismId),
+        )
+    )
+
+    session.execute(
+        insert(AnalyticsPackageDaily).from_select(
+            ["date", "packageId", "joins"],
+            select(
+                literal(day),
+                day_joins.c.packageId,
+                func.count(func.distinct(day_joins.c.userId)),
+            )
+            .where(day_joins.c.packageId != None)
+            .group_by(day_joins.c.packageId),
+        )
+    )
+
+    active_users = session.exec(
+        select(func.count()).where(AnalyticsUserDay.date == day)
+    ).one()
+    logs, completed_logs, joins = session.exec(
+        select(
+            func.coalesce(func.sum(AnalyticsTemplateDaily.logs), 0),
+            func.coalesce(func.sum(AnalyticsTemplateDaily.completedLogs), 0),
+            func.coalesce(func.sum(AnalyticsTemplateDaily.joins), 0),
+        ).where(AnalyticsTemplateDaily.date == day)
+    ).one()
+    values = dict(
+        activeUsers=active_users,
+        logs=logs,
+        completedLogs=completed_logs,
+        joins=joins,
+        updatedAt=datetime.utcnow(),
+    )
+    session.execute(
+        pg_insert(AnalyticsDaily)
+        .values(date=day, **values)
+        .on_conflict_do_update(index_elements=["date"], set_=values)
+    )
+
+
+def refresh_active_windows(
+    session: Session, days: Iterable[datetime], today: datetime
+) -> int:
+    """
+    Recompute weekly and monthly active users of every day whose trailing
+    30-day window includes one of `days`. Returns the number of days.
+    """
+    affected = sorted(
+        {
+            day + timedelta(days=offset)
+            for day in days
+            for offset in range(30)
+            if day + timedelta(days=offset) <= today
+        }
+    )
+    if not affected:
+        return 0
+    session.execute(
+        pg_insert(AnalyticsDaily)
+        .values([{"date": day, "updatedAt": datetime.utcnow()} for day in affected])
+        .on_conflict_do_nothing(index_elements=["date"])
+    )
+
+    def active_since(days_back: int):
+        return (
+            select(func.count(func.distinct(AnalyticsUserDay.userId)))
+            .where(
+                AnalyticsUserDay.date > AnalyticsDaily.date - timedelta(days=days_back),
+                AnalyticsUserDay.date <= AnalyticsDaily.date,
+            )
+            .scalar_subquery()
+        )
+
+    session.execute(
+        update(AnalyticsDaily)
+        .where(AnalyticsDaily.date.in_(affected))
+        .values(weeklyActiveUsers=active_since(7), monthlyActiveUsers=active_since(30))
+    )
+    return len(affected)
+
+
+def rebuild_retention(session: Session) -> None:
+    """Recompute first-active-week retention from the user-day rollup."""
+    weeks = (
+        select(
+            AnalyticsUserDay.userId,
+            func.date_trunc("week", AnalyticsUserDay.date).label("week"),
+        )
+        .distinct()
+        .subquery()
+    )
+    firsts = (
+        select(weeks.c.userId, func.min(weeks.c.week).label("cohort"))
+        .group_by(weeks.c.userId)
+        .subquery()
+    )
+    week_offset = cast(
+        func.extract("epoch", weeks.c.week - firsts.c.cohort) / 604800, Integer
+    )
+    session.execute(
+        delete(AnalyticsRetention).where(
+            AnalyticsRetention.cohortType == FIRST_ACTIVE_WEEK
+        )
+    )
+    # Every member is active in their first week, so offset 0 counts them all
+    cohort_size = func.max(func.count()).over(partition_by=firsts.c.cohort)
+    session.execute(
+        insert(AnalyticsRetention).from_select(
+            [
+                "cohortType",
+                "cohortKey",
+                "cohortStart",
+                "weekOffset",
+                "users",
+                "eligibleUsers",
+                "cohortSize",
+            ],
+            select(
+                literal(FIRST_ACTIVE_WEEK),
+                func.to_char(firsts.c.cohort, "YYYY-MM-DD"),
+                firsts.c.cohort,
+                week_offset,
+                func.count(),
+                cohort_size,
+                cohort_size,
+            )
+            .select_from(weeks)
+            .join(firsts, firsts.c.userId == weeks.c.userId)
+            .group_by(firsts.c.cohort, week_offset),
+        )
+    )
+
+
+def run_rollup(
+    session: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> dict[str, Any]:
+    """
+    Bring the aggregates up to date: recompute days with logs or joins
+    changed since the last run plus the most recent days, and days in
+    [start, end] if given. The first run recomputes every such day.
+
+    Deleted logs and commitments leave no change to detect, so their days are only
+    corrected by the recent-days window or an explicit range. Concurrent
+    runs wait for each other.
+    """
+    with advisory_lock(ROLLUP_WATERMARK):
+        today = day_start(datetime.utcnow())
+        # Read afresh, as the run this one waited for may have moved it
+        watermark = session.get(
+            AnalyticsWatermark, ROLLUP_WATERMARK, populate_existing=True
+        )
+        since_seq = watermark.changeSeq if watermark else 0
+        until_seq = stable_change_seq(session)
+
+        days = changed_days(session, since_seq, until_seq)
+        days |= {
+            today - timedelta(days=i) for i in range(settings.ANALYTICS_RECENT_DAYS)
+        }
+        if start is not None:
+            end = day_start(end or today)
+            day = day_start(start)
+            while day <= end:
+                days.add(day)
+                day += timedelta(days=1)
+
+        ordered = sorted(days)
+        for i, day in enumerate(ordered):
+            rollup_day(session, day)
+            session.commit()
+            if on_progress is not None and i % 50 == 0:
+                on_progress(0.9 * i / len(ordered))
+
+        windows = refresh_active_windows(session, ordered, today)
+        rebuild_retention(session)
+        session.execute(
+            pg_insert(AnalyticsWatermark)
+            .values(
+                name=ROLLUP_WATERMARK, changeSeq=until_seq, updatedAt=datetime.utcnow()
+            )
+            .on_conflict_do_update(
+                index_elements=["name"],
+                set_={"changeSeq": until_seq, "updatedAt": datetime.utcnow()},
+            )
+        )
+        session.commit()
+        logger.info("Rolled up %d days (%d active-user windows)", len(ordered), windows)
+    return {"days": len(ordered), "windows": windows, "changeSeq": until_seq}
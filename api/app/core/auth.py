@@ -4,10 +4,17 @@ from typing import Optional
 import jwt
 from fastapi import Header, HTTPException, Depends
 from sqlmodel import Session, select
+from app.core.cache import Cache
 from app.core.database import get_session
 from app.core.config import settings
+from app.core.invalidation import USER_ACCOUNT, invalidation_bus
 from app.models import User, UserRole
 
+# Users by email, so authenticating a request skips the query while cached
+user_cache = Cache("user", ttl=settings.AUTH_CACHE_TTL_SECONDS)
+# Events carry the user id, not the email; role and ban changes are rare
+invalidation_bus.subscribe(USER_ACCOUNT, lambda user_id: user_cache.clear())
+
 
 def verify_jwt_token(token: str) -> dict:
     """
@@ -38,9 +45,20 @@ def verify_jwt_token(token: str) -> dict:
 
 
 async def get_user_by_email(email: str, session: Session) -> Optional[User]:
-    """Get user by email from database."""
-    statement = select(User).where(User.email == email)
-    return session.exec(statement).first()
+    """
+    Get user by email, from the user cache or the database. A miss is read
+    on a short-lived session, so the caller's session holds no connection
+    while the request awaits.
+    """
+
+    async def load() -> Optional[dict]:
+        statement = select(User).where(User.email == email)
+        with Session(session.get_bind()) as load_session:
+            user = load_session.exec(statement).first()
+            return user.model_dump() if user else None
+
+    data = await user_cache.get_or_compute(email, load)
+    return User(**data) if data else None
 
 
 async def get_current_user(
@@ -57,6 +75,21 @@ async def get_current_user(
     Returns:
         The authenticated User object
 
+    Raises:
+        HTTPException: If authentication fails
+    """
+    return await authenticate_authorization(authorization, session)
+
+
+async def authenticate_authorization(
+    authorization: Optional[str], session: Session
+) -> User:
+    """
+    Resolve an Authorization header to an active user.
+
+    Used directly by long-lived endpoints that must not hold the
+    request-scoped database session open.
+
     Raises:
         HTTPException: If authentication fails
     """
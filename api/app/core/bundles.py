@@ -0,0 +1,225 @@
+"""Offline Mass readings bundles for a month or liturgical season."""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlmodel import Session, select, func
+from app.models import MassReading, ReadingsBundle
+from .config import settings
+from .readings import cache_readings
+from .universalis import fetch_readings
+
+MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+SEASON_RE = re.compile(r"^(advent|christmas|lent|easter)-(\d{4})$")
+
+
+class BundleError(ValueError):
+    """Unknown bundle key."""
+
+
+def easter_sunday(year: int) -> date:
+    """Western Easter (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def baptism_of_the_lord(year: int) -> date:
+    """
+    End of the Christmas season in the USA calendar: the Sunday after
+    Epiphany (kept on the Sunday from Jan 2 to 8), or the Monday after it
+    when Epiphany falls on Jan 7 or 8.
+    """
+    jan_2 = date(year, 1, 2)
+    epiphany = jan_2 + timedelta(days=(6 - jan_2.weekday()) % 7)
+    if epiphany.day >= 7:
+        return epiphany + timedelta(days=1)
+    return epiphany + timedelta(days=7)
+
+
+def season_range(season: str, year: int) -> tuple[date, date]:
+    """
+    First and last day of a liturgical season. Christmas and Advent are
+    keyed by the year they begin in.
+    """
+    if season in ("advent", "christmas"):
+        christmas = date(year, 12, 25)
+        # Fourth Sunday before Christmas
+        first_advent = christmas - timedelta(days=christmas.weekday() + 1 + 21)
+        if season == "advent":
+            return first_advent, date(year, 12, 24)
+        return christmas, baptism_of_the_lord(year + 1)
+    easter = easter_sunday(year)
+    if season == "lent":
+        # Ash Wednesday to Holy Saturday
+        return easter - timedelta(days=46), easter - timedelta(days=1)
+    # Easter Sunday to Pentecost
+    return easter, easter + timedelta(days=49)
+
+
+def bundle_range(key: str) -> tuple[date, date]:
+    """Date range of a bundle key: "YYYY-MM" or "<season>-YYYY"."""
+    match = MONTH_RE.match(key)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        if not 1 <= month <= 12:
+            raise BundleError(f"Invalid month: {key}")
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return date(year, month, 1), next_month - timedelta(days=1)
+    match = SEASON_RE.match(key)
+    if match:
+        return season_range(match.group(1), int(match.group(2)))
+    raise BundleError(
+        f"Unknown bundle: {key}. Use YYYY-MM or advent|christmas|lent|easter-YYYY"
+    )
+
+
+def bundle_path(content_hash: str) -> str:
+    return os.path.join(settings.READINGS_BUNDLE_DIR, f"{content_hash}.json.gz")
+
+
+def _as_utc(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def readings_hash(rows: list[tuple[datetime, str]]) -> str:
+    """SHA-256 over (date, content hash) rows of stored readings, in date order."""
+    digest = hashlib.sha256()
+    for reading_date, content_hash in rows:
+        digest.update(f"{reading_date:%Y%m%d}:{content_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def is_current(session: Session, bundle: ReadingsBundle) -> bool:
+    """
+    Whether the readings in a bundle's range are still the ones it was built
+    from. Revalidation rewrites readings that upstream left unchanged, so
+    this compares content hashes rather than update times.
+    """
+    rows = session.exec(
+        select(MassReading.date, MassReading.contentHash)
+        .where(MassReading.date >= bundle.startDate, MassReading.date <= bundle.endDate)
+        .order_by(MassReading.date)
+    ).all()
+    return bundle.readingsHash == readings_hash(rows)
+
+
+async def fill_gaps(session: Session, start: date, end: date) -> None:
+    """Fetch and cache any dates in the range not cached yet."""
+    cached = {
+        d.date()
+        for d in session.exec(
+            select(MassReading.date).where(
+                MassReading.date >= _as_utc(start), MassReading.date <= _as_utc(end)
+            )
+        )
+    }
+    missing = [
+        start + timedelta(days=i)
+        for i in range((end - start).days + 1)
+        if start + timedelta(days=i) not in cached
+    ]
+    if not missing:
+        return
+
+    semaphore = asyncio.Semaphore(settings.READINGS_FETCH_CONCURRENCY)
+
+    async def fetch(day: date) -> dict:
+        async with semaphore:
+            return await fetch_readings(day.strftime("%Y%m%d"))
+
+    # A bundle with holes is useless offline, so any failure aborts the build
+    results = await asyncio.gather(*(fetch(day) for day in missing))
+    cache_readings(session, dict(zip(map(_as_utc, missing), results)))
+
+
+def write_bundle_file(
+    session: Session, key: str, start: date, end: date
+) -> tuple[str, str]:
+    """
+    Write the bundle file and return its content hash and readings hash.
+    The file is a gzip JSON object {"key", "from", "to", "readings":
+    {YYYYMMDD: readings}}, named by the SHA-256 of its bytes.
+    """
+    rows = session.exec(
+        select(MassReading.date, MassReading.payload, MassReading.contentHash)
+        .where(MassReading.date >= _as_utc(start), MassReading.date <= _as_utc(end))
+        .order_by(MassReading.date)
+    ).all()
+    parts = [
+        f'{{"key": "{key}", "from": "{start:%Y%m%d}", "to": "{end:%Y%m%d}", '
+        '"readings": {'.encode()
+    ]
+    for i, (reading_date, payload, _) in enumerate(rows):
+        # Stored payloads are already JSON; splice rather than re-encode
+        parts.append(f'{"," if i else ""}"{reading_date:%Y%m%d}": '.encode())
+        parts.append(gzip.decompress(payload))
+    parts.append(b"}}")
+    body = gzip.compress(b"".join(parts), mtime=0)
+    content_hash = hashlib.sha256(body).hexdigest()
+
+    path = bundle_path(content_hash)
+    if not os.path.exists(path):
+        os.makedirs(settings.READINGS_BUNDLE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=settings.READINGS_BUNDLE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+    return content_hash, readings_hash([(d, h) for d, _, h in rows])
+
+
+def restore_bundle_file(session: Session, content_hash: str) -> bool:
+    """
+    Rewrite a missing bundle file from the stored readings, e.g. when it was
+    built by a worker that does not share READINGS_BUNDLE_DIR. False if no
+    bundle has that hash or its readings have changed since.
+    """
+    bundle = session.exec(
+        select(ReadingsBundle).where(ReadingsBundle.contentHash == content_hash)
+    ).first()
+    if bundle is None:
+        return False
+    start, end = bundle_range(bundle.key)
+    # If the readings changed, the file written is named by its own hash
+    return write_bundle_file(session, bundle.key, start, end)[0] == content_hash
+
+
+async def build_bundle(session: Session, key: str, force: bool = False) -> ReadingsBundle:
+    """
+    Return the bundle for a key, building it if missing or outdated:
+    fetch uncached dates, then write a content-addressed file and record it.
+    """
+    start, end = bundle_range(key)
+    bundle: Optional[ReadingsBundle] = session.exec(
+        select(ReadingsBundle).where(ReadingsBundle.key == key)
+    ).first()
+    if bundle and not force and is_current(session, bundle):
+        return bundle
+
+    await fill_gaps(session, start, end)
+    built_at = datetime.utcnow()
+    content_hash, readings = write_bundle_file(session, key, start, end)
+
+    if bundle is None:
+        bundle = ReadingsBundle(key=key, startDate=_as_utc(start), endDate=_as_utc(end))
+    bundle.contentHash = content_hash
+    bundle.readingsHash = readings
+    bundle.size = os.path.getsize(bundle_path(content_hash))
+    bundle.builtAt = built_at
+    session.add(bundle)
+    session.commit()
+    session.refresh(bundle)
+    return bundle
@@ -0,0 +1,243 @@
+"""Shared cache with an in-process LRU backend and a Redis backend."""
+
+import asyncio
+import logging
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from .config import settings
+from .invalidation import CATALOG, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KEY_PREFIX = "desert"
+
+
+class CacheBackend(ABC):
+    """Byte-valued key store with optional per-key TTL."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-worker LRU bounded by a byte budget. Expired entries are dropped
+    when read or when evicted to make room.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        # key -> (value, expires at on the monotonic clock or None)
+        self._entries: OrderedDict[str, tuple[bytes, Optional[float]]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if len(value) > self._max_bytes:
+            return
+        self.delete(key)
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._size += len(value)
+        while self._size > self._max_bytes:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self.delete(key)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache shared by every worker through a Redis-protocol server.
+
+    Redis errors are logged and treated as misses, so an unavailable cache
+    slows requests down instead of failing them.
+    """
+
+    def __init__(self, client: Any) -> None:
+        import redis
+
+        self._client = client
+        self._errors = redis.RedisError
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        # Optional dependency, only needed with CACHE_BACKEND=redis
+        import redis
+
+        return cls(redis.Redis.from_url(url, socket_timeout=1.0))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._client.get(key)
+        except self._errors as exc:
+            logger.warning("Cache get failed: %s", exc)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        try:
+            self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+        except self._errors as exc:
+            logger.warning("Cache set failed: %s", exc)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(key)
+        except self._errors as exc:
+            logger.warning("Cache delete failed: %s", exc)
+
+    def delete_prefix(self, prefix: str) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=f"{prefix}*", count=500))
+            for i in range(0, len(keys), 500):
+                self._client.delete(*keys[i : i + 500])
+        except self._errors as exc:
+            logger.warning("Cache delete failed: %s", exc)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    """The configured backend, created on first use."""
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == "redis":
+            _backend = RedisBackend.from_url(settings.REDIS_URL)
+        elif settings.CACHE_BACKEND == "memory":
+            _backend = MemoryBackend(max_bytes=settings.CACHE_MAX_BYTES)
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """Replace the configured backend, e.g. with a fakeredis client."""
+    global _backend
+    _backend = backend
+
+
+class Cache:
+    """
+    A namespace in the shared cache. Values are pickled, so only the app's
+    own workers should have access to the backend.
+
+    `get_or_compute` is single-flight per worker: concurrent misses for the
+    same key share one computation. None results are not cached. Deleting a
+    key, or clearing, drops its pending computation: the result still goes
+    to its callers but is not stored, as it may predate the invalidation.
+    """
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def _key(self, key: Any) -> str:
+        return f"{KEY_PREFIX}:{self.namespace}:{key}"
+
+    def get(self, key: Any) -> Optional[Any]:
+        value = get_backend().get(self._key(key))
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        get_backend().set(
+            self._key(key), pickle.dumps(value), ttl if ttl is not None else self.ttl
+        )
+
+    def delete(self, key: Any) -> None:
+        full_key = self._key(key)
+        self._pending.pop(full_key, None)
+        get_backend().delete(full_key)
+
+    def clear(self) -> None:
+        """Drop every key in this namespace."""
+        self._pending.clear()
+        get_backend().delete_prefix(f"{KEY_PREFIX}:{self.namespace}:")
+
+    async def get_or_compute(
+        self,
+        key: Any,
+        compute: Callable[[], Awaitable[Optional[T]]],
+        ttl: Optional[float] = None,
+    ) -> Optional[T]:
+        """Return the cached value, or compute, cache and return it."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        full_key = self._key(key)
+        task = self._pending.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute, ttl))
+            self._pending[full_key] = task
+            task.add_done_callback(lambda done: self._forget(full_key, done))
+        # Shielded so one caller disconnecting does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        key: Any,
+        compute: Callable[[], Awaitable[Optional[T]]],
+        ttl: Optional[float],
+    ) -> Optional[T]:
+        value = await compute()
+        # Only store if no invalidation dropped (or replaced) this computation
+        current = self._pending.get(self._key(key)) is asyncio.current_task()
+        if value is not None and current:
+            self.set(key, value, ttl)
+        return value
+
+    def _forget(self, full_key: str, task: asyncio.Task) -> None:
+        if self._pending.get(full_key) is task:
+            del self._pending[full_key]
+
+
+# Serialized template and package listings, keyed "asceticisms:<category>",
+# "popular-asceticisms:<category>", "similar:<asceticism id>",
+# "packages:browse", "packages:popular" and "package:<id>". Popularity
+# orderings and similar templates are refreshed by the TTL, not by joins.
+catalog_cache = Cache("catalog", ttl=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def invalidate_catalog(key: str) -> None:
+    """Evict listings affected by a change to "asceticism:<id>" or "package:<id>"."""
+    if key.startswith("asceticism:"):
+        # Templates are embedded in package listings too
+        catalog_cache.clear()
+    else:
+        catalog_cache.delete("packages:browse")
+        catalog_cache.delete("packages:popular")
+        catalog_cache.delete(key)
+
+
+invalidation_bus.subscribe(CATALOG, invalidate_catalog)
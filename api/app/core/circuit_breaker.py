@@ -0,0 +1,127 @@
+"""Circuit breaker for calls to unreliable upstream services."""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_seconds`. Then a single probe call is let through (half-open):
+    success closes the circuit, failure opens it again.
+
+    Per worker; only exceptions for which `is_failure` returns True count.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_seconds: float,
+        is_failure: Callable[[Exception], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.is_failure = is_failure
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened_count = 0
+        self.last_failure: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def _before_call(self) -> bool:
+        """Admit or reject a call. Returns whether it is the half-open probe."""
+        if self.state == OPEN and self.retry_after() == 0:
+            self.state = HALF_OPEN
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probing):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after() or self.reset_seconds)
+        if self.state == HALF_OPEN:
+            self._probing = True
+            return True
+        return False
+
+    def _on_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def _on_failure(self, exc: Exception) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = f"{type(exc).__name__}: {exc}"
+        self.last_failure_at = datetime.now(timezone.utc)
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self.opened_count += 1
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Run `fn(*args)` through the breaker."""
+        probe = self._before_call()
+        try:
+            result = await fn(*args)
+        except Exception as exc:
+            if self.is_failure(exc):
+                self._on_failure(exc)
+            raise
+        else:
+            self._on_success()
+            return result
+        finally:
+            # Also covers cancellation, so a lost probe never wedges half-open.
+            # Calls admitted before the circuit opened leave the flag alone.
+            if probe:
+                self._probing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current state and counters, for metrics."""
+        if self.state == OPEN and self.retry_after() == 0:
+            state = HALF_OPEN
+        else:
+            state = self.state
+        return {
+            "name": self.name,
+            "state": state,
+            "consecutiveFailures": self.consecutive_failures,
+            "failureThreshold": self.failure_threshold,
+            "retryAfterSeconds": round(self.retry_after(), 1),
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "openedCount": self.opened_count,
+            "lastFailure": self.last_failure,
+            "lastFailureAt": self.last_failure_at,
+        }
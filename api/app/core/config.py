@@ -9,6 +9,94 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     NEXTAUTH_SECRET: str
 
+    # Admission control: concurrent requests per route class (sized to the
+    # 15-connection database pool) and how many may wait before 503s
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_READ_CONCURRENCY: int = 8
+    ADMISSION_READ_QUEUE_SIZE: int = 64
+    ADMISSION_HEAVY_CONCURRENCY: int = 3
+    ADMISSION_HEAVY_QUEUE_SIZE: int = 8
+    ADMISSION_WRITE_CONCURRENCY: int = 4
+    ADMISSION_WRITE_QUEUE_SIZE: int = 32
+    # Group-committed log writes wait for their batch without a connection:
+    # auth reads users on a short-lived session and the route closes its
+    # session after the ownership check, before awaiting. Neither holds a
+    # connection across an await, so this is not bounded by the pool
+    ADMISSION_LOG_CONCURRENCY: int = 1000
+    ADMISSION_LOG_QUEUE_SIZE: int = 1000
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Micro-cache of hot anonymous GET responses (per worker)
+    MICRO_CACHE_ENABLED: bool = True
+    MICRO_CACHE_TTL_SECONDS: float = 2.0
+    MICRO_CACHE_MAX_ENTRIES: int = 1024
+
+    # Server-sent events
+    EVENTS_QUEUE_SIZE: int = 32
+    EVENTS_MAX_CONNECTIONS: int = 10000
+    EVENTS_KEEPALIVE_SECONDS: int = 25
+
+    # Reminders (enable on a single worker)
+    REMINDERS_ENABLED: bool = False
+    REMINDER_NOTIFIER: str = "stdout"  # "stdout" or "file:<path>"
+    REMINDER_BATCH_SIZE: int = 1000
+    REMINDER_REBUILD_MINUTES: int = 60
+
+    # Group commit of log writes (opt-in; batches flush after the delay or
+    # once full)
+    LOG_GROUP_COMMIT_ENABLED: bool = False
+    LOG_GROUP_COMMIT_MAX_BATCH: int = 500
+    LOG_GROUP_COMMIT_MAX_DELAY_MS: float = 5.0
+
+    # Background jobs (run workers with python -m app.jobs.worker); failed
+    # jobs retry with exponential backoff, and a running job whose lock is
+    # not renewed within the timeout is assumed lost and requeued
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 10.0
+    JOB_RETRY_MAX_SECONDS: float = 3600.0
+    JOB_POLL_SECONDS: float = 5.0
+    JOB_LOCK_TIMEOUT_SECONDS: int = 600
+
+    # Analytics rollups (python -m app.jobs.rollup_analytics, e.g. from cron);
+    # each run also recomputes this many most recent days
+    ANALYTICS_RECENT_DAYS: int = 2
+
+    # Popularity counters; the recent-logs window only slides forward when
+    # python -m app.jobs.reconcile_popularity runs (e.g. daily from cron)
+    POPULARITY_RECENT_DAYS: int = 30
+
+    # Similar-asceticism recommendations (python -m app.jobs.build_similarities,
+    # e.g. hourly from cron, and with --full now and then); neighbours kept
+    # per template and users two templates must share to be neighbours
+    SIMILAR_TOP_K: int = 20
+    SIMILAR_MIN_CO_USERS: int = 2
+
+    # Mass readings upstream (Universalis)
+    UNIVERSALIS_BASE_URL: str = "https://www.universalis.com/usa"
+    UNIVERSALIS_TIMEOUT_SECONDS: float = 10.0
+    UNIVERSALIS_MAX_CONNECTIONS: int = 32  # per worker, shared by all requests
+    UNIVERSALIS_BREAKER_THRESHOLD: int = 5
+    UNIVERSALIS_BREAKER_RESET_SECONDS: float = 30.0
+    READINGS_STALE_AFTER_HOURS: int = 168
+    # Bundle files are written by job workers and served by the API; share
+    # the directory between them (the API rewrites missing files from the
+    # database, at the cost of a rebuild per server)
+    READINGS_BUNDLE_DIR: str = "bundles"
+    READINGS_FETCH_CONCURRENCY: int = 4  # per range request or bundle build
+    READINGS_RANGE_MAX_DAYS: int = 366
+
+    # Per-user dashboard response cache (per worker)
+    USER_RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Shared cache: "memory" (per worker) or "redis" (shared by all workers)
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    READINGS_CACHE_TTL_SECONDS: int = 3600
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+
     class Config:
         env_file = ".env"
         case_sensitive = True
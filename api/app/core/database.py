@@ -1,7 +1,10 @@
 """Database engine and session management."""
 
-from typing import Generator
-from sqlmodel import create_engine, Session
+from contextlib import contextmanager
+from typing import Generator, Iterator
+from sqlalchemy import text
+from sqlmodel import create_engine, Session, select, func
+from app.models import CHANGE_SEQ_XID_SHIFT
 from .config import settings
 
 # Create engine
@@ -16,3 +19,34 @@ def get_session() -> Generator[Session, None, None]:
     """Get database session for dependency injection."""
     with Session(engine) as session:
         yield session
+
+
+def stable_change_seq(session: Session) -> int:
+    """
+    Highest change sequence number such that no change numbered at or below
+    it can still commit: transactions older than the snapshot's xmin have
+    all ended, and newer ones number their changes above it. A long-running
+    writer holds this back until it ends.
+    """
+    xmin = session.execute(
+        text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+    ).scalar_one()
+    return (xmin << CHANGE_SEQ_XID_SHIFT) - 1
+
+
+@contextmanager
+def advisory_lock(name: str) -> Iterator[None]:
+    """
+    Hold a named Postgres advisory lock, waiting for any other holder, e.g.
+    so a job and a cron run don't interleave. It is held on a connection of
+    its own, across the caller's commits.
+    """
+    key = func.hashtext(name)
+    with engine.connect() as connection:
+        connection.execute(select(func.pg_advisory_lock(key)))
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(select(func.pg_advisory_unlock(key)))
+            connection.commit()
@@ -0,0 +1,81 @@
+"""Per-user change events pushed to open clients over server-sent events."""
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session, select, func
+from .config import settings
+from .listener import pg_listener
+
+EVENTS_CHANNEL = "desert_events"
+
+
+class EventBroker:
+    """
+    Fans events out to the open streams of each user in this worker.
+
+    Each stream owns a small bounded queue; when a slow client falls behind,
+    its oldest events are dropped so memory per connection stays fixed.
+    Clients recover anything they missed through /sync.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self._queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self.connection_count = 0
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Open a new event queue for one of the user's streams."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers[user_id].add(queue)
+        self.connection_count += 1
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """Close one of the user's streams."""
+        queues = self._subscribers.get(user_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        self.connection_count -= 1
+        if not queues:
+            del self._subscribers[user_id]
+
+    def dispatch(self, payload: str) -> None:
+        """Deliver a NOTIFY payload to the target user's local streams."""
+        event = json.loads(payload)
+        for queue in self._subscribers.get(event["userId"], ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+broker = EventBroker(queue_size=settings.EVENTS_QUEUE_SIZE)
+pg_listener.add_handler(EVENTS_CHANNEL, broker.dispatch)
+
+
+def publish_event(
+    session: Session, user_id: int, event_type: str, data: dict[str, Any]
+) -> None:
+    """
+    Publish a change event to the user's open streams on every worker.
+
+    Postgres only delivers NOTIFY when the transaction commits, so call this
+    before `session.commit()`; rolled-back changes are never pushed.
+    """
+    payload = event_payload(user_id, event_type, data)
+    session.exec(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+
+
+def event_payload(user_id: int, event_type: str, data: dict[str, Any]) -> str:
+    """NOTIFY payload of a change event on EVENTS_CHANNEL."""
+    return json.dumps(
+        {"userId": user_id, "type": event_type, "data": jsonable_encoder(data)}
+    )
+
+
+def format_sse(event: dict[str, Any]) -> bytes:
+    """Encode an event as a server-sent events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n".encode()
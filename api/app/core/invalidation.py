@@ -0,0 +1,73 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY."""
+
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional
+from sqlmodel import Session, select, func
+from .listener import pg_listener
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "desert_invalidate"
+
+# Topics, with the key each one carries
+USER_DATA = "user_data"  # user id: commitments or logs changed
+USER_ACCOUNT = "user_account"  # user id: role or ban status changed
+CATALOG = "catalog"  # "asceticism:<id>" or "package:<id>": template/package changed
+GROUP = "group"  # group id: membership changed
+READINGS = "readings"  # YYYYMMDD date: stored readings replaced
+
+
+class InvalidationBus:
+    """
+    Routes invalidation events from any worker to the in-process caches
+    subscribed to their topic.
+
+    Every worker, including the one that made the change, receives each
+    event; handlers must be idempotent. Writers should still evict their
+    own worker's caches right after commit so they read their own writes.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+        self._resync_handlers: list[Callable[[], None]] = []
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None]) -> None:
+        """Call handler with the event key for every event on topic."""
+        self._handlers[topic].append(handler)
+
+    def on_resync(self, handler: Callable[[], None]) -> None:
+        """Call handler to drop everything when events may have been missed."""
+        self._resync_handlers.append(handler)
+
+    def dispatch(self, payload: str) -> None:
+        event = json.loads(payload)
+        for handler in self._handlers.get(event["topic"], []):
+            handler(event["key"])
+
+    def resync(self) -> None:
+        logger.info("Invalidation events may have been missed, clearing caches")
+        for handler in self._resync_handlers:
+            handler()
+
+
+invalidation_bus = InvalidationBus()
+pg_listener.add_handler(INVALIDATION_CHANNEL, invalidation_bus.dispatch)
+pg_listener.add_reconnect_handler(invalidation_bus.resync)
+
+
+def publish_invalidation(session: Session, topic: str, key: Optional[Any]) -> None:
+    """
+    Tell every worker to evict cached data for a key.
+
+    Like change events, the NOTIFY is only delivered if the transaction
+    commits, so call this before `session.commit()`.
+    """
+    payload = invalidation_payload(topic, key)
+    session.exec(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+def invalidation_payload(topic: str, key: Optional[Any]) -> str:
+    """NOTIFY payload of an invalidation on INVALIDATION_CHANNEL."""
+    return json.dumps({"topic": topic, "key": key})
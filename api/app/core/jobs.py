@@ -0,0 +1,245 @@
+"""Postgres-backed background job queue."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+from sqlalchemy import text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, func
+from app.models import Job, JobStatus
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+JOBS_CHANNEL = "desert_jobs"
+
+# Session.info key under which claim() records the claims made in a session
+CLAIMS_KEY = "job_claims"
+
+JobHandler = Callable[[Session, Job], Awaitable[Optional[dict[str, Any]]]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures that retrying cannot fix."""
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the coroutine that runs jobs of a type. It receives a session
+    and the claimed job and returns a JSON-serializable result (or None).
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[job_type] = handler
+        return handler
+
+    return register
+
+
+def get_handler(job_type: str) -> Optional[JobHandler]:
+    return _handlers.get(job_type)
+
+
+def enqueue(
+    session: Session,
+    job_type: str,
+    payload: Optional[dict[str, Any]] = None,
+    user_id: Optional[int] = None,
+    dedupe_key: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+    run_at: Optional[datetime] = None,
+) -> Job:
+    """
+    Queue a job and commit. With a dedupe key, returns the queued or
+    running job with that key instead of adding another.
+    """
+    now = datetime.utcnow()
+    statement = (
+        insert(Job)
+        .values(
+            type=job_type,
+            payload=payload,
+            status=JobStatus.QUEUED,
+            dedupeKey=dedupe_key,
+            userId=user_id,
+            attempts=0,
+            maxAttempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            runAt=run_at or now,
+            progress=0.0,
+            createdAt=now,
+            updatedAt=now,
+        )
+        .on_conflict_do_nothing(
+            index_elements=["dedupeKey"],
+            index_where=text("status IN ('QUEUED', 'RUNNING')"),
+        )
+        .returning(Job.id)
+    )
+    while True:
+        job_id = session.execute(statement).scalar()
+        if job_id is not None:
+            # Wake idle workers instead of waiting for their next poll
+            session.exec(select(func.pg_notify(JOBS_CHANNEL, job_type)))
+            break
+        job_id = session.exec(
+            select(Job.id).where(
+                Job.dedupeKey == dedupe_key,
+                Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            )
+        ).first()
+        if job_id is not None:
+            break
+        # The conflicting job finished in between; queue a new one after all
+    session.commit()
+    return session.get(Job, job_id)
+
+
+def claim(session: Session, worker_id: str, types: list[str]) -> Optional[Job]:
+    """
+    Take the next runnable job of the given types, if any. Concurrent
+    workers skip rows another worker has locked instead of waiting.
+    """
+    now = datetime.utcnow()
+    job = session.exec(
+        select(Job)
+        .where(Job.status == JobStatus.QUEUED, Job.runAt <= now, Job.type.in_(types))
+        .order_by(Job.runAt)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if job is None:
+        session.rollback()
+        return None
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.lockedBy = worker_id
+    job.lockedAt = now
+    job.updatedAt = now
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    session.info.setdefault(CLAIMS_KEY, {})[job.id] = (worker_id, job.attempts)
+    return job
+
+
+def next_run_at(session: Session, types: list[str]) -> Optional[datetime]:
+    """When the earliest queued job of the given types becomes runnable."""
+    run_at = session.exec(
+        select(func.min(Job.runAt)).where(
+            Job.status == JobStatus.QUEUED, Job.type.in_(types)
+        )
+    ).one()
+    session.rollback()
+    return run_at
+
+
+def _update_claimed(session: Session, job: Job, outcome: str, **values: Any) -> bool:
+    """
+    Write to a job and commit only while this session's claim on it holds.
+    A job whose lock expired may have been requeued and claimed again; then
+    nothing is written and the run is treated as lost.
+    """
+    worker_id, attempts = session.info.get(CLAIMS_KEY, {}).get(job.id, (None, None))
+    result = session.execute(
+        update(Job)
+        .where(
+            Job.id == job.id,
+            Job.lockedBy == worker_id,
+            Job.attempts == attempts,
+            Job.status == JobStatus.RUNNING,
+        )
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        session.rollback()
+        logger.warning("Job %d lost its lock, not recording its %s", job.id, outcome)
+        return False
+    session.commit()
+    return True
+
+
+def set_progress(session: Session, job: Job, progress: float) -> bool:
+    """
+    Record progress (0 to 1); also renews the job's lock. Returns False if
+    the run has lost its lock.
+    """
+    now = datetime.utcnow()
+    return _update_claimed(
+        session,
+        job,
+        "progress",
+        progress=max(0.0, min(1.0, progress)),
+        lockedAt=now,
+        updatedAt=now,
+    )
+
+
+def complete(session: Session, job: Job, result: Optional[dict[str, Any]]) -> bool:
+    now = datetime.utcnow()
+    return _update_claimed(
+        session,
+        job,
+        "result",
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        progress=1.0,
+        error=None,
+        lockedBy=None,
+        lockedAt=None,
+        finishedAt=now,
+        updatedAt=now,
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff after the given number of failed attempts."""
+    delay = settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.JOB_RETRY_MAX_SECONDS)
+
+
+def fail(session: Session, job: Job, exc: BaseException) -> bool:
+    """Requeue with backoff, or mark failed when out of attempts."""
+    now = datetime.utcnow()
+    values: dict[str, Any] = dict(
+        error=f"{type(exc).__name__}: {exc}",
+        lockedBy=None,
+        lockedAt=None,
+        updatedAt=now,
+    )
+    if isinstance(exc, PermanentJobError) or job.attempts >= job.maxAttempts:
+        values.update(status=JobStatus.FAILED, finishedAt=now)
+    else:
+        delay = timedelta(seconds=retry_delay(job.attempts))
+        values.update(status=JobStatus.QUEUED, runAt=now + delay)
+    return _update_claimed(session, job, "failure", **values)
+
+
+def requeue_stale(session: Session) -> int:
+    """
+    Requeue running jobs whose lock expired, i.e. whose worker died or
+    stopped reporting progress. The lost run counts as an attempt, so a
+    job out of attempts is marked failed instead.
+    """
+    now = datetime.utcnow()
+    stale = update(Job).where(
+        Job.status == JobStatus.RUNNING,
+        Job.lockedAt
+        < now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS),
+    )
+    cleared = dict(lockedBy=None, lockedAt=None, error="Lock expired", updatedAt=now)
+    session.execute(
+        stale.where(Job.attempts >= Job.maxAttempts).values(
+            status=JobStatus.FAILED, finishedAt=now, **cleared
+        )
+    )
+    result = session.execute(
+        stale.where(Job.attempts < Job.maxAttempts).values(
+            status=JobStatus.QUEUED, **cleared
+        )
+    )
+    session.commit()
+    if result.rowcount:
+        logger.warning("Requeued %d jobs with expired locks", result.rowcount)
+    return result.rowcount
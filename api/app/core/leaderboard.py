@@ -0,0 +1,80 @@
+"""In-process cache of group leaderboards with per-member invalidation."""
+
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Optional
+from .invalidation import GROUP, USER_DATA, invalidation_bus
+
+
+class LeaderboardCache:
+    """
+    Caches each group's computed leaderboard for the current day.
+
+    Keeps a reverse index from member to groups so a log write only evicts
+    the leaderboards of the groups its author belongs to.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self._ttl = ttl_seconds
+        self._entries: dict[int, tuple[date, float, datetime, list[Any]]] = {}
+        self._groups_by_user: dict[int, set[int]] = defaultdict(set)
+        self._members: dict[int, list[int]] = {}
+
+    def get(
+        self, group_id: int, today: date
+    ) -> Optional[tuple[datetime, list[Any]]]:
+        """Return (computedAt, rows) for the group if still fresh."""
+        entry = self._entries.get(group_id)
+        if entry is None:
+            return None
+        day, stored_at, computed_at, rows = entry
+        if day != today or time.monotonic() - stored_at > self._ttl:
+            self._evict(group_id)
+            return None
+        return computed_at, rows
+
+    def set(
+        self,
+        group_id: int,
+        today: date,
+        computed_at: datetime,
+        rows: list[Any],
+        member_ids: list[int],
+    ) -> None:
+        """Store a freshly computed leaderboard and index its members."""
+        self._evict(group_id)
+        self._entries[group_id] = (today, time.monotonic(), computed_at, rows)
+        self._members[group_id] = list(member_ids)
+        for user_id in member_ids:
+            self._groups_by_user[user_id].add(group_id)
+
+    def _evict(self, group_id: int) -> None:
+        """Drop a group's entry and its members from the reverse index."""
+        self._entries.pop(group_id, None)
+        for user_id in self._members.pop(group_id, ()):
+            groups = self._groups_by_user.get(user_id)
+            if groups is not None:
+                groups.discard(group_id)
+                if not groups:
+                    del self._groups_by_user[user_id]
+
+    def invalidate_group(self, group_id: int) -> None:
+        """Evict one group's leaderboard, e.g. after a membership change."""
+        self._evict(group_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Evict the leaderboards of every group the user belongs to."""
+        for group_id in list(self._groups_by_user.get(user_id, ())):
+            self._evict(group_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._groups_by_user.clear()
+        self._members.clear()
+
+
+leaderboard_cache = LeaderboardCache()
+invalidation_bus.subscribe(USER_DATA, leaderboard_cache.invalidate_user)
+invalidation_bus.subscribe(GROUP, leaderboard_cache.invalidate_group)
+invalidation_bus.on_resync(leaderboard_cache.clear)
@@ -0,0 +1,137 @@
+"""Postgres LISTEN/NOTIFY listener shared by all in-process subscribers."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Optional
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import text
+from sqlmodel import Session
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before reconnecting after the listen connection drops
+RECONNECT_DELAY = 5.0
+
+
+class PgListener:
+    """
+    Holds one dedicated connection per worker that LISTENs on every registered
+    channel and dispatches NOTIFY payloads to handlers on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._reconnect_handlers: list[Callable[[], None]] = []
+        self._conn: Optional[psycopg2.extensions.connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    def add_handler(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Register a handler called with the payload of each NOTIFY on channel."""
+        self._handlers[channel].append(handler)
+
+    def add_reconnect_handler(self, handler: Callable[[], None]) -> None:
+        """
+        Register a handler called after the connection is re-established,
+        since any NOTIFY sent while it was down is lost.
+        """
+        self._reconnect_handlers.append(handler)
+
+    async def start(self) -> None:
+        """Open the listen connection; retries in the background on failure."""
+        self._running = True
+        try:
+            await self._connect()
+        except psycopg2.Error:
+            logger.exception("Could not start Postgres listener, retrying")
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        self._running = False
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close()
+
+    async def _connect(self) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        conn = await asyncio.to_thread(psycopg2.connect, dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in self._handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        self._conn = conn
+        asyncio.get_running_loop().add_reader(conn.fileno(), self._on_readable)
+
+    def _close(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+        except (ValueError, OSError):
+            pass
+        try:
+            self._conn.close()
+        except psycopg2.Error:
+            pass
+        self._conn = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except psycopg2.Error:
+            logger.exception("Postgres listener connection lost, reconnecting")
+            self._close()
+            self._schedule_reconnect()
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            for handler in self._handlers.get(notify.channel, []):
+                try:
+                    handler(notify.payload)
+                except Exception:
+                    logger.exception("Handler failed for channel %s", notify.channel)
+
+    def _schedule_reconnect(self) -> None:
+        if self._running and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while self._running:
+            await asyncio.sleep(RECONNECT_DELAY)
+            try:
+                await self._connect()
+            except psycopg2.Error:
+                logger.warning("Postgres listener reconnect failed, retrying")
+                continue
+            for handler in self._reconnect_handlers:
+                try:
+                    handler()
+                except Exception:
+                    logger.exception("Reconnect handler failed")
+            break
+        self._reconnect_task = None
+
+
+pg_listener = PgListener()
+
+
+def notify_many(session: Session, notifications: list[tuple[str, str]]) -> None:
+    """
+    Queue (channel, payload) notifications in one round trip; like any
+    NOTIFY they are delivered when the transaction commits.
+    """
+    if not notifications:
+        return
+    channels, payloads = zip(*notifications)
+    session.execute(
+        text("SELECT pg_notify(c, p) FROM unnest(:channels, :payloads) AS n(c, p)"),
+        {"channels": list(channels), "payloads": list(payloads)},
+    )
@@ -0,0 +1,206 @@
+"""Group commit of daily log upserts from concurrent requests."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlmodel import Session, func
+from app.models import AsceticismLog
+from .config import settings
+from .database import engine
+from .events import EVENTS_CHANNEL, event_payload
+from .invalidation import INVALIDATION_CHANNEL, USER_DATA, invalidation_payload
+from .listener import notify_many
+from .popularity import record_logs
+
+logger = logging.getLogger(__name__)
+
+LogKey = tuple[int, datetime]
+
+
+@dataclass
+class PendingLog:
+    """A log upsert waiting for the next group commit."""
+
+    userId: int
+    row: dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+    @property
+    def key(self) -> LogKey:
+        return self.row["userAsceticismId"], self.row["date"]
+
+
+def merge_rows(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Apply a later upsert of the same day on top of an earlier one."""
+    merged = dict(old)
+    merged["completed"] = new["completed"]
+    for column in ("value", "notes", "custom_metadata"):
+        if new[column] is not None:
+            merged[column] = new[column]
+    return merged
+
+
+def upsert_logs(rows: list[dict[str, Any]]) -> Insert:
+    """
+    INSERT ... ON CONFLICT of log rows (at most one per commitment and day)
+    that applies each to an existing log like `merge_rows`. Returns every
+    column of the saved rows plus `inserted`, false for updated ones.
+    """
+    now = datetime.utcnow()
+    table = AsceticismLog.__table__
+    statement = insert(AsceticismLog).values(
+        [{**row, "createdAt": now, "updatedAt": now} for row in rows]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["userAsceticismId", "date"],
+        set_={
+            "completed": statement.excluded.completed,
+            "value": func.coalesce(statement.excluded.value, table.c.value),
+            "notes": func.coalesce(statement.excluded.notes, table.c.notes),
+            "custom_metadata": func.coalesce(
+                statement.excluded.custom_metadata, table.c.custom_metadata
+            ),
+            "updatedAt": statement.excluded.updatedAt,
+        },
+    ).returning(*table.c, literal_column("xmax = 0").label("inserted"))
+
+
+class LogGroupCommitter:
+    """
+    Collects log upserts from concurrent requests and writes each batch as
+    one multi-row INSERT ... ON CONFLICT in a single transaction, so a burst
+    of check-ins shares one commit instead of paying one each.
+
+    A batch is flushed `max_delay_ms` after its first upsert arrives or once
+    it holds `max_batch` upserts. Callers get their saved row only after the
+    batch commits. If a batch fails, its upserts are retried one by one so
+    only the failing ones raise.
+    """
+
+    def __init__(self, max_batch: int, max_delay_ms: float) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.running = False
+        self._queue: asyncio.Queue[Optional[PendingLog]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting upserts and flush the ones already queued."""
+        if not self.running:
+            return
+        self.running = False
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, user_id: int, row: dict[str, Any]) -> dict[str, Any]:
+        """
+        Queue an upsert of a day's log and wait until it is committed.
+        `row` holds userAsceticismId, date, completed, value, notes and
+        custom_metadata; None value/notes/custom_metadata keep stored ones.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(PendingLog(user_id, row, future))
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            if self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+            batch = [first]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[PendingLog]) -> None:
+        try:
+            saved = await asyncio.to_thread(self._write, batch)
+        except Exception as exc:
+            if len(batch) == 1:
+                self._resolve(batch, exc)
+                return
+            logger.warning("Log group commit of %d failed, retrying singly", len(batch))
+            for pending in batch:
+                await self._flush([pending])
+            return
+        self._resolve(batch, saved)
+
+    @staticmethod
+    def _resolve(batch: list[PendingLog], outcome: Any) -> None:
+        for pending in batch:
+            if pending.future.done():
+                continue
+            if isinstance(outcome, Exception):
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(outcome[pending.key])
+
+    @staticmethod
+    def _write(batch: list[PendingLog]) -> dict[LogKey, dict[str, Any]]:
+        # One statement cannot touch a row twice, so merge repeats of a day
+        rows: dict[LogKey, dict[str, Any]] = {}
+        owners: dict[LogKey, int] = {}
+        for pending in batch:
+            key = pending.key
+            rows[key] = merge_rows(rows[key], pending.row) if key in rows else pending.row
+            owners[key] = pending.userId
+
+        statement = upsert_logs(list(rows.values()))
+
+        with Session(engine) as session:
+            saved = {}
+            inserted = []
+            for result in session.execute(statement).mappings():
+                log = dict(result)
+                key = (log["userAsceticismId"], log["date"])
+                if log.pop("inserted"):
+                    inserted.append(key)
+                saved[key] = log
+            record_logs(session, inserted)
+
+            notifications = [
+                (
+                    EVENTS_CHANNEL,
+                    event_payload(
+                        owners[key],
+                        "log.saved",
+                        {
+                            "id": log["id"],
+                            "userAsceticismId": log["userAsceticismId"],
+                            "date": log["date"],
+                            "completed": log["completed"],
+                            "value": log["value"],
+                        },
+                    ),
+                )
+                for key, log in saved.items()
+            ]
+            notifications += [
+                (INVALIDATION_CHANNEL, invalidation_payload(USER_DATA, user_id))
+                for user_id in set(owners.values())
+            ]
+            notify_many(session, notifications)
+            session.commit()
+        return saved
+
+
+log_committer = LogGroupCommitter(
+    max_batch=settings.LOG_GROUP_COMMIT_MAX_BATCH,
+    max_delay_ms=settings.LOG_GROUP_COMMIT_MAX_DELAY_MS,
+)
@@ -0,0 +1,213 @@
+"""Micro-cache with request coalescing for hot anonymous GET endpoints."""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .config import settings
+from .invalidation import CATALOG, invalidation_bus
+
+# Public endpoints whose responses are identical for every anonymous caller
+CACHEABLE_PATHS = re.compile(
+    r"^/(?:asceticisms/(?:\d+/similar)?|packages/browse|packages/\d+"
+    r"|daily-readings/readings/\d{8})$"
+)
+
+MicroCacheKey = tuple[str, bytes, bool]
+
+
+@dataclass
+class CachedResponse:
+    """A captured response: start message headers and the full body."""
+
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: Optional[str] = None
+    expires_at: float = 0.0
+
+
+def is_cacheable(scope: Scope) -> bool:
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return False
+    if not CACHEABLE_PATHS.match(scope["path"]):
+        return False
+    return "authorization" not in Headers(scope=scope)
+
+
+def micro_cache_key(scope: Scope) -> MicroCacheKey:
+    """Path, query and whether gzip is accepted (readings vary on it)."""
+    accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+    query = b"&".join(sorted(scope["query_string"].split(b"&")))
+    return scope["path"], query, "gzip" in accept_encoding.lower()
+
+
+class MicroCache:
+    """
+    Per-worker cache of whole responses for a few seconds. Concurrent
+    misses for the same key are coalesced: one request runs the handler
+    and the others wait for its response. Only 200s are stored, but a
+    coalesced caller gets whatever the leader got.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[MicroCacheKey, CachedResponse] = OrderedDict()
+        self.in_flight: dict[MicroCacheKey, asyncio.Future] = {}
+
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get(self, key: MicroCacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: MicroCacheKey, response: CachedResponse) -> None:
+        response.expires_at = time.monotonic() + self.ttl
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        self.stored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Counters, for metrics."""
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "stored": self.stored,
+            "hitRatio": round((self.hits + self.coalesced) / lookups, 4)
+            if lookups
+            else 0.0,
+        }
+
+
+micro_cache = MicroCache(
+    ttl=settings.MICRO_CACHE_TTL_SECONDS, max_entries=settings.MICRO_CACHE_MAX_ENTRIES
+)
+# Catalog listings are among the cached responses; drop them on any change
+invalidation_bus.subscribe(CATALOG, lambda key: micro_cache.clear())
+
+
+class MicroCacheMiddleware:
+    """Serves cacheable anonymous GETs from the micro-cache."""
+
+    def __init__(self, app: ASGIApp, cache: MicroCache = micro_cache) -> None:
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not is_cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = micro_cache_key(scope)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.hits += 1
+            await self._replay(scope, cached, send)
+            return
+
+        in_flight = self.cache.in_flight.get(key)
+        if in_flight is not None:
+            self.cache.coalesced += 1
+            try:
+                response = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leader failed; handle this request on its own
+                await self.app(scope, receive, send)
+                return
+            await self._replay(scope, response, send)
+            return
+
+        self.cache.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.cache.in_flight[key] = future
+        try:
+            response = await self._capture(scope, receive)
+        except BaseException:
+            # Waiters see the cancelled future and run the handler themselves
+            future.cancel()
+            raise
+        finally:
+            del self.cache.in_flight[key]
+        if response.status == 200 and not any(
+            name == b"set-cookie" for name, _ in response.headers
+        ):
+            self.cache.set(key, response)
+        future.set_result(response)
+        await self._replay(scope, response, send)
+
+    async def _capture(self, scope: Scope, receive: Receive) -> CachedResponse:
+        start: dict[str, Any] = {}
+        chunks: list[bytes] = []
+        # Always render the full response; conditionals are applied on replay
+        scope = {
+            **scope,
+            "headers": [
+                (name, value)
+                for name, value in scope["headers"]
+                if name != b"if-none-match"
+            ],
+        }
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        headers = list(start.get("headers", []))
+        etag = next(
+            (value.decode() for name, value in headers if name.lower() == b"etag"),
+            None,
+        )
+        return CachedResponse(
+            status=start["status"], headers=headers, body=b"".join(chunks), etag=etag
+        )
+
+    @staticmethod
+    async def _replay(scope: Scope, response: CachedResponse, send: Send) -> None:
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if response.etag and if_none_match and response.etag in if_none_match:
+            headers = [
+                (name, value)
+                for name, value in response.headers
+                if name.lower() in (b"etag", b"vary", b"cache-control")
+            ]
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": response.headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,250 @@
+"""Popularity counters of asceticisms and packages."""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Union
+from sqlalchemy import Select, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, func
+from app.models import (
+    Asceticism,
+    AsceticismLog,
+    AsceticismPackage,
+    AsceticismStats,
+    AsceticismStatus,
+    PackageStats,
+    UserAsceticism,
+)
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Value of the listings' `sort` parameter ordering by popularity
+SORT_POPULAR = "popular"
+
+StatsModel = Union[type[AsceticismStats], type[PackageStats]]
+
+# (has any commitment from the package, has an ACTIVE one)
+Membership = tuple[bool, bool]
+
+
+def recent_logs_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(days=settings.POPULARITY_RECENT_DAYS)
+
+
+def _bump(
+    session: Session,
+    model: StatsModel,
+    key: str,
+    key_value: int,
+    **deltas: int,
+) -> None:
+    """Add deltas to a row's counters, creating it if needed; never below 0."""
+    now = datetime.utcnow()
+    statement = pg_insert(model).values(
+        {key: key_value, "updatedAt": now}
+        | {name: max(delta, 0) for name, delta in deltas.items()}
+    )
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[key],
+            set_={"updatedAt": now}
+            | {
+                name: func.greatest(getattr(model, name) + delta, 0)
+                for name, delta in deltas.items()
+            },
+        )
+    )
+
+
+def bump_asceticism(session: Session, asceticism_id: int, **deltas: int) -> None:
+    _bump(session, AsceticismStats, "asceticismId", asceticism_id, **deltas)
+
+
+def bump_package(session: Session, package_id: int, **deltas: int) -> None:
+    _bump(session, PackageStats, "packageId", package_id, **deltas)
+
+
+def record_commitment(
+    session: Session,
+    asceticism_id: int,
+    old_status: Optional[AsceticismStatus],
+    new_status: AsceticismStatus,
+) -> None:
+    """Count a new commitment (`old_status` None) or a change of status."""
+    active = int(new_status == AsceticismStatus.ACTIVE)
+    active -= int(old_status == AsceticismStatus.ACTIVE)
+    joins = int(old_status is None)
+    if active or joins:
+        bump_asceticism(session, asceticism_id, activeUsers=active, totalJoins=joins)
+
+
+def package_memberships(
+    session: Session, user_id: int, package_ids: Iterable[Optional[int]]
+) -> dict[int, Membership]:
+    """A user's membership of each of the packages."""
+    ids = {package_id for package_id in package_ids if package_id is not None}
+    if not ids:
+        return {}
+    rows = session.exec(
+        select(
+            UserAsceticism.packageId,
+            func.bool_or(UserAsceticism.status == AsceticismStatus.ACTIVE),
+        )
+        .where(UserAsceticism.userId == user_id, UserAsceticism.packageId.in_(ids))
+        .group_by(UserAsceticism.packageId)
+    ).all()
+    active = dict(rows)
+    return {
+        package_id: (package_id in active, bool(active.get(package_id)))
+        for package_id in ids
+    }
+
+
+def record_package_memberships(
+    session: Session, user_id: int, before: dict[int, Membership]
+) -> None:
+    """
+    Count changes to a user's package memberships, given as read by
+    `package_memberships` before changing their commitments.
+    """
+    session.flush()
+    after = package_memberships(session, user_id, before)
+    for package_id in sorted(before):
+        was_joined, was_active = before[package_id]
+        joined, active = after[package_id]
+        if (joined, active) != (was_joined, was_active):
+            bump_package(
+                session,
+                package_id,
+                activeUsers=active - was_active,
+                totalJoins=joined - was_joined,
+            )
+
+
+def record_logs(session: Session, logs: Iterable[tuple[int, datetime]]) -> None:
+    """
+    Count new logs, given as (commitment id, naive UTC date), that are dated
+    in the recent window.
+    """
+    cutoff = recent_logs_cutoff()
+    counts = Counter(
+        user_asceticism_id for user_asceticism_id, day in logs if day >= cutoff
+    )
+    if not counts:
+        return
+    rows = session.exec(
+        select(
+            UserAsceticism.id, UserAsceticism.asceticismId, UserAsceticism.packageId
+        ).where(UserAsceticism.id.in_(list(counts)))
+    ).all()
+    per_asceticism: Counter[int] = Counter()
+    per_package: Counter[int] = Counter()
+    for user_asceticism_id, asceticism_id, package_id in rows:
+        per_asceticism[asceticism_id] += counts[user_asceticism_id]
+        if package_id is not None:
+            per_package[package_id] += counts[user_asceticism_id]
+    # In key order, so concurrent batches lock rows in the same order
+    for asceticism_id in sorted(per_asceticism):
+        bump_asceticism(
+            session, asceticism_id, recentLogs=per_asceticism[asceticism_id]
+        )
+    for package_id in sorted(per_package):
+        bump_package(session, package_id, recentLogs=per_package[package_id])
+
+
+def _upsert_counters(
+    session: Session, model: StatsModel, key: str, source: Select
+) -> int:
+    """Overwrite counters with (key, counters..., updatedAt) rows of `source`."""
+    columns = [key, "activeUsers", "totalJoins", "recentLogs", "updatedAt"]
+    statement = pg_insert(model).from_select(columns, source)
+    result = session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[key],
+            set_={name: statement.excluded[name] for name in columns[1:]},
+        )
+    )
+    return result.rowcount
+
+
+def reconcile(session: Session) -> dict[str, int]:
+    """
+    Recompute every counter from the source tables and commit. This also
+    drops logs that have aged out of the recent window and corrects drift,
+    e.g. from commitments removed with their user or from increments that
+    raced with a previous reconciliation.
+    """
+    now = datetime.utcnow()
+    cutoff = recent_logs_cutoff()
+    active = UserAsceticism.status == AsceticismStatus.ACTIVE
+
+    commitments = (
+        select(
+            UserAsceticism.asceticismId.label("id"),
+            func.count().filter(active).label("activeUsers"),
+            func.count().label("totalJoins"),
+        )
+        .group_by(UserAsceticism.asceticismId)
+        .subquery()
+    )
+    logs = (
+        select(UserAsceticism.asceticismId.label("id"), func.count().label("logs"))
+        .join(AsceticismLog, AsceticismLog.userAsceticismId == UserAsceticism.id)
+        .where(AsceticismLog.date >= cutoff)
+        .group_by(UserAsceticism.asceticismId)
+        .subquery()
+    )
+    asceticisms = _upsert_counters(
+        session,
+        AsceticismStats,
+        "asceticismId",
+        select(
+            Asceticism.id,
+            func.coalesce(commitments.c.activeUsers, 0),
+            func.coalesce(commitments.c.totalJoins, 0),
+            func.coalesce(logs.c.logs, 0),
+            literal(now),
+        )
+        .outerjoin(commitments, commitments.c.id == Asceticism.id)
+        .outerjoin(logs, logs.c.id == Asceticism.id),
+    )
+
+    members = (
+        select(
+            UserAsceticism.packageId.label("id"),
+            func.count(func.distinct(UserAsceticism.userId))
+            .filter(active)
+            .label("activeUsers"),
+            func.count(func.distinct(UserAsceticism.userId)).label("totalJoins"),
+        )
+        .where(UserAsceticism.packageId != None)
+        .group_by(UserAsceticism.packageId)
+        .subquery()
+    )
+    package_logs = (
+        select(UserAsceticism.packageId.label("id"), func.count().label("logs"))
+        .join(AsceticismLog, AsceticismLog.userAsceticismId == UserAsceticism.id)
+        .where(UserAsceticism.packageId != None, AsceticismLog.date >= cutoff)
+        .group_by(UserAsceticism.packageId)
+        .subquery()
+    )
+    packages = _upsert_counters(
+        session,
+        PackageStats,
+        "packageId",
+        select(
+            AsceticismPackage.id,
+            func.coalesce(members.c.activeUsers, 0),
+            func.coalesce(members.c.totalJoins, 0),
+            func.coalesce(package_logs.c.logs, 0),
+            literal(now),
+        )
+        .outerjoin(members, members.c.id == AsceticismPackage.id)
+        .outerjoin(package_logs, package_logs.c.id == AsceticismPackage.id),
+    )
+
+    session.commit()
+    logger.info("Reconciled %d asceticisms and %d packages", asceticisms, packages)
+    return {"asceticisms": asceticisms, "packages": packages}
@@ -0,0 +1,196 @@
+"""Cached Universalis Mass readings and their search index."""
+
+import asyncio
+import gzip
+import hashlib
+import html
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+from app.models import MassReading
+from .cache import Cache
+from .config import settings
+from .database import engine
+from .invalidation import READINGS, invalidation_bus, publish_invalidation
+from .universalis import fetch_readings
+
+logger = logging.getLogger(__name__)
+
+# Keys of the readings proper in a Universalis payload, in Mass order
+READING_KEYS = ("Mass_R1", "Mass_Ps", "Mass_R2", "Mass_GA", "Mass_G")
+
+TAG_RE = re.compile(r"<[^>]+>")
+SPACE_RE = re.compile(r"\s+")
+# "John 15:1-8", "1 Corinthians 1:3-9", "Psalm 121(122):1-5", "Song of Songs 2"
+REFERENCE_RE = re.compile(
+    r"^\s*(?P<book>(?:[1-3]\s*)?[A-Za-z][A-Za-z. ]*?)\s*"
+    r"(?P<chapter>\d+)(?:\s*\((?P<alt>\d+)\))?"
+)
+# Continuation after a semicolon in the same book: "Isaiah 7:10-14; 8:10"
+CHAPTER_RE = re.compile(r"^\s*(?P<chapter>\d+)(?:\s*\((?P<alt>\d+)\))?\s*:")
+
+
+def normalize_book(book: str) -> str:
+    """Normalize a book name for reference keys ("Psalms" -> "psalm")."""
+    book = SPACE_RE.sub(" ", book.replace(".", " ")).strip().lower()
+    book = re.sub(r"^([1-3])\s*", r"\1 ", book)
+    if book == "psalms":
+        book = "psalm"
+    return book
+
+
+def reference_keys(source: str) -> list[str]:
+    """
+    Normalized "book chapter" keys for a reading source, e.g.
+    "John 15:1-8" -> ["john 15"]. Psalms list both numberings.
+    """
+    keys: list[str] = []
+    book: Optional[str] = None
+    for part in source.split(";"):
+        match = REFERENCE_RE.match(part)
+        if match:
+            book = normalize_book(match.group("book"))
+        else:
+            match = CHAPTER_RE.match(part)
+            if not match or book is None:
+                continue
+        for chapter in (match.group("chapter"), match.group("alt")):
+            if chapter and f"{book} {chapter}" not in keys:
+                keys.append(f"{book} {chapter}")
+    return keys
+
+
+def parse_reference_query(q: str) -> Optional[str]:
+    """Reference key for a query that names a chapter ("John 15"), else None."""
+    match = REFERENCE_RE.fullmatch(q.strip())
+    if not match:
+        return None
+    return f"{normalize_book(match.group('book'))} {match.group('chapter')}"
+
+
+def plain_text(value: str) -> str:
+    """Strip markup and entities from Universalis reading text."""
+    return SPACE_RE.sub(" ", html.unescape(TAG_RE.sub(" ", value))).strip()
+
+
+def extract_reading_index(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Pull reading references and text out of a Universalis payload into the
+    MassReading index columns.
+    """
+    sources: list[str] = []
+    keys: list[str] = []
+    texts: list[str] = []
+    for name in READING_KEYS:
+        reading = data.get(name)
+        if not isinstance(reading, dict):
+            continue
+        source = plain_text(reading.get("source") or "")
+        if source:
+            sources.append(source)
+            keys.extend(k for k in reference_keys(source) if k not in keys)
+        for field in ("heading", "text"):
+            if reading.get(field):
+                texts.append(plain_text(reading[field]))
+    return {
+        "sources": "; ".join(sources) or None,
+        "referenceKeys": keys,
+        "readingText": "\n".join(texts) or None,
+    }
+
+
+def encode_payload(data: dict[str, Any]) -> tuple[bytes, str]:
+    """
+    Serialize readings once for storage: gzip-compressed compact JSON and
+    the SHA-256 hex digest of the uncompressed JSON (used as the ETag).
+    """
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+    return gzip.compress(raw, mtime=0), hashlib.sha256(raw).hexdigest()
+
+
+def decode_payload(payload: bytes) -> dict[str, Any]:
+    """Parse a stored readings payload back into a dict."""
+    return json.loads(gzip.decompress(payload))
+
+
+def cache_readings(
+    session: Session, readings: dict[datetime, dict[str, Any]], replace: bool = False
+) -> dict[datetime, tuple[bytes, str]]:
+    """
+    Store fetched readings with their search index in one statement and
+    return each date's (payload, contentHash). Dates cached concurrently by
+    another request are left as they are, unless `replace` is set
+    (revalidation).
+    """
+    if not readings:
+        return {}
+    now = datetime.utcnow()
+    encoded = {
+        reading_date: encode_payload(data) for reading_date, data in readings.items()
+    }
+    rows = [
+        {
+            "date": reading_date,
+            "payload": encoded[reading_date][0],
+            "contentHash": encoded[reading_date][1],
+            "createdAt": now,
+            "updatedAt": now,
+            **extract_reading_index(data),
+        }
+        for reading_date, data in readings.items()
+    ]
+    statement = insert(MassReading).values(rows)
+    if replace:
+        statement = statement.on_conflict_do_update(
+            index_elements=["date"],
+            set_={
+                column: statement.excluded[column]
+                for column in rows[0]
+                if column not in ("date", "createdAt")
+            },
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=["date"])
+    session.execute(statement)
+    session.commit()
+    return encoded
+
+
+def is_stale(updated_at: datetime) -> bool:
+    """Whether a cached reading is due for revalidation against upstream."""
+    age = datetime.utcnow() - updated_at.replace(tzinfo=None)
+    return age > timedelta(hours=settings.READINGS_STALE_AFTER_HOURS)
+
+
+# Stored readings by YYYYMMDD date: (payload, contentHash, updatedAt)
+readings_cache = Cache("readings", ttl=settings.READINGS_CACHE_TTL_SECONDS)
+invalidation_bus.subscribe(READINGS, readings_cache.delete)
+
+# Revalidations in flight in this worker, by YYYYMMDD date
+_revalidating: dict[str, asyncio.Task] = {}
+
+
+def schedule_revalidation(reading_date: datetime) -> None:
+    """Refresh a stale cached reading in the background, once per date."""
+    date = reading_date.strftime("%Y%m%d")
+    if date not in _revalidating:
+        task = asyncio.create_task(_revalidate(reading_date, date))
+        _revalidating[date] = task
+        task.add_done_callback(lambda _: _revalidating.pop(date, None))
+
+
+async def _revalidate(reading_date: datetime, date: str) -> None:
+    try:
+        data = await fetch_readings(date)
+    except Exception as exc:
+        # Keep serving the stale copy; the next request retries
+        logger.info("Revalidating readings for %s failed: %s", date, exc)
+        return
+    with Session(engine) as session:
+        publish_invalidation(session, READINGS, date)
+        cache_readings(session, {reading_date: data}, replace=True)
+    readings_cache.delete(date)
@@ -0,0 +1,316 @@
+"""Reminder dispatch driven by UserAsceticism.reminderTime."""
+
+import asyncio
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlmodel import Session, select
+from app.models import Asceticism, AsceticismLog, AsceticismStatus, UserAsceticism
+from .config import settings
+from .database import engine
+from .invalidation import USER_DATA, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass
+class Reminder:
+    """A reminder for one active commitment."""
+
+    userAsceticismId: int
+    userId: int
+    asceticismId: int
+    title: Optional[str]
+    endDate: Optional[datetime]
+
+
+class TimingWheel:
+    """Active reminders bucketed by minute of day (UTC)."""
+
+    def __init__(self) -> None:
+        self._buckets: list[dict[int, Reminder]] = [
+            {} for _ in range(MINUTES_PER_DAY)
+        ]
+        self._minute_by_id: dict[int, int] = {}
+        self._ids_by_user: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._minute_by_id)
+
+    def add(self, reminder: Reminder, minute: int) -> None:
+        """Place a reminder in its minute bucket, moving it if already present."""
+        self.remove(reminder.userAsceticismId)
+        self._buckets[minute][reminder.userAsceticismId] = reminder
+        self._minute_by_id[reminder.userAsceticismId] = minute
+        self._ids_by_user.setdefault(reminder.userId, set()).add(
+            reminder.userAsceticismId
+        )
+
+    def remove(self, user_asceticism_id: int) -> None:
+        """Drop a commitment's reminder if it has one."""
+        minute = self._minute_by_id.pop(user_asceticism_id, None)
+        if minute is None:
+            return
+        reminder = self._buckets[minute].pop(user_asceticism_id)
+        ids = self._ids_by_user[reminder.userId]
+        ids.discard(user_asceticism_id)
+        if not ids:
+            del self._ids_by_user[reminder.userId]
+
+    def remove_user(self, user_id: int) -> None:
+        """Drop all of a user's reminders."""
+        for user_asceticism_id in list(self._ids_by_user.get(user_id, ())):
+            self.remove(user_asceticism_id)
+
+    def due(self, minute: int) -> list[Reminder]:
+        """All reminders scheduled for a minute of the day."""
+        return list(self._buckets[minute].values())
+
+    def clear(self) -> None:
+        for bucket in self._buckets:
+            bucket.clear()
+        self._minute_by_id.clear()
+        self._ids_by_user.clear()
+
+
+def minute_of_day(value: datetime) -> int:
+    """Minute of the day of a reminder time."""
+    return value.hour * 60 + value.minute
+
+
+class Notifier(ABC):
+    """Delivers a batch of due reminders."""
+
+    @abstractmethod
+    async def send(self, reminders: list[Reminder]) -> None:
+        """Deliver the reminders."""
+
+
+class StdoutNotifier(Notifier):
+    """Writes each reminder as a JSON line to stdout."""
+
+    async def send(self, reminders: list[Reminder]) -> None:
+        for reminder in reminders:
+            sys.stdout.write(json.dumps(asdict(reminder), default=str) + "\n")
+        sys.stdout.flush()
+
+
+class FileNotifier(Notifier):
+    """Appends each reminder as a JSON line to a local file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def send(self, reminders: list[Reminder]) -> None:
+        lines = "".join(json.dumps(asdict(r), default=str) + "\n" for r in reminders)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def create_notifier(spec: str) -> Notifier:
+    """Build a notifier from a setting: "stdout" or "file:<path>"."""
+    if spec == "stdout":
+        return StdoutNotifier()
+    if spec.startswith("file:"):
+        return FileNotifier(spec[len("file:") :])
+    raise ValueError(f"Unknown reminder notifier: {spec}")
+
+
+class ReminderDispatcher:
+    """
+    Sends each active commitment's reminder at its minute of the day.
+
+    The wheel is rebuilt from an indexed query at startup and periodically.
+    In between, every worker's commitment changes reach it as USER_DATA
+    invalidations, and the users they name have their reminders reloaded,
+    coalesced into one query per round. Each minute only that minute's
+    bucket is read; commitments already logged today are skipped with one
+    indexed query per batch.
+    """
+
+    def __init__(self, notifier: Notifier, batch_size: int) -> None:
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.wheel = TimingWheel()
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self._pending_users: set[int] = set()
+        self._reload_task: Optional[asyncio.Task] = None
+        # Users changed while a rebuild runs, reloaded again after it
+        self._changed_during_rebuild: Optional[set[int]] = None
+
+    async def start(self) -> None:
+        """Build the wheel and start the per-minute dispatch loop."""
+        self.running = True
+        await self.rebuild()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.running = False
+        for task in (self._task, self._reload_task):
+            if task:
+                task.cancel()
+        self._task = None
+        self._reload_task = None
+
+    async def rebuild(self) -> None:
+        """
+        Reload every active reminder from the database. The query may have
+        read users whose commitments changed while it ran before the change,
+        so those users are reloaded once the new wheel is in place.
+        """
+        self._changed_during_rebuild = set()
+        try:
+            wheel = TimingWheel()
+            for reminder, minute in await asyncio.to_thread(self._load, None):
+                wheel.add(reminder, minute)
+        finally:
+            changed = self._changed_during_rebuild
+            self._changed_during_rebuild = None
+        self.wheel = wheel
+        logger.info("Reminder wheel rebuilt with %d reminders", len(wheel))
+        for user_id in changed:
+            self.user_changed(user_id)
+
+    def user_changed(self, user_id: int) -> None:
+        """Queue a reload of a user's reminders after their commitments changed."""
+        if not self.running:
+            return
+        if self._changed_during_rebuild is not None:
+            self._changed_during_rebuild.add(user_id)
+        self._pending_users.add(user_id)
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_pending())
+
+    def resync(self) -> None:
+        """Rebuild the wheel after invalidations may have been missed."""
+        if self.running and self._changed_during_rebuild is None:
+            asyncio.create_task(self.rebuild())
+
+    async def _reload_pending(self) -> None:
+        # One reload at a time, so results are applied in the order read;
+        # users changed during a round are reloaded in the next one
+        try:
+            while self._pending_users:
+                users, self._pending_users = self._pending_users, set()
+                try:
+                    loaded = await asyncio.to_thread(self._load, users)
+                except Exception:
+                    logger.exception("Reminder reload failed for %d users", len(users))
+                    continue
+                for user_id in users:
+                    self.wheel.remove_user(user_id)
+                for reminder, minute in loaded:
+                    self.wheel.add(reminder, minute)
+        finally:
+            self._reload_task = None
+
+    def _load(self, user_ids: Optional[set[int]]) -> list[tuple[Reminder, int]]:
+        """Active reminders of the users (everyone if None), with their minute."""
+        statement = (
+            select(UserAsceticism, Asceticism.title)
+            .join(Asceticism, Asceticism.id == UserAsceticism.asceticismId)
+            .where(
+                UserAsceticism.status == AsceticismStatus.ACTIVE,
+                UserAsceticism.reminderTime != None,
+            )
+        )
+        if user_ids is not None:
+            statement = statement.where(UserAsceticism.userId.in_(user_ids))
+        with Session(engine) as session:
+            return [
+                (
+                    self._to_reminder(user_asceticism, title),
+                    minute_of_day(user_asceticism.reminderTime),
+                )
+                for user_asceticism, title in session.exec(statement)
+            ]
+
+    async def dispatch(self, reminders: list[Reminder], day: date) -> None:
+        """Send due reminders in batches, skipping ones already handled today."""
+        day_start = datetime(day.year, day.month, day.day)
+        for i in range(0, len(reminders), self.batch_size):
+            batch = [
+                r
+                for r in reminders[i : i + self.batch_size]
+                if r.endDate is None or r.endDate.replace(tzinfo=None) >= day_start
+            ]
+            if not batch:
+                continue
+            logged = await asyncio.to_thread(
+                self._logged_on, [r.userAsceticismId for r in batch], day
+            )
+            pending = [r for r in batch if r.userAsceticismId not in logged]
+            if pending:
+                await self.notifier.send(pending)
+
+    def _logged_on(self, user_asceticism_ids: list[int], day: date) -> set[int]:
+        day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        statement = (
+            select(AsceticismLog.userAsceticismId)
+            .where(
+                AsceticismLog.userAsceticismId.in_(user_asceticism_ids),
+                AsceticismLog.date >= day_start,
+                AsceticismLog.date < day_start + timedelta(days=1),
+            )
+            .distinct()
+        )
+        with Session(engine) as session:
+            return set(session.exec(statement).all())
+
+    async def _run(self) -> None:
+        last = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        minutes_since_rebuild = 0
+        while self.running:
+            next_minute = last + timedelta(minutes=1)
+            delay = (next_minute - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Catch up on any minutes missed while the loop was busy
+            now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            tick = next_minute
+            while tick <= now:
+                try:
+                    await self.dispatch(self.wheel.due(minute_of_day(tick)), tick.date())
+                except Exception:
+                    logger.exception("Reminder dispatch failed for %s", tick)
+                tick += timedelta(minutes=1)
+                minutes_since_rebuild += 1
+            last = now
+
+            if minutes_since_rebuild >= settings.REMINDER_REBUILD_MINUTES:
+                minutes_since_rebuild = 0
+                try:
+                    await self.rebuild()
+                except Exception:
+                    logger.exception("Reminder wheel rebuild failed")
+
+    @staticmethod
+    def _to_reminder(
+        user_asceticism: UserAsceticism, title: Optional[str]
+    ) -> Reminder:
+        return Reminder(
+            userAsceticismId=user_asceticism.id,
+            userId=user_asceticism.userId,
+            asceticismId=user_asceticism.asceticismId,
+            title=title,
+            endDate=user_asceticism.endDate,
+        )
+
+
+reminder_dispatcher = ReminderDispatcher(
+    notifier=create_notifier(settings.REMINDER_NOTIFIER),
+    batch_size=settings.REMINDER_BATCH_SIZE,
+)
+invalidation_bus.subscribe(USER_DATA, reminder_dispatcher.user_changed)
+invalidation_bus.on_resync(reminder_dispatcher.resync)
@@ -0,0 +1,97 @@
+"""In-process cache of serialized per-user dashboard responses."""
+
+from collections import OrderedDict, defaultdict
+from typing import Hashable, Optional
+from fastapi import Request
+from .config import settings
+from .invalidation import CATALOG, USER_DATA, invalidation_bus
+
+CacheKey = tuple[int, str, tuple[tuple[str, str], ...]]
+
+
+class UserResponseCache:
+    """
+    Caches response bodies of per-user read endpoints, keyed by
+    (user, route, query params).
+
+    Each user has a version counter that mutating routes bump; a response
+    computed under an older version is never stored, so a write racing a
+    read cannot leave stale bytes behind. Bumping also drops the user's
+    entries. Memory is bounded by a byte budget with LRU eviction.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._keys_by_user: dict[int, set[CacheKey]] = defaultdict(set)
+        self._versions: dict[int, int] = defaultdict(int)
+        self._epoch = 0
+
+    @staticmethod
+    def key(user_id: int, request: Request) -> CacheKey:
+        """Cache key for a user's view of the current request."""
+        params = tuple(sorted(request.query_params.multi_items()))
+        return (user_id, request.url.path, params)
+
+    def version(self, user_id: int) -> Hashable:
+        """Take before reading from the database; pass to `set`."""
+        return (self._epoch, self._versions[user_id])
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: CacheKey, version: Hashable, body: bytes) -> None:
+        """Store a response unless the user changed data since `version`."""
+        user_id = key[0]
+        if version != self.version(user_id) or len(body) > self._max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = body
+        self._keys_by_user[user_id].add(key)
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def bump(self, user_id: int) -> None:
+        """Invalidate everything cached for a user after they change data."""
+        self._versions[user_id] += 1
+        for key in list(self._keys_by_user.pop(user_id, ())):
+            self._remove(key)
+
+    def bump_all(self) -> None:
+        """Invalidate every user's entries, e.g. after a shared template edit."""
+        self._epoch += 1
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self._size = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        body = self._entries.pop(key, None)
+        if body is None:
+            return
+        self._size -= len(body)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+
+user_response_cache = UserResponseCache(
+    max_bytes=settings.USER_RESPONSE_CACHE_MAX_BYTES
+)
+
+
+def _on_catalog_change(key: str) -> None:
+    # Template details are embedded in every user's responses
+    if key.startswith("asceticism:"):
+        user_response_cache.bump_all()
+
+
+invalidation_bus.subscribe(USER_DATA, user_response_cache.bump)
+invalidation_bus.subscribe(CATALOG, _on_catalog_change)
+invalidation_bus.on_resync(user_response_cache.bump_all)
@@ -0,0 +1,50 @@
+"""Program schedule engine: which program items are due on a given day."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import literal
+from sqlmodel import Session, select, or_
+from app.models import Asceticism, Program, ProgramItem, UserProgram
+
+
+def resolve_due_items(
+    session: Session, day: date, user_id: Optional[int] = None
+) -> list[tuple[UserProgram, ProgramItem, Program, Asceticism]]:
+    """
+    Return (enrollment, item, program, asceticism) for every program item
+    active on `day`, for one user or for all users at once.
+
+    Program day n of an enrollment is `day - startDate + 1`, and an item is
+    active while dayStart <= n <= dayEnd. That is rewritten as a range on
+    UserProgram.startDate per item, so each (small) program item probes the
+    (programId, startDate) index instead of scanning every enrollment.
+    """
+    day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    day_end = day_start + timedelta(days=1)
+    one_day = literal(timedelta(days=1))
+
+    statement = (
+        select(UserProgram, ProgramItem, Program, Asceticism)
+        .join(ProgramItem, ProgramItem.programId == UserProgram.programId)
+        .join(Program, Program.id == UserProgram.programId)
+        .join(Asceticism, Asceticism.id == ProgramItem.asceticismId)
+        .where(
+            # Enrollment has reached dayStart
+            UserProgram.startDate < day_end - one_day * (ProgramItem.dayStart - 1),
+            # ... and has not passed dayEnd
+            or_(
+                ProgramItem.dayEnd == None,
+                UserProgram.startDate >= day_start - one_day * (ProgramItem.dayEnd - 1),
+            ),
+        )
+        .order_by(UserProgram.userId, UserProgram.id, ProgramItem.dayStart)
+    )
+    if user_id is not None:
+        statement = statement.where(UserProgram.userId == user_id)
+
+    return session.exec(statement).all()
+
+
+def program_day(enrollment: UserProgram, day: date) -> int:
+    """1-based program day number of an enrollment on `day`."""
+    return (day - enrollment.startDate.date()).days + 1
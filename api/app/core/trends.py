@@ -0,0 +1,142 @@
+"""Vectorized trends for NUMERIC commitments."""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+import numpy as np
+from sqlalchemy import Date, Integer, cast
+from sqlmodel import Session, select, func
+from app.models import AsceticismLog
+
+# Days of recent logging the projected pace is averaged over
+PACE_DAYS = 28
+
+
+@dataclass
+class DailyValues:
+    """
+    Logged values of several commitments as one (commitments x days) array,
+    NaN where nothing was logged. Column 0 is `start`, the last is `end`.
+    """
+
+    ids: np.ndarray
+    start: date
+    values: np.ndarray
+
+
+def load_daily_values(
+    session: Session, user_asceticism_ids: list[int], start: date, end: date
+) -> DailyValues:
+    """
+    Load the values of the commitments from `start` to `end` in one query.
+    Logs are unique per timestamp, not per day, so a day's values are summed.
+    """
+    ids = np.array(sorted(user_asceticism_ids), dtype=np.int64)
+    days = (end - start).days + 1
+    values = np.full((len(ids), days), np.nan)
+
+    range_start = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    day_offset = cast(cast(AsceticismLog.date, Date) - start, Integer)
+    rows = session.exec(
+        select(
+            AsceticismLog.userAsceticismId,
+            day_offset,
+            func.sum(AsceticismLog.value),
+        )
+        .where(
+            AsceticismLog.userAsceticismId.in_(ids.tolist()),
+            AsceticismLog.value != None,
+            AsceticismLog.date >= range_start,
+            AsceticismLog.date < range_start + timedelta(days=days),
+        )
+        .group_by(AsceticismLog.userAsceticismId, day_offset)
+    ).all()
+    if rows:
+        columns = np.array(rows, dtype=np.float64).T
+        row_index = np.searchsorted(ids, columns[0].astype(np.int64))
+        values[row_index, columns[1].astype(np.int64)] = columns[2]
+    return DailyValues(ids=ids, start=start, values=values)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the logged values in each trailing window, NaN if none."""
+    logged = ~np.isnan(values)
+    sums = np.cumsum(np.where(logged, values, 0.0), axis=1)
+    counts = np.cumsum(logged, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def weekly_totals(values: np.ndarray, start: date) -> tuple[date, np.ndarray]:
+    """Totals per Monday-to-Sunday week; returns the first week's Monday too."""
+    lead = start.weekday()
+    days = values.shape[1]
+    trail = -(lead + days) % 7
+    padded = np.pad(np.nan_to_num(values), ((0, 0), (lead, trail)))
+    totals = padded.reshape(len(values), -1, 7).sum(axis=2)
+    return start - timedelta(days=lead), totals
+
+
+@dataclass
+class Trends:
+    """Trends of the commitments in a DailyValues, one entry per row."""
+
+    total: np.ndarray
+    percent_of_target: np.ndarray  # NaN without a target
+    pace: np.ndarray  # average per day over the recent PACE_DAYS
+    days_to_target: np.ndarray  # from today; NaN if reached or no recent pace
+    reached_on: np.ndarray  # day index the target was reached, -1 if not
+    moving_average: np.ndarray
+    week_start: date
+    weekly: np.ndarray
+
+
+def compute_trends(
+    daily: DailyValues,
+    targets: np.ndarray,
+    start_offsets: np.ndarray,
+    window: int,
+) -> Trends:
+    """
+    `targets` is each commitment's cumulative goal (NaN if none), and
+    `start_offsets` the day index each commitment started on; values logged
+    before it are ignored, so each row matches computing it on its own.
+    """
+    days = daily.values.shape[1]
+    values = np.where(
+        np.arange(days)[None, :] < start_offsets[:, None], np.nan, daily.values
+    )
+    cumulative = np.cumsum(np.nan_to_num(values), axis=1)
+    total = cumulative[:, -1]
+
+    recent = np.nan_to_num(values[:, -PACE_DAYS:]).sum(axis=1)
+    elapsed = np.clip(days - start_offsets, 1, PACE_DAYS)
+    pace = recent / elapsed
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        percent_of_target = total / targets * 100
+        remaining = targets - total
+        days_to_target = np.where(
+            (remaining > 0) & (pace > 0), np.ceil(remaining / pace), np.nan
+        )
+    reached = cumulative >= targets[:, None]
+    reached_on = np.where(reached.any(axis=1), reached.argmax(axis=1), -1)
+
+    week_start, weekly = weekly_totals(values, daily.start)
+    return Trends(
+        total=total,
+        percent_of_target=percent_of_target,
+        pace=pace,
+        days_to_target=days_to_target,
+        reached_on=reached_on,
+        moving_average=rolling_mean(values, window),
+        week_start=week_start,
+        weekly=weekly,
+    )
+
+
+def finite(value: float, digits: int = 2) -> Optional[float]:
+    """A float for JSON: rounded, or None for NaN."""
+    return None if np.isnan(value) else round(float(value), digits)
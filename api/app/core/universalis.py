@@ -0,0 +1,75 @@
+"""Client for the Universalis Mass readings API."""
+
+import json
+import re
+from typing import Any, Optional
+import httpx
+from .circuit_breaker import CircuitBreaker
+from .config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared upstream client, so concurrent fetches reuse connections."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=settings.UNIVERSALIS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.UNIVERSALIS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.UNIVERSALIS_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def is_upstream_failure(exc: Exception) -> bool:
+    """
+    Transport errors and 5xx responses count against the breaker. Waiting
+    too long for one of our own pooled connections says nothing about the
+    upstream.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    if isinstance(exc, httpx.PoolTimeout):
+        return False
+    return isinstance(exc, httpx.HTTPError)
+
+
+breaker = CircuitBreaker(
+    "universalis",
+    failure_threshold=settings.UNIVERSALIS_BREAKER_THRESHOLD,
+    reset_seconds=settings.UNIVERSALIS_BREAKER_RESET_SECONDS,
+    is_failure=is_upstream_failure,
+)
+
+
+def parse_jsonp(body: str) -> dict[str, Any]:
+    """Strip the universalisCallback(...); wrapper and parse the JSON."""
+    json_str = re.sub(r"^universalisCallback\(", "", body)
+    json_str = re.sub(r"\);\s*$", "", json_str)
+    return json.loads(json_str)
+
+
+async def _fetch(date: str) -> dict[str, Any]:
+    response = await get_client().get(
+        f"{settings.UNIVERSALIS_BASE_URL}/{date}/jsonpmass.js"
+    )
+    response.raise_for_status()
+    return parse_jsonp(response.text)
+
+
+async def fetch_readings(date: str) -> dict[str, Any]:
+    """
+    Fetch the Mass readings for a YYYYMMDD date through the circuit breaker.
+    Raises CircuitOpenError, httpx.HTTPError or json.JSONDecodeError.
+    """
+    return await breaker.call(_fetch, date)
@@ -0,0 +1,63 @@
+"""
+Backfill the search index of cached Mass readings.
+
+Usage: python -m app.jobs.backfill_readings [--batch-size N] [--reindex]
+"""
+
+import argparse
+import logging
+from sqlalchemy import update
+from sqlmodel import Session, select
+from app.core.database import engine
+from app.core.readings import decode_payload, extract_reading_index
+from app.models import MassReading
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_readings(batch_size: int = 500, reindex: bool = False) -> int:
+    """Index cached readings in id order, committing per batch. Returns rows indexed."""
+    indexed = 0
+    last_id = 0
+    while True:
+        statement = (
+            select(MassReading.id, MassReading.payload)
+            .where(MassReading.id > last_id)
+            .order_by(MassReading.id)
+            .limit(batch_size)
+        )
+        if not reindex:
+            statement = statement.where(MassReading.referenceKeys == None)
+
+        with Session(engine) as session:
+            rows = session.exec(statement).all()
+            if not rows:
+                return indexed
+            for reading_id, payload in rows:
+                session.execute(
+                    update(MassReading)
+                    .where(MassReading.id == reading_id)
+                    .values(**extract_reading_index(decode_payload(payload)))
+                )
+            session.commit()
+
+        indexed += len(rows)
+        last_id = rows[-1][0]
+        logger.info("Indexed %d readings (through id %d)", indexed, last_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--reindex", action="store_true", help="re-extract already indexed rows"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    total = backfill_readings(batch_size=args.batch_size, reindex=args.reindex)
+    logger.info("Done, %d readings indexed", total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Build offline Mass readings bundles ahead of demand.
+
+Usage: python -m app.jobs.build_readings_bundles KEY [KEY ...] [--force]
+       (KEY is YYYY-MM or advent|christmas|lent|easter-YYYY)
+"""
+
+import argparse
+import asyncio
+import logging
+from sqlmodel import Session
+from app.core.bundles import build_bundle
+from app.core.database import engine
+from app.core.universalis import close_client
+
+logger = logging.getLogger(__name__)
+
+
+async def build_bundles(keys: list[str], force: bool = False) -> None:
+    try:
+        with Session(engine) as session:
+            for key in keys:
+                bundle = await build_bundle(session, key, force=force)
+                logger.info(
+                    "%s: %s (%d bytes)", key, bundle.contentHash, bundle.size
+                )
+    finally:
+        await close_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("keys", nargs="+", metavar="KEY")
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild even if up to date"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(build_bundles(args.keys, force=args.force))
+
+
+if __name__ == "__main__":
+    main()
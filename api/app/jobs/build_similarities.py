@@ -0,0 +1,235 @@
+"""
+Rebuild similar-asceticism recommendations.
+
+Usage: python -m app.jobs.build_similarities [--full]
+
+Templates are compared by the users who took them on: a sparse users x
+templates matrix X gives co-occurrence counts X^T X, scored by cosine
+similarity, and each template keeps its SIMILAR_TOP_K best neighbours.
+
+Incremental runs only recompute the templates that commitments created
+or changed since the last run can affect. Commitments removed with their
+user are only accounted for by --full.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.core.database import advisory_lock, engine, stable_change_seq
+from app.models import (
+    AnalyticsWatermark,
+    Asceticism,
+    AsceticismSimilarity,
+    UserAsceticism,
+)
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "similarities"
+
+
+def template_commitments(*columns):
+    """Select UserAsceticism columns of commitments to templates."""
+    return (
+        select(*columns)
+        .join(Asceticism, Asceticism.id == UserAsceticism.asceticismId)
+        .where(Asceticism.isTemplate == True)
+    )
+
+
+def changed_templates(session: Session, since_seq: int, until_seq: int) -> list[int]:
+    """
+    Templates whose neighbours may have changed: those of users whose
+    template commitments changed in the range, whose co-occurrence counts
+    and user counts moved, and those listing one of them as a neighbour,
+    whose scores for it moved. No other template's neighbours can change.
+    """
+    users = template_commitments(UserAsceticism.userId).where(
+        UserAsceticism.changeSeq > since_seq,
+        UserAsceticism.changeSeq <= until_seq,
+    )
+    changed = set(
+        session.exec(
+            template_commitments(UserAsceticism.asceticismId)
+            .where(UserAsceticism.userId.in_(users))
+            .distinct()
+        ).all()
+    )
+    if not changed:
+        return []
+    listing = session.exec(
+        select(AsceticismSimilarity.asceticismId)
+        .where(AsceticismSimilarity.similarAsceticismId.in_(changed))
+        .distinct()
+    ).all()
+    return sorted(changed.union(listing))
+
+
+def load_matrix(
+    session: Session, templates: Optional[list[int]]
+) -> tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Users x templates matrix of the users of `templates` (every user if
+    None), with the template id of each column.
+    """
+    statement = template_commitments(
+        UserAsceticism.userId, UserAsceticism.asceticismId
+    ).distinct()
+    if templates is not None:
+        statement = statement.where(
+            UserAsceticism.userId.in_(
+                template_commitments(UserAsceticism.userId).where(
+                    UserAsceticism.asceticismId.in_(templates)
+                )
+            )
+        )
+    pairs = np.array(session.exec(statement).all(), dtype=np.int64).reshape(-1, 2)
+    _, rows = np.unique(pairs[:, 0], return_inverse=True)
+    item_ids, columns = np.unique(pairs[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (rows, columns)),
+        shape=(rows.max(initial=-1) + 1, len(item_ids)),
+    )
+    return matrix, item_ids
+
+
+def user_counts(session: Session, item_ids: np.ndarray) -> np.ndarray:
+    """Distinct users of each template, in the order of `item_ids`."""
+    commitments = template_commitments(
+        UserAsceticism.userId, UserAsceticism.asceticismId
+    ).subquery()
+    counts = dict(
+        session.exec(
+            select(
+                commitments.c.asceticismId,
+                func.count(func.distinct(commitments.c.userId)),
+            ).group_by(commitments.c.asceticismId)
+        ).all()
+    )
+    return np.array([counts.get(int(i), 0) for i in item_ids], dtype=np.float64)
+
+
+def top_neighbours(
+    matrix: sparse.csr_matrix,
+    item_ids: np.ndarray,
+    counts: np.ndarray,
+    templates: np.ndarray,
+    top_k: int,
+    min_co_users: int,
+) -> list[dict]:
+    """Similarity rows of `templates` (ids, all in `item_ids`)."""
+    sources = np.searchsorted(item_ids, templates)
+    # Co-occurrence counts of each source template with every template
+    cooccurrence = (matrix[:, sources].T.tocsr() @ matrix).tocsr()
+    cooccurrence.sort_indices()
+    row_of = np.repeat(np.arange(len(sources)), np.diff(cooccurrence.indptr))
+    scores = cooccurrence.data / np.sqrt(
+        counts[sources][row_of] * counts[cooccurrence.indices]
+    )
+
+    now = datetime.utcnow()
+    rows = []
+    for i, source in enumerate(sources):
+        start, end = cooccurrence.indptr[i], cooccurrence.indptr[i + 1]
+        columns = cooccurrence.indices[start:end]
+        co_users = cooccurrence.data[start:end]
+        row_scores = scores[start:end]
+        keep = (columns != source) & (co_users >= min_co_users)
+        columns, co_users, row_scores = columns[keep], co_users[keep], row_scores[keep]
+        # Best score first; ties go to more shared users, then the lower id
+        order = np.lexsort((columns, -co_users, -row_scores))[:top_k]
+        rows += [
+            {
+                "asceticismId": int(item_ids[source]),
+                "rank": rank,
+                "similarAsceticismId": int(item_ids[columns[j]]),
+                "score": round(float(row_scores[j]), 6),
+                "coUsers": int(co_users[j]),
+                "updatedAt": now,
+            }
+            for rank, j in enumerate(order)
+        ]
+    return rows
+
+
+def build_similarities(full: bool = False) -> dict[str, int]:
+    """
+    Recompute the neighbours of templates that changed, or of all.
+    Concurrent runs wait for each other.
+    """
+    started = time.monotonic()
+    with advisory_lock(WATERMARK), Session(engine) as session:
+        watermark = session.get(AnalyticsWatermark, WATERMARK)
+        until_seq = stable_change_seq(session)
+        full = full or watermark is None
+
+        templates = None
+        if not full:
+            templates = changed_templates(session, watermark.changeSeq, until_seq)
+            if not templates:
+                logger.info("No commitments changed since the last run")
+                return {"templates": 0, "rows": 0}
+
+        matrix, item_ids = load_matrix(session, templates)
+        logger.info(
+            "Loaded %d commitments of %d users", matrix.nnz, matrix.shape[0]
+        )
+        if templates is None:
+            templates = item_ids
+        rows = top_neighbours(
+            matrix,
+            item_ids,
+            user_counts(session, item_ids),
+            np.array(sorted(templates), dtype=np.int64),
+            settings.SIMILAR_TOP_K,
+            settings.SIMILAR_MIN_CO_USERS,
+        )
+
+        statement = delete(AsceticismSimilarity)
+        if not full:
+            statement = statement.where(
+                AsceticismSimilarity.asceticismId.in_([int(t) for t in templates])
+            )
+        session.execute(statement)
+        if rows:
+            session.execute(insert(AsceticismSimilarity), rows)
+        session.execute(
+            pg_insert(AnalyticsWatermark)
+            .values(name=WATERMARK, changeSeq=until_seq, updatedAt=datetime.utcnow())
+            .on_conflict_do_update(
+                index_elements=["name"],
+                set_={"changeSeq": until_seq, "updatedAt": datetime.utcnow()},
+            )
+        )
+        session.commit()
+
+    logger.info(
+        "Wrote %d neighbours of %d templates in %.1fs",
+        len(rows),
+        len(templates),
+        time.monotonic() - started,
+    )
+    return {"templates": len(templates), "rows": len(rows)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--full", action="store_true", help="recompute every template's neighbours"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    build_similarities(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Compute cohort retention by signup week and by package joined.
+
+Usage: python -m app.jobs.compute_cohorts [--processes N] [--batch-size N]
+
+Logs are streamed once through a server-side cursor into a bitmap of
+weeks each user logged anything in (one bit per user per week, so memory
+depends on users and weeks, not on log rows). The bitmap is placed in
+shared memory and cohorts are computed across a process pool. A user's
+signup week is the week of their first commitment.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+import numpy as np
+from sqlalchemy import Date, Integer, cast, delete, insert
+from sqlmodel import Session, select, func
+from app.core.analytics import PACKAGE, SIGNUP_WEEK
+from app.core.database import engine
+from app.models import AnalyticsRetention, AsceticismLog, User, UserAsceticism
+
+logger = logging.getLogger(__name__)
+
+# Members unpacked at a time, bounding each process's working memory
+MEMBER_BLOCK = 32768
+
+
+@dataclass
+class Cohort:
+    cohort_type: str
+    key: str
+    user_ids: np.ndarray
+    join_weeks: np.ndarray  # week index each member joined in
+
+
+def week_index(column, epoch: date):
+    """SQL expression: weeks from `epoch` (a Monday) to a column's day."""
+    return cast(cast(column, Date) - epoch, Integer) // 7
+
+
+def build_activity_bitmap(
+    session: Session, bitmap: np.ndarray, epoch: date, weeks: int, batch_size: int
+) -> None:
+    """
+    Fill a zeroed (users x bytes of weeks) bitmap: bit (user, week) is set
+    if the user logged anything that week.
+    """
+    statement = select(
+        UserAsceticism.userId, week_index(AsceticismLog.date, epoch)
+    ).join(UserAsceticism, UserAsceticism.id == AsceticismLog.userAsceticismId)
+
+    rows = 0
+    result = session.connection().execution_options(
+        stream_results=True, yield_per=batch_size
+    ).execute(statement)
+    for chunk in result.partitions():
+        pairs = np.array(chunk, dtype=np.int64)
+        pairs = pairs[pairs[:, 1] < weeks]  # logs dated in the future
+        users, week = pairs[:, 0], pairs[:, 1]
+        np.bitwise_or.at(
+            bitmap, (users, week >> 3), (0x80 >> (week & 7)).astype(np.uint8)
+        )
+        rows += len(chunk)
+        if rows % (batch_size * 20) < batch_size:
+            logger.info("Streamed %d logs", rows)
+    logger.info("Streamed %d logs into a %d KiB bitmap", rows, bitmap.nbytes // 1024)
+
+
+def load_cohorts(session: Session, epoch: date) -> list[Cohort]:
+    """Signup-week and package cohorts with each member's join week."""
+    cohorts = []
+
+    signups = session.exec(
+        select(
+            UserAsceticism.userId,
+            week_index(func.min(UserAsceticism.createdAt), epoch),
+        ).group_by(UserAsceticism.userId)
+    ).all()
+    if signups:
+        pairs = np.array(signups, dtype=np.int64)
+        for week in np.unique(pairs[:, 1]):
+            members = pairs[pairs[:, 1] == week]
+            key = (epoch + timedelta(weeks=int(week))).isoformat()
+            cohorts.append(Cohort(SIGNUP_WEEK, key, members[:, 0], members[:, 1]))
+
+    joins = session.exec(
+        select(
+            UserAsceticism.packageId,
+            UserAsceticism.userId,
+            week_index(func.min(UserAsceticism.createdAt), epoch),
+        )
+        .where(UserAsceticism.packageId != None)
+        .group_by(UserAsceticism.packageId, UserAsceticism.userId)
+    ).all()
+    if joins:
+        triples = np.array(joins, dtype=np.int64)
+        for package_id in np.unique(triples[:, 0]):
+            members = triples[triples[:, 0] == package_id]
+            cohorts.append(
+                Cohort(PACKAGE, str(package_id), members[:, 1], members[:, 2])
+            )
+    return cohorts
+
+
+def retention_rows(
+    bitmap: np.ndarray, current_week: int, cohort: Cohort
+) -> list[tuple[str, str, int, int, int, int, int]]:
+    """
+    (type, key, first join week, week offset, active users, eligible users,
+    cohort size) rows of a cohort. Members are aligned on their own join week.
+    """
+    first_week = int(cohort.join_weeks.min())
+    offsets = np.arange(current_week - first_week + 1)
+    active = np.zeros(len(offsets), dtype=np.int64)
+    eligible = np.zeros(len(offsets), dtype=np.int64)
+    for block in range(0, len(cohort.user_ids), MEMBER_BLOCK):
+        user_ids = cohort.user_ids[block : block + MEMBER_BLOCK]
+        join_weeks = cohort.join_weeks[block : block + MEMBER_BLOCK]
+        bits = np.unpackbits(bitmap[user_ids], axis=1)
+        # weeks[i, k]: the week member i reaches offset k
+        weeks = join_weeks[:, None] + offsets
+        reached = weeks <= current_week
+        logged = np.take_along_axis(bits, np.minimum(weeks, current_week), axis=1)
+        active += (logged.astype(bool) & reached).sum(axis=0)
+        eligible += reached.sum(axis=0)
+    size = len(cohort.user_ids)
+    return [
+        (cohort.cohort_type, cohort.key, first_week, int(k), int(a), int(e), size)
+        for k, a, e in zip(offsets, active, eligible)
+    ]
+
+
+def cohort_retention(
+    shm_name: str, shape: tuple[int, int], current_week: int, cohorts: list[Cohort]
+) -> list[tuple[str, str, int, int, int, int, int]]:
+    """Run in a pool process: retention rows of cohorts, from the shared bitmap."""
+    shm = SharedMemory(name=shm_name)
+    bitmap = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        rows = []
+        for cohort in cohorts:
+            rows += retention_rows(bitmap, current_week, cohort)
+        return rows
+    finally:
+        # The view must go before the segment can be closed
+        del bitmap
+        shm.close()
+
+
+def write_retention(epoch: date, rows: list[tuple]) -> None:
+    """Replace the signup-week and package cohorts with `rows`."""
+    columns = ("cohortType", "cohortKey", "firstWeek", "weekOffset")
+    columns += ("users", "eligibleUsers", "cohortSize")
+    values = []
+    for row in rows:
+        value = dict(zip(columns, row))
+        cohort_start = epoch + timedelta(weeks=value.pop("firstWeek"))
+        value["cohortStart"] = datetime.combine(cohort_start, datetime.min.time())
+        values.append(value)
+
+    with Session(engine) as session:
+        session.execute(
+            delete(AnalyticsRetention).where(
+                AnalyticsRetention.cohortType.in_([SIGNUP_WEEK, PACKAGE])
+            )
+        )
+        if values:
+            session.execute(insert(AnalyticsRetention), values)
+        session.commit()
+
+
+def compute_cohorts(processes: Optional[int] = None, batch_size: int = 50000) -> int:
+    """Recompute signup-week and package cohorts. Returns rows written."""
+    started = time.monotonic()
+    # Every read shares one snapshot, so the logs and cohorts cannot name
+    # users created after max_user_id sized the bitmap
+    snapshot = engine.execution_options(isolation_level="REPEATABLE READ")
+    with Session(snapshot) as session:
+        first_log, first_join, max_user_id = session.exec(
+            select(
+                select(func.min(AsceticismLog.date)).scalar_subquery(),
+                select(func.min(UserAsceticism.createdAt)).scalar_subquery(),
+                select(func.max(User.id)).scalar_subquery(),
+            )
+        ).one()
+        if first_log is None or first_join is None:
+            logger.info("Nothing to compute yet")
+            return 0
+        first_day = min(first_log, first_join).date()
+        epoch = first_day - timedelta(days=first_day.weekday())
+        current_week = (datetime.utcnow().date() - epoch).days // 7
+        processes = processes or os.cpu_count() or 1
+
+        # Built straight into shared memory so pool processes read it in place
+        shape = (max_user_id + 1, current_week // 8 + 1)
+        shm = SharedMemory(create=True, size=shape[0] * shape[1])
+        try:
+            bitmap = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            try:
+                bitmap[:] = 0
+                build_activity_bitmap(
+                    session, bitmap, epoch, current_week + 1, batch_size
+                )
+                cohorts = load_cohorts(session, epoch)
+            finally:
+                del bitmap
+            # The pool only needs the bitmap; don't hold the snapshot meanwhile
+            session.close()
+            logger.info(
+                "Computing %d cohorts in %d processes", len(cohorts), processes
+            )
+
+            # Several tasks per process so one large cohort does not hold up
+            # the rest
+            tasks = [cohorts[i :: processes * 4] for i in range(processes * 4)]
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=context
+            ) as pool:
+                futures = [
+                    pool.submit(cohort_retention, shm.name, shape, current_week, task)
+                    for task in tasks
+                    if task
+                ]
+                rows = [row for future in futures for row in future.result()]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    write_retention(epoch, rows)
+    logger.info(
+        "Wrote %d retention rows in %.1fs", len(rows), time.monotonic() - started
+    )
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--processes", type=int, default=None, help="default: one per CPU"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=50000, help="log rows fetched at a time"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    compute_cohorts(processes=args.processes, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Handlers for queued background jobs, run by app.jobs.worker."""
+
+from datetime import datetime
+from typing import Any
+from sqlmodel import Session
+from app.core.analytics import run_rollup
+from app.core.bundles import BundleError, build_bundle
+from app.core.jobs import PermanentJobError, job_handler, set_progress
+from app.models import Job
+
+BUILD_READINGS_BUNDLE = "readings.build_bundle"
+ROLLUP_ANALYTICS = "analytics.rollup"
+
+
+@job_handler(BUILD_READINGS_BUNDLE)
+async def build_readings_bundle(session: Session, job: Job) -> dict[str, Any]:
+    """Build an offline readings bundle. Payload: {"key": str, "force": bool}."""
+    try:
+        bundle = await build_bundle(
+            session, job.payload["key"], force=job.payload.get("force", False)
+        )
+    except BundleError as e:
+        raise PermanentJobError(str(e)) from e
+    return {"key": bundle.key, "contentHash": bundle.contentHash, "size": bundle.size}
+
+
+@job_handler(ROLLUP_ANALYTICS)
+async def rollup_analytics(session: Session, job: Job) -> dict[str, Any]:
+    """Update the analytics aggregates. Payload: {"from", "to"} (optional ISO dates)."""
+    payload = job.payload or {}
+    start, end = payload.get("from"), payload.get("to")
+    return run_rollup(
+        session,
+        start=datetime.fromisoformat(start) if start else None,
+        end=datetime.fromisoformat(end) if end else None,
+        on_progress=lambda progress: set_progress(session, job, progress),
+    )
@@ -0,0 +1,25 @@
+"""
+Recompute the popularity counters of asceticisms and packages.
+
+Usage: python -m app.jobs.reconcile_popularity
+"""
+
+import argparse
+import logging
+from sqlmodel import Session
+from app.core.database import engine
+from app.core.popularity import reconcile
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__.strip().splitlines()[0]).parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    with Session(engine) as session:
+        reconcile(session)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Update the admin analytics aggregates.
+
+Usage: python -m app.jobs.rollup_analytics [--from YYYY-MM-DD [--to YYYY-MM-DD]]
+"""
+
+import argparse
+import logging
+from datetime import datetime
+from sqlmodel import Session
+from app.core.analytics import run_rollup
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--from",
+        dest="start",
+        type=datetime.fromisoformat,
+        help="also recompute days from this date, e.g. after deleting logs",
+    )
+    parser.add_argument(
+        "--to", dest="end", type=datetime.fromisoformat, help="default: today"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    with Session(engine) as session:
+        run_rollup(session, start=args.start, end=args.end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Run background job workers.
+
+Usage: python -m app.jobs.worker [--processes N] [--type TYPE ...]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+from datetime import datetime
+from typing import Optional
+import psycopg2
+import psycopg2.extensions
+from sqlmodel import Session
+from app.core.config import settings
+from app.core.database import engine
+from app.core.jobs import (
+    JOBS_CHANNEL,
+    claim,
+    complete,
+    fail,
+    get_handler,
+    next_run_at,
+    requeue_stale,
+)
+from app.core.universalis import close_client
+from app.jobs import handlers  # noqa: F401  (registers the handlers)
+from app.jobs.handlers import BUILD_READINGS_BUNDLE, ROLLUP_ANALYTICS
+
+logger = logging.getLogger(__name__)
+
+ALL_TYPES = [BUILD_READINGS_BUNDLE, ROLLUP_ANALYTICS]
+
+
+class Worker:
+    """
+    Claims and runs jobs one at a time until stopped. Sleeps between polls,
+    woken early by the NOTIFY sent when a job is queued.
+    """
+
+    def __init__(self, types: list[str]) -> None:
+        self.types = types
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.running = True
+        self._wakeup = asyncio.Event()
+        self._listen_conn: Optional[psycopg2.extensions.connection] = None
+
+    def stop(self) -> None:
+        """Finish the current job, then exit."""
+        self.running = False
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+        self._listen()
+        logger.info("Worker %s started for %s", self.worker_id, ", ".join(self.types))
+        polls = 0
+        try:
+            while self.running:
+                if polls % 12 == 0:
+                    with Session(engine) as session:
+                        requeue_stale(session)
+                polls += 1
+                if await self.run_next():
+                    continue
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._idle_seconds())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._listen_conn is not None:
+                loop.remove_reader(self._listen_conn.fileno())
+                self._listen_conn.close()
+            await close_client()
+        logger.info("Worker %s stopped", self.worker_id)
+
+    def _idle_seconds(self) -> float:
+        # Poll sooner if a retry backoff or scheduled job ends before then
+        with Session(engine) as session:
+            run_at = next_run_at(session, self.types)
+        if run_at is None:
+            return settings.JOB_POLL_SECONDS
+        due_in = (run_at - datetime.utcnow()).total_seconds()
+        return min(settings.JOB_POLL_SECONDS, max(due_in, 0.0))
+
+    async def run_next(self) -> bool:
+        """Run one job if any is due. Returns whether one ran."""
+        with Session(engine) as session:
+            job = claim(session, self.worker_id, self.types)
+            if job is None:
+                return False
+            handler = get_handler(job.type)
+            logger.info(
+                "Running job %d (%s), attempt %d", job.id, job.type, job.attempts
+            )
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for job type {job.type}")
+                result = await handler(session, job)
+            except Exception as exc:
+                logger.exception("Job %d failed", job.id)
+                session.rollback()
+                fail(session, job, exc)
+            else:
+                complete(session, job, result)
+            return True
+
+    def _listen(self) -> None:
+        # Best effort: without it, new jobs are picked up at the next poll
+        dsn = engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        try:
+            conn = psycopg2.connect(dsn)
+        except psycopg2.Error:
+            logger.warning("Could not LISTEN for new jobs, polling only")
+            return
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{JOBS_CHANNEL}"')
+        self._listen_conn = conn
+        asyncio.get_running_loop().add_reader(conn.fileno(), self._on_notify)
+
+    def _on_notify(self) -> None:
+        try:
+            self._listen_conn.poll()
+        except psycopg2.Error:
+            return
+        if any(n.payload in self.types for n in self._listen_conn.notifies):
+            self._wakeup.set()
+        self._listen_conn.notifies.clear()
+
+
+def run_worker(types: list[str]) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(Worker(types).run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--processes", type=int, default=1, help="worker processes to run"
+    )
+    parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        choices=ALL_TYPES,
+        help="job types to run (default: all)",
+    )
+    args = parser.parse_args()
+    types = args.types or ALL_TYPES
+
+    if args.processes == 1:
+        run_worker(types)
+        return
+
+    # Spawned, not forked, so no process inherits the parent's pooled connections
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(types,), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum: int, frame: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,51 @@
 Configures CORS, database connections, and includes all routers.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import asceticisms, admin, packages, daily_readings
+from app.api.routes import (
+    asceticisms,
+    admin,
+    packages,
+    daily_readings,
+    sync,
+    events,
+    groups,
+    programs,
+    search,
+    jobs,
+    analytics,
+)
+from app.core.admission import AdmissionControlMiddleware
+from app.core.config import settings
+from app.core.listener import pg_listener
+from app.core.micro_cache import MicroCacheMiddleware
+from app.core.log_writer import log_committer
+from app.core.reminders import reminder_dispatcher
+from app.core.universalis import close_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop per-worker background services."""
+    await pg_listener.start()
+    if settings.REMINDERS_ENABLED:
+        await reminder_dispatcher.start()
+    if settings.LOG_GROUP_COMMIT_ENABLED:
+        await log_committer.start()
+    yield
+    await log_committer.stop()
+    await reminder_dispatcher.stop()
+    await pg_listener.stop()
+    await close_client()
+
 
 app = FastAPI(
     title="Project Desert API",
     description="API for managing ascetical practices and spiritual growth",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -20,6 +57,14 @@ origins = [
     "https://www.projectdesert.app",  # if you use www subdomain
 ]
 
+if settings.ADMISSION_CONTROL_ENABLED:
+    # Added before CORS so shed responses still carry CORS headers
+    app.add_middleware(AdmissionControlMiddleware)
+
+if settings.MICRO_CACHE_ENABLED:
+    # Outside admission control: cache hits and coalesced waiters take no slot
+    app.add_middleware(MicroCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -32,6 +77,13 @@ app.include_router(asceticisms.router)
 app.include_router(admin.router)
 app.include_router(packages.router)
 app.include_router(daily_readings.router)
+app.include_router(sync.router)
+app.include_router(events.router)
+app.include_router(groups.router)
+app.include_router(programs.router)
+app.include_router(search.router)
+app.include_router(jobs.router)
+app.include_router(analytics.router)
 
 
 @app.get("/")
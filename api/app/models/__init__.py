@@ -4,7 +4,67 @@ from datetime import datetime
 from typing import Optional
 from enum import Enum
 from sqlmodel import Field, SQLModel, Relationship, Column, JSON
-from sqlalchemy import BigInteger, text, Enum as SAEnum, Boolean
+from sqlalchemy import (
+    BigInteger,
+    text,
+    Enum as SAEnum,
+    Boolean,
+    Computed,
+    FetchedValue,
+    Index,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+
+
+# Global change sequence used by delta sync. Rows get a fresh value from a
+# database trigger on every insert and update: the transaction id shifted
+# left by CHANGE_SEQ_XID_SHIFT bits plus a counter within the transaction.
+CHANGE_SEQ_DEFAULT = "nextval('change_seq')"
+CHANGE_SEQ_XID_SHIFT = 24
+
+
+def change_seq_column() -> Column:
+    """Column tracking the last change sequence number of a synced row."""
+    return Column(
+        BigInteger,
+        nullable=False,
+        server_default=text(CHANGE_SEQ_DEFAULT),
+        server_onupdate=FetchedValue(),
+    )
+
+
+def search_vector_column(expression: str) -> Column:
+    """Generated full-text search column kept current by Postgres."""
+    return Column(TSVECTOR, Computed(expression, persisted=True))
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index for fuzzy/prefix matching (requires pg_trgm)."""
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    )
+
+
+ASCETICISM_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+PACKAGE_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+NOTE_SEARCH_EXPRESSION = "to_tsvector('english', coalesce(notes, ''))"
+
+READING_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(sources, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(\"readingText\", '')), 'B')"
+)
 
 
 # --- Enums ---
@@ -43,6 +103,15 @@ class GroupRole(str, Enum):
     MENTOR = "MENTOR"
 
 
+class JobStatus(str, Enum):
+    """State of a background job."""
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
 # --- Auth Models ---
 
 
@@ -130,6 +199,10 @@ class Asceticism(SQLModel, table=True):
     """Asceticism template or definition."""
 
     __tablename__ = "Asceticism"
+    __table_args__ = (
+        Index("ix_Asceticism_searchVector", "searchVector", postgresql_using="gin"),
+        trigram_index("ix_Asceticism_title_trgm", "title"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -142,6 +215,9 @@ class Asceticism(SQLModel, table=True):
     custom_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    searchVector: Optional[str] = Field(
+        default=None, sa_column=search_vector_column(ASCETICISM_SEARCH_EXPRESSION)
+    )
 
     # Relationships
     creator: Optional["User"] = Relationship(back_populates="createdAsceticisms")
@@ -154,10 +230,27 @@ class UserAsceticism(SQLModel, table=True):
     """User's commitment to an asceticism."""
 
     __tablename__ = "UserAsceticism"
+    __table_args__ = (
+        Index("ix_UserAsceticism_userId_changeSeq", "userId", "changeSeq"),
+        Index("ix_UserAsceticism_asceticismId", "asceticismId"),
+        Index("ix_UserAsceticism_changeSeq", "changeSeq"),
+        Index("ix_UserAsceticism_createdAt", "createdAt"),
+        Index(
+            "ix_UserAsceticism_reminderTime_active",
+            "reminderTime",
+            postgresql_where=text(
+                "status = 'ACTIVE' AND \"reminderTime\" IS NOT NULL"
+            ),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="users.id", ondelete="CASCADE")
     asceticismId: int = Field(foreign_key="Asceticism.id", ondelete="CASCADE")
+    # Package the commitment was last activated from, if any
+    packageId: Optional[int] = Field(
+        default=None, foreign_key="asceticism_packages.id", ondelete="SET NULL"
+    )
     status: AsceticismStatus = Field(default=AsceticismStatus.ACTIVE)
     startDate: datetime = Field(default_factory=datetime.utcnow)
     endDate: Optional[datetime] = None
@@ -166,6 +259,7 @@ class UserAsceticism(SQLModel, table=True):
     custom_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    changeSeq: Optional[int] = Field(default=None, sa_column=change_seq_column())
 
     # Relationships
     user: "User" = Relationship(back_populates="userAsceticisms")
@@ -177,6 +271,22 @@ class AsceticismLog(SQLModel, table=True):
     """Daily log for an asceticism commitment."""
 
     __tablename__ = "AsceticismLog"
+    __table_args__ = (
+        Index(
+            "ix_AsceticismLog_userAsceticismId_changeSeq",
+            "userAsceticismId",
+            "changeSeq",
+        ),
+        Index(
+            "ix_AsceticismLog_userAsceticismId_date",
+            "userAsceticismId",
+            "date",
+            unique=True,
+        ),
+        # Analytics rollups: changed logs since a watermark, and logs per day
+        Index("ix_AsceticismLog_changeSeq", "changeSeq"),
+        Index("ix_AsceticismLog_date", "date"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     userAsceticismId: int = Field(foreign_key="UserAsceticism.id", ondelete="CASCADE")
@@ -187,6 +297,7 @@ class AsceticismLog(SQLModel, table=True):
     custom_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    changeSeq: Optional[int] = Field(default=None, sa_column=change_seq_column())
 
     # Relationships
     userAsceticism: "UserAsceticism" = Relationship(back_populates="logs")
@@ -199,6 +310,14 @@ class AsceticismPackage(SQLModel, table=True):
     """Published collection of asceticisms."""
 
     __tablename__ = "asceticism_packages"
+    __table_args__ = (
+        Index(
+            "ix_asceticism_packages_searchVector",
+            "searchVector",
+            postgresql_using="gin",
+        ),
+        trigram_index("ix_asceticism_packages_title_trgm", "title"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -208,6 +327,9 @@ class AsceticismPackage(SQLModel, table=True):
     custom_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    searchVector: Optional[str] = Field(
+        default=None, sa_column=search_vector_column(PACKAGE_SEARCH_EXPRESSION)
+    )
 
     # Relationships
     items: list["PackageItem"] = Relationship(back_populates="package")
@@ -230,6 +352,39 @@ class PackageItem(SQLModel, table=True):
     asceticism: "Asceticism" = Relationship(back_populates="packageItems")
 
 
+# --- Popularity Models ---
+# Counters updated with each join, leave and log (see app.core.popularity)
+# and periodically reconciled against the source tables.
+
+
+class AsceticismStats(SQLModel, table=True):
+    """Popularity of an asceticism."""
+
+    __tablename__ = "asceticism_stats"
+
+    asceticismId: int = Field(
+        primary_key=True, foreign_key="Asceticism.id", ondelete="CASCADE"
+    )
+    activeUsers: int = Field(default=0)  # ACTIVE commitments
+    totalJoins: int = Field(default=0)  # commitments ever created
+    recentLogs: int = Field(default=0)  # logs in the last POPULARITY_RECENT_DAYS
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PackageStats(SQLModel, table=True):
+    """Popularity of a package, through commitments activated from it."""
+
+    __tablename__ = "package_stats"
+
+    packageId: int = Field(
+        primary_key=True, foreign_key="asceticism_packages.id", ondelete="CASCADE"
+    )
+    activeUsers: int = Field(default=0)  # users with an ACTIVE commitment from it
+    totalJoins: int = Field(default=0)  # users with any commitment from it
+    recentLogs: int = Field(default=0)  # logs in the last POPULARITY_RECENT_DAYS
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
 # --- Program Models ---
 
 
@@ -254,6 +409,7 @@ class ProgramItem(SQLModel, table=True):
     """Item within a program with day range."""
 
     __tablename__ = "ProgramItem"
+    __table_args__ = (Index("ix_ProgramItem_programId", "programId"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     programId: int = Field(foreign_key="Program.id")
@@ -271,6 +427,10 @@ class UserProgram(SQLModel, table=True):
     """User's enrollment in a program."""
 
     __tablename__ = "UserProgram"
+    __table_args__ = (
+        Index("ix_UserProgram_programId_startDate", "programId", "startDate"),
+        Index("ix_UserProgram_userId", "userId"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="users.id")
@@ -306,6 +466,10 @@ class GroupMember(SQLModel, table=True):
     """Member of a group."""
 
     __tablename__ = "GroupMember"
+    __table_args__ = (
+        UniqueConstraint("groupId", "userId", name="uq_GroupMember_groupId_userId"),
+        Index("ix_GroupMember_userId", "userId"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     groupId: int = Field(foreign_key="Group.id")
@@ -325,18 +489,65 @@ class MassReading(SQLModel, table=True):
     """Cached Mass readings from external API."""
 
     __tablename__ = "mass_readings"
+    __table_args__ = (
+        Index(
+            "ix_mass_readings_referenceKeys", "referenceKeys", postgresql_using="gin"
+        ),
+        Index(
+            "ix_mass_readings_searchVector", "searchVector", postgresql_using="gin"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     date: datetime = Field(unique=True)
-    data: dict = Field(sa_column=Column(JSON))
+    # Universalis JSON, gzip-compressed as served (see app.core.readings)
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    contentHash: str  # SHA-256 of the uncompressed JSON
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
+    # Search index extracted from `data` (see app.core.readings);
+    # referenceKeys is NULL until a row has been indexed
+    sources: Optional[str] = None
+    referenceKeys: Optional[list[str]] = Field(
+        default=None, sa_column=Column(ARRAY(String))
+    )
+    readingText: Optional[str] = None
+    searchVector: Optional[str] = Field(
+        default=None, sa_column=search_vector_column(READING_SEARCH_EXPRESSION)
+    )
+
+
+class ReadingsBundle(SQLModel, table=True):
+    """Offline bundle of a month or season of Mass readings (see app.core.bundles)."""
+
+    __tablename__ = "readings_bundles"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(unique=True)  # "YYYY-MM" or "<season>-YYYY"
+    startDate: datetime
+    endDate: datetime
+    contentHash: str = Field(index=True)  # SHA-256 of the bundle file, also its name
+    # SHA-256 over the dates and content hashes of the readings it holds
+    readingsHash: Optional[str] = None
+    size: int
+    builtAt: datetime = Field(default_factory=datetime.utcnow)
+
 
 class DailyReadingNote(SQLModel, table=True):
     """User's notes on daily Mass readings."""
 
     __tablename__ = "daily_reading_notes"
+    __table_args__ = (
+        Index("ix_daily_reading_notes_userId_changeSeq", "userId", "changeSeq"),
+        # Per-user full-text lookups (requires btree_gin)
+        Index(
+            "ix_daily_reading_notes_userId_searchVector",
+            "userId",
+            "searchVector",
+            postgresql_using="gin",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     userId: int = Field(foreign_key="users.id", ondelete="CASCADE")
@@ -344,6 +555,183 @@ class DailyReadingNote(SQLModel, table=True):
     notes: str
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    changeSeq: Optional[int] = Field(default=None, sa_column=change_seq_column())
+    searchVector: Optional[str] = Field(
+        default=None, sa_column=search_vector_column(NOTE_SEARCH_EXPRESSION)
+    )
 
     # Relationships
     user: "User" = Relationship(back_populates="dailyReadingNotes")
+
+
+# --- Sync Models ---
+
+
+class SyncTombstone(SQLModel, table=True):
+    """Deleted synced row, recorded by a database trigger for delta sync."""
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_userId_changeSeq", "userId", "changeSeq"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    userId: int
+    entity: str
+    entityId: int
+    changeSeq: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger, nullable=False, server_default=text(CHANGE_SEQ_DEFAULT)
+        ),
+    )
+    createdAt: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": text("now()")},
+    )
+
+
+# --- Job Models ---
+
+
+class Job(SQLModel, table=True):
+    """Background job in the Postgres queue (see app.core.jobs)."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Workers dequeue from this index only
+        Index(
+            "ix_jobs_runAt_queued",
+            "runAt",
+            postgresql_where=text("status = 'QUEUED'"),
+        ),
+        # At most one queued or running job per dedupe key
+        Index(
+            "ix_jobs_dedupeKey_active",
+            "dedupeKey",
+            unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+        Index("ix_jobs_userId", "userId"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    type: str
+    payload: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+    dedupeKey: Optional[str] = None
+    userId: Optional[int] = Field(
+        default=None, foreign_key="users.id", ondelete="CASCADE"
+    )
+    attempts: int = Field(default=0)
+    maxAttempts: int = Field(default=3)
+    runAt: datetime = Field(default_factory=datetime.utcnow)
+    progress: float = Field(default=0.0)
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = None
+    lockedBy: Optional[str] = None
+    lockedAt: Optional[datetime] = None
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    finishedAt: Optional[datetime] = None
+
+
+# --- Recommendation Models ---
+
+
+class AsceticismSimilarity(SQLModel, table=True):
+    """
+    A template often taken on by users of another, `rank` 0 being the most
+    similar. Rebuilt by app.jobs.build_similarities.
+    """
+
+    __tablename__ = "asceticism_similarities"
+
+    asceticismId: int = Field(
+        primary_key=True, foreign_key="Asceticism.id", ondelete="CASCADE"
+    )
+    rank: int = Field(primary_key=True)
+    similarAsceticismId: int = Field(foreign_key="Asceticism.id", ondelete="CASCADE")
+    score: float  # cosine similarity of the two templates' sets of users
+    coUsers: int  # users who took on both
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
+# --- Analytics Models ---
+# Aggregates maintained by the rollup job (see app.core.analytics), keyed by
+# UTC day (midnight). Admin dashboards read only these, never the log tables.
+
+
+class AnalyticsWatermark(SQLModel, table=True):
+    """Last change sequence number a rollup has processed."""
+
+    __tablename__ = "analytics_watermarks"
+
+    name: str = Field(primary_key=True)
+    changeSeq: int = Field(sa_column=Column(BigInteger, nullable=False))
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
+class AnalyticsUserDay(SQLModel, table=True):
+    """A user who logged anything on a day (distinct active user counts)."""
+
+    __tablename__ = "analytics_user_days"
+
+    date: datetime = Field(primary_key=True)
+    userId: int = Field(primary_key=True)
+
+
+class AnalyticsDaily(SQLModel, table=True):
+    """Platform-wide activity for a day."""
+
+    __tablename__ = "analytics_daily"
+
+    date: datetime = Field(primary_key=True)
+    activeUsers: int = Field(default=0)
+    weeklyActiveUsers: int = Field(default=0)  # active in the 7 days to date
+    monthlyActiveUsers: int = Field(default=0)  # active in the 30 days to date
+    logs: int = Field(default=0)
+    completedLogs: int = Field(default=0)
+    joins: int = Field(default=0)  # commitments created
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+
+class AnalyticsTemplateDaily(SQLModel, table=True):
+    """Activity for one asceticism on a day."""
+
+    __tablename__ = "analytics_template_daily"
+
+    date: datetime = Field(primary_key=True)
+    asceticismId: int = Field(primary_key=True)
+    activeUsers: int = Field(default=0)
+    logs: int = Field(default=0)
+    completedLogs: int = Field(default=0)
+    joins: int = Field(default=0)
+
+
+class AnalyticsPackageDaily(SQLModel, table=True):
+    """Users who activated a package on a day."""
+
+    __tablename__ = "analytics_package_daily"
+
+    date: datetime = Field(primary_key=True)
+    packageId: int = Field(primary_key=True)
+    joins: int = Field(default=0)
+
+
+class AnalyticsRetention(SQLModel, table=True):
+    """
+    Members of a cohort who logged anything `weekOffset` weeks after the
+    week they joined it, out of `eligibleUsers` who joined long enough ago.
+    """
+
+    __tablename__ = "analytics_retention"
+
+    # "first_active_week", "signup_week" or "package"
+    cohortType: str = Field(primary_key=True)
+    cohortKey: str = Field(primary_key=True)
+    cohortStart: datetime  # Monday of the earliest member's week
+    weekOffset: int = Field(primary_key=True)
+    users: int
+    eligibleUsers: int
+    cohortSize: int
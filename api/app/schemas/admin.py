@@ -1,6 +1,7 @@
 """Pydantic schemas for admin endpoints."""
 
 from typing import Optional
+from datetime import datetime
 from pydantic import BaseModel
 
 
@@ -40,3 +41,44 @@ class CurrentUserResponse(BaseModel):
     email: Optional[str]
     role: str
     isBanned: bool
+
+
+class AdmissionStatusResponse(BaseModel):
+    """Load and counters of a route class's admission limit (this worker)."""
+
+    name: str
+    concurrency: int
+    queueSize: int
+    active: int
+    waiting: int
+    admitted: int
+    rejected: int
+    timedOut: int
+
+
+class MicroCacheStatusResponse(BaseModel):
+    """Micro-cache size and hit/coalesce counters (this worker)."""
+
+    entries: int
+    ttlSeconds: float
+    hits: int
+    coalesced: int
+    misses: int
+    stored: int
+    hitRatio: float
+
+
+class UpstreamStatusResponse(BaseModel):
+    """Circuit breaker state and counters for an upstream service (this worker)."""
+
+    name: str
+    state: str
+    consecutiveFailures: int
+    failureThreshold: int
+    retryAfterSeconds: float
+    successes: int
+    failures: int
+    rejected: int
+    openedCount: int
+    lastFailure: Optional[str]
+    lastFailureAt: Optional[datetime]
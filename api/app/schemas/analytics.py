@@ -0,0 +1,58 @@
+"""Pydantic schemas for admin analytics endpoints."""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class DailyActivityResponse(BaseModel):
+    """Platform activity for one day."""
+
+    date: datetime
+    activeUsers: int
+    weeklyActiveUsers: int
+    monthlyActiveUsers: int
+    logs: int
+    completedLogs: int
+    completionRate: Optional[float]
+    joins: int
+
+
+class TemplateStatsResponse(BaseModel):
+    """Activity on a template over a date range."""
+
+    asceticismId: int
+    title: str
+    category: str
+    activeUserDays: int  # sum of daily active users
+    logs: int
+    completedLogs: int
+    completionRate: Optional[float]
+    joins: int
+
+
+class PackageStatsResponse(BaseModel):
+    """Package activations over a date range."""
+
+    packageId: int
+    title: str
+    joins: int
+
+
+class RetentionWeek(BaseModel):
+    """Members active a number of weeks after joining, out of those eligible."""
+
+    weekOffset: int
+    users: int
+    eligibleUsers: int
+    rate: float
+
+
+class RetentionCohortResponse(BaseModel):
+    """Retention curve of one cohort."""
+
+    cohortType: str
+    cohortKey: str
+    cohortStart: datetime
+    size: int
+    weeks: list[RetentionWeek]
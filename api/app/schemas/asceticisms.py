@@ -62,6 +62,14 @@ class AsceticismResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SimilarAsceticismResponse(BaseModel):
+    """A template often taken on by users of another."""
+
+    asceticism: AsceticismResponse
+    score: float  # cosine similarity of the templates' users, 0 to 1
+    coUsers: int  # users who took on both
+
+
 class UserAsceticismLink(DateRangeValidatorMixin):
     """Request to link user to asceticism."""
 
@@ -94,6 +102,7 @@ class UserAsceticismUpdate(DateRangeValidatorMixin):
 
     targetValue: Optional[float] = None
     status: Optional[AsceticismStatus] = None
+    reminderTime: Optional[str] = None
 
 
 class LogCreate(BaseModel):
@@ -187,3 +196,57 @@ class AsceticismProgressResponse(BaseModel):
     startDate: str
     stats: ProgressStats
     logs: list[ProgressLog]
+
+
+class CalendarCommitment(BaseModel):
+    """Packed completion calendar for one commitment.
+
+    `completed` is a base64 bitset with one bit per day of the range, most
+    significant bit first (bit 0 is `startDate`). `values` is only set for
+    NUMERIC commitments and holds base64 little-endian float32 values, one per
+    day, with NaN for days without a value.
+    """
+
+    userAsceticismId: int
+    asceticismId: int
+    type: str
+    completed: str
+    values: Optional[str] = None
+
+
+class CalendarResponse(BaseModel):
+    """Completion calendar for all of a user's commitments in a date range."""
+
+    startDate: str
+    days: int
+    commitments: list[CalendarCommitment]
+
+
+class WeeklyTotal(BaseModel):
+    """Sum of a NUMERIC commitment's values over a Monday-to-Sunday week."""
+
+    weekStart: str
+    total: float
+
+
+class NumericTrendsResponse(BaseModel):
+    """Trends of a NUMERIC commitment towards its cumulative `targetValue`.
+
+    `movingAverage` holds one value per day from `seriesStartDate` to today
+    (the mean of values logged in the trailing window, null if none).
+    `projectedDate` extrapolates the average daily amount of recent weeks
+    and is null once the goal is reached.
+    """
+
+    userAsceticismId: int
+    asceticism: AsceticismSummary
+    startDate: str
+    targetValue: Optional[float]
+    total: float
+    percentOfTarget: Optional[float]
+    dailyPace: float
+    goalReachedDate: Optional[str]
+    projectedDate: Optional[str]
+    seriesStartDate: str
+    movingAverage: list[Optional[float]]
+    weeklyTotals: list[WeeklyTotal]
@@ -30,6 +30,44 @@ class DailyReadingNoteResponse(BaseModel):
     updatedAt: str
 
 
+class NoteSearchResult(BaseModel):
+    """Daily reading note matching a search, with a highlighted snippet."""
+
+    id: int
+    date: str
+    snippet: str
+    rank: float
+    updatedAt: str
+
+
+class NoteSearchResponse(BaseModel):
+    """Page of note search results, best match first."""
+
+    results: list[NoteSearchResult]
+    nextCursor: Optional[str] = None
+
+
+class ReadingSearchResult(BaseModel):
+    """Cached Mass readings date matching a search."""
+
+    date: str  # YYYYMMDD, as accepted by /readings/{date}
+    sources: Optional[str]
+    rank: float
+    snippet: Optional[str] = None
+
+
+class ReadingsBundleResponse(BaseModel):
+    """Offline readings bundle metadata; download it from `url`."""
+
+    key: str
+    startDate: str  # YYYYMMDD
+    endDate: str  # YYYYMMDD
+    contentHash: str
+    size: int
+    builtAt: datetime
+    url: str
+
+
 class ReadingText(BaseModel):
     """Text content of a liturgical reading."""
 
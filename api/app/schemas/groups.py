@@ -0,0 +1,61 @@
+"""Pydantic schemas for group endpoints."""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class GroupCreate(BaseModel):
+    """Request to create a group."""
+
+    name: str
+    description: Optional[str] = None
+    avatar: Optional[str] = None
+
+
+class GroupJoinRequest(BaseModel):
+    """Request to join a group by invite code."""
+
+    inviteCode: str
+
+
+class GroupResponse(BaseModel):
+    """Group response with the current user's role."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    inviteCode: Optional[str]
+    avatar: Optional[str]
+    memberCount: int
+    role: str
+
+
+class GroupMemberResponse(BaseModel):
+    """Group member response."""
+
+    userId: int
+    name: Optional[str]
+    image: Optional[str]
+    role: str
+
+
+class LeaderboardEntry(BaseModel):
+    """A member's streak and completion for the last 7 days."""
+
+    userId: int
+    name: Optional[str]
+    image: Optional[str]
+    currentStreak: int
+    weeklyCompleted: int
+    weeklyExpected: int
+    weeklyCompletionRate: float
+
+
+class LeaderboardResponse(BaseModel):
+    """Group leaderboard response."""
+
+    groupId: int
+    computedAt: datetime
+    total: int
+    entries: list[LeaderboardEntry]
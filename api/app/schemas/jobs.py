@@ -0,0 +1,24 @@
+"""Pydantic schemas for background job endpoints."""
+
+from typing import Any, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    """A background job's state, progress and result."""
+
+    id: int
+    type: str
+    status: str
+    progress: float
+    attempts: int
+    maxAttempts: int
+    runAt: datetime
+    result: Optional[dict[str, Any]]
+    error: Optional[str]
+    createdAt: datetime
+    updatedAt: datetime
+    finishedAt: Optional[datetime]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,82 @@
+"""Pydantic schemas for program endpoints."""
+
+from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel
+from .packages import AsceticismInfo
+
+
+class ProgramItemInput(BaseModel):
+    """Program item input. Days are 1-based; dayEnd None means open-ended."""
+
+    asceticismId: int
+    dayStart: int = 1
+    dayEnd: Optional[int] = None
+
+
+class ProgramCreate(BaseModel):
+    """Request to create a program."""
+
+    name: str
+    description: Optional[str] = None
+    isPublic: bool = False
+    custom_metadata: Optional[dict] = None
+    items: List[ProgramItemInput]
+
+
+class ProgramItemResponse(BaseModel):
+    """Program item response."""
+
+    id: int
+    asceticismId: int
+    dayStart: int
+    dayEnd: Optional[int]
+    asceticism: AsceticismInfo
+
+
+class ProgramResponse(BaseModel):
+    """Program response."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    isPublic: bool
+    creatorId: int
+    custom_metadata: Optional[dict]
+    items: List[ProgramItemResponse]
+    itemCount: int
+
+
+class EnrollProgramRequest(BaseModel):
+    """Request to enroll in a program."""
+
+    startDate: Optional[datetime] = None
+
+
+class UserProgramResponse(BaseModel):
+    """User's program enrollment response."""
+
+    id: int
+    programId: int
+    programName: str
+    startDate: datetime
+
+
+class DueItemResponse(BaseModel):
+    """A program item that is active for an enrollment on a given day."""
+
+    userProgramId: int
+    programId: int
+    programName: str
+    programItemId: int
+    day: int
+    dayStart: int
+    dayEnd: Optional[int]
+    asceticism: AsceticismInfo
+
+
+class UserDueItemsResponse(BaseModel):
+    """All of one user's due program items for a day."""
+
+    userId: int
+    items: List[DueItemResponse]
@@ -0,0 +1,34 @@
+"""Pydantic schemas for search endpoints."""
+
+from typing import Optional
+from pydantic import BaseModel
+
+
+class AsceticismSearchResult(BaseModel):
+    """Asceticism template matching a search."""
+
+    id: int
+    title: str
+    description: Optional[str]
+    category: str
+    icon: Optional[str]
+    type: str
+    rank: float
+
+
+class PackageSearchResult(BaseModel):
+    """Published package matching a search."""
+
+    id: int
+    title: str
+    description: Optional[str]
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Search results grouped by kind, best match first."""
+
+    query: str
+    mode: str
+    asceticisms: list[AsceticismSearchResult]
+    packages: list[PackageSearchResult]
@@ -0,0 +1,23 @@
+"""Pydantic schemas for delta sync endpoints."""
+
+from pydantic import BaseModel
+from .asceticisms import UserAsceticismResponse, LogResponse
+from .daily_readings import DailyReadingNoteResponse
+
+
+class SyncTombstoneResponse(BaseModel):
+    """A row deleted since the client's cursor."""
+
+    entity: str
+    id: int
+
+
+class SyncResponse(BaseModel):
+    """Rows created, updated or deleted since a sync cursor."""
+
+    cursor: int
+    hasMore: bool
+    userAsceticisms: list[UserAsceticismResponse]
+    logs: list[LogResponse]
+    notes: list[DailyReadingNoteResponse]
+    deleted: list[SyncTombstoneResponse]
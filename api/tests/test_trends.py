@@ -0,0 +1,60 @@
+"""Tests for the vectorized NUMERIC trends in app.core.trends."""
+
+from datetime import date, timedelta
+import numpy as np
+from app.core.trends import DailyValues, compute_trends
+
+START = date(2026, 1, 1)
+DAYS = 60
+WINDOW = 7
+
+
+def sample_values() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Values of three commitments that start on different days, with logs
+    from before their start, plus their targets and start offsets.
+    """
+    rng = np.random.default_rng(47)
+    values = rng.integers(0, 10, size=(3, DAYS)).astype(np.float64)
+    values[rng.random(values.shape) < 0.3] = np.nan
+    targets = np.array([150.0, np.nan, 40.0])
+    start_offsets = np.array([0, 20, 45])
+    return values, targets, start_offsets
+
+
+def test_batch_matches_single_commitments():
+    values, targets, start_offsets = sample_values()
+    batch = compute_trends(
+        DailyValues(ids=np.arange(3), start=START, values=values),
+        targets,
+        start_offsets,
+        WINDOW,
+    )
+
+    for i, offset in enumerate(start_offsets):
+        own_start = START + timedelta(days=int(offset))
+        own_values = values[i : i + 1, offset:]
+        single = compute_trends(
+            DailyValues(ids=np.array([i]), start=own_start, values=own_values),
+            targets[i : i + 1],
+            np.array([0]),
+            WINDOW,
+        )
+
+        assert batch.total[i] == single.total[0]
+        assert batch.pace[i] == single.pace[0]
+        np.testing.assert_array_equal(
+            batch.percent_of_target[i], single.percent_of_target[0]
+        )
+        np.testing.assert_array_equal(batch.days_to_target[i], single.days_to_target[0])
+        if single.reached_on[0] < 0:
+            assert batch.reached_on[i] == -1
+        else:
+            assert batch.reached_on[i] == offset + single.reached_on[0]
+        np.testing.assert_array_equal(
+            batch.moving_average[i, offset:], single.moving_average[0]
+        )
+
+        first_week = (own_start - batch.week_start).days // 7
+        assert batch.week_start + timedelta(weeks=first_week) == single.week_start
+        np.testing.assert_array_equal(batch.weekly[i, first_week:], single.weekly[0])
@@ -0,0 +1,129 @@
+"""
+Local Universalis stub with fault injection, for exercising the readings
+circuit breaker and stale-while-revalidate paths.
+
+Usage:
+    python tools/universalis_stub.py --port 8765 [--error-rate 0.5] [--latency 2]
+    UNIVERSALIS_BASE_URL=http://127.0.0.1:8765/usa uvicorn app.main:app
+
+Faults can be changed while running:
+    curl "http://127.0.0.1:8765/_faults?error_rate=1&status=503"
+    curl "http://127.0.0.1:8765/_faults?mode=hang"     # never answer in time
+    curl "http://127.0.0.1:8765/_faults?mode=garbage"  # invalid JSONP
+    curl "http://127.0.0.1:8765/_faults?mode=ok&error_rate=0&latency=0"
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+READINGS_PATH_RE = re.compile(r"/(\d{8})/jsonpmass\.js$")
+
+faults = {"mode": "ok", "error_rate": 0.0, "latency": 0.0, "status": 503}
+stats = {"requests": 0, "errors": 0}
+lock = threading.Lock()
+
+
+def sample_readings(date: str) -> dict:
+    """Plausible Universalis payload for a date."""
+    day = int(date[6:])
+    return {
+        "Mass_R1": {
+            "source": f"Acts {day}:1-10",
+            "text": f"<div>First reading for {date}.</div>",
+        },
+        "Mass_Ps": {
+            "source": f"Psalm {day + 100}({day + 101}):1-5",
+            "text": "<div>The Lord is my shepherd.</div>",
+        },
+        "Mass_G": {
+            "source": f"John {day % 21 + 1}:1-8",
+            "heading": "Gospel",
+            "text": f"<div>Gospel for {date}.</div>",
+        },
+        "day": f"Stub day {date}",
+        "date": date,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/_faults":
+            self._set_faults(parse_qs(url.query))
+            return
+
+        match = READINGS_PATH_RE.search(url.path)
+        if not match:
+            self._send(404, "text/plain", b"not found")
+            return
+
+        with lock:
+            stats["requests"] += 1
+            current = dict(faults)
+
+        if current["mode"] == "hang":
+            time.sleep(3600)
+        time.sleep(current["latency"])
+        if random.random() < current["error_rate"]:
+            with lock:
+                stats["errors"] += 1
+            self._send(current["status"], "text/plain", b"injected failure")
+            return
+        if current["mode"] == "garbage":
+            self._send(200, "application/javascript", b"universalisCallback({oops")
+            return
+
+        body = json.dumps(sample_readings(match.group(1)))
+        self._send(
+            200, "application/javascript", f"universalisCallback({body});".encode()
+        )
+
+    def _set_faults(self, params: dict) -> None:
+        with lock:
+            for key in ("error_rate", "latency"):
+                if key in params:
+                    faults[key] = float(params[key][0])
+            if "status" in params:
+                faults["status"] = int(params["status"][0])
+            if "mode" in params:
+                faults["mode"] = params["mode"][0]
+            body = json.dumps({"faults": faults, "stats": stats}).encode()
+        self._send(200, "application/json", body)
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fault-injecting Universalis stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--status", type=int, default=503)
+    args = parser.parse_args()
+
+    faults.update(
+        error_rate=args.error_rate, latency=args.latency, status=args.status
+    )
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"Universalis stub on http://{args.host}:{args.port}/usa")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()